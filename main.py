@@ -17,6 +17,7 @@ from utils import (
     print_error, print_info, print_warning
 )
 from bot import InstagramBot
+from persistence import DebouncedPersistence
 
 # Variável global para o bot
 bot = None
@@ -28,6 +29,11 @@ def signal_handler(sig, frame):
     
     if bot:
         print_info("Encerrando bot graciosamente...")
+        try:
+            DebouncedPersistence.flush_all()
+        except Exception:
+            pass
+        
         try:
             if bot.content_scheduler.is_daemon_running():
                 bot.content_scheduler.stop_daemon()
@@ -136,7 +142,7 @@ def menu_conteudo():
             folder = input(f"Pasta de imagens [{config.CONTENT_FOLDER}]: ").strip()
             folder = folder or config.CONTENT_FOLDER
             ppd = int(input("Posts por dia [2]: ") or "2")
-            bot.schedule_week_content(folder)
+            bot.schedule_week_content(folder, posts_per_day=ppd)
         elif choice == "2":
             path = input("Caminho da imagem: ").strip()
             caption = input("Legenda (deixe em branco para automático): ").strip()
@@ -146,7 +152,8 @@ def menu_conteudo():
                 dt = datetime.strptime(when, "%Y-%m-%d %H:%M")
             else:
                 dt = None
-            bot.content_scheduler.schedule_post(path, caption or "", [], dt)
+            if not bot.content_scheduler.schedule_post(path, caption or "", [], dt):
+                print_error("Post não agendado")
         elif choice == "3":
             posts = bot.content_scheduler.list_scheduled()
             if posts:
@@ -262,6 +269,14 @@ def menu_configuracoes():
             print("\n📊 Estatísticas de Seguidores:")
             for k, v in stats.items():
                 print(f"  {k}: {v}")
+            
+            print("\n💚 Follow-back por fonte:")
+            for source, data in bot.followers_manager.get_follow_back_by_source().items():
+                print(f"  {source or '(sem fonte)'}: {data['taxa']}% ({data['follow_backs']}/{data['verificados']})")
+            
+            print("\n⏳ Seguindo há (dias):")
+            for faixa, qtd in bot.followers_manager.get_age_histogram().items():
+                print(f"  {faixa}: {qtd}")
         elif choice == "0":
             break
         
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark do histórico de seguidores
+Compara o UserProfile antigo (dataclass + JSON) com a representação compacta
+nos backends SQLite e journal, em 10k/100k/1M registros.
+
+Uso:
+    python scripts/benchmark_followers.py
+    python scripts/benchmark_followers.py --sizes 10000 100000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# config cria ./data, ./logs etc. no diretório atual: roda em pasta temporária
+WORK_DIR = tempfile.mkdtemp(prefix="followers_bench_")
+os.chdir(WORK_DIR)
+sys.path.insert(0, SRC_DIR)
+
+from followers_manager import UserProfile  # noqa: E402
+from followers_store import SQLiteFollowersStore, JournalFollowersStore  # noqa: E402
+
+SOURCES = ["follower_of_concorrente", "recent_liker", "hashtag_tecnologia", "influencer_x", ""]
+
+@dataclass
+class LegacyUserProfile:
+    """UserProfile original, para comparação"""
+    username: str
+    user_id: str = ""
+    followers_count: int = 0
+    following_count: int = 0
+    is_private: bool = False
+    is_verified: bool = False
+    followed_at: Optional[str] = None
+    unfollowed_at: Optional[str] = None
+    follows_back: Optional[bool] = None
+    source: str = ""
+
+def make_records(n: int):
+    """Gera registros sintéticos no formato persistido"""
+    rng = random.Random(42)
+    base = datetime.now() - timedelta(days=365)
+    records = []
+    for i in range(n):
+        followed = base + timedelta(seconds=rng.randint(0, 365 * 86400))
+        unfollowed = followed + timedelta(days=rng.randint(1, 10)) if rng.random() < 0.6 else None
+        records.append({
+            "username": f"user_{i:07d}",
+            "user_id": "",
+            "followers_count": rng.randint(0, 20000),
+            "following_count": rng.randint(0, 5000),
+            "is_private": rng.random() < 0.3,
+            "is_verified": False,
+            "followed_at": followed.isoformat(timespec="seconds"),
+            "unfollowed_at": unfollowed.isoformat(timespec="seconds") if unfollowed else None,
+            "follows_back": rng.choice([None, True, False]),
+            "source": rng.choice(SOURCES)
+        })
+    return records
+
+def timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def measure_memory(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    gc.collect()
+    return current
+
+def bench_size(n: int):
+    records = make_records(n)
+    results = {}
+    
+    # Legado: JSON completo
+    legacy_file = os.path.join(WORK_DIR, f"legacy_{n}.json")
+    legacy_users = {r["username"]: LegacyUserProfile(**r) for r in records}
+    
+    def legacy_save():
+        with open(legacy_file, "w", encoding="utf-8") as f:
+            json.dump({k: asdict(v) for k, v in legacy_users.items()}, f, indent=2, ensure_ascii=False)
+    
+    def legacy_load():
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {k: LegacyUserProfile(**v) for k, v in data.items()}
+    
+    results["legacy_save_s"], _ = timed(legacy_save)
+    results["legacy_load_s"], _ = timed(legacy_load)
+    del legacy_users
+    
+    # Memória do histórico carregado do disco (inclui strings alocadas na carga)
+    results["mem_legacy_mb"] = measure_memory(legacy_load) / 1e6
+    
+    compact_users = {r["username"]: UserProfile.from_dict(r) for r in records}
+    del records
+    
+    # SQLite
+    db_file = os.path.join(WORK_DIR, f"bench_{n}.db")
+    store = SQLiteFollowersStore(db_file)
+    results["sqlite_save_s"], _ = timed(
+        lambda: store.save_all([u.to_dict() for u in compact_users.values()], [], {})
+    )
+    results["sqlite_load_s"], _ = timed(
+        lambda: {row[0]: UserProfile.from_row(row) for row in store.iter_user_rows()}
+    )
+    sample = next(iter(compact_users.values()))
+    results["sqlite_upsert_ms"], _ = timed(lambda: store.upsert_user(sample.to_dict()))
+    results["sqlite_upsert_ms"] *= 1000
+    results["mem_compact_mb"] = measure_memory(
+        lambda: {row[0]: UserProfile.from_row(row) for row in store.iter_user_rows()}
+    ) / 1e6
+    store.close()
+    
+    # Journal
+    journal_file = os.path.join(WORK_DIR, f"bench_{n}.jsonl")
+    snapshot_file = os.path.join(WORK_DIR, f"bench_{n}_snapshot.json")
+    journal = JournalFollowersStore(journal_file, snapshot_file)
+    results["journal_save_s"], _ = timed(
+        lambda: journal.save_all([u.to_dict() for u in compact_users.values()], [], {})
+    )
+    results["journal_append_ms"], _ = timed(lambda: journal.upsert_user(sample.to_dict()))
+    results["journal_append_ms"] *= 1000
+    journal.close()
+    
+    def journal_load():
+        reopened = JournalFollowersStore(journal_file, snapshot_file)
+        users = {row[0]: UserProfile.from_row(row) for row in reopened.iter_user_rows()}
+        reopened.close()
+        return users
+    
+    results["journal_load_s"], _ = timed(journal_load)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    columns = [
+        ("mem_legacy_mb", "mem legado (MB)"), ("mem_compact_mb", "mem compacto (MB)"),
+        ("legacy_save_s", "JSON salvar (s)"), ("legacy_load_s", "JSON carregar (s)"),
+        ("sqlite_save_s", "SQLite salvar (s)"), ("sqlite_load_s", "SQLite carregar (s)"),
+        ("sqlite_upsert_ms", "SQLite upsert (ms)"),
+        ("journal_save_s", "journal snapshot (s)"), ("journal_load_s", "journal carregar (s)"),
+        ("journal_append_ms", "journal append (ms)"),
+    ]
+    
+    print(f"Diretório temporário: {WORK_DIR}\n")
+    print(f"{'métrica':<22}" + "".join(f"{n:>14,}" for n in args.sizes))
+    print("-" * (22 + 14 * len(args.sizes)))
+    
+    all_results = [bench_size(n) for n in args.sizes]
+    for key, label in columns:
+        print(f"{label:<22}" + "".join(f"{r[key]:>14.3f}" for r in all_results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Teste de estresse de concorrência
+Roda o daemon de publicação e uma sessão interativa (follows, curtidas,
+estatísticas) ao mesmo tempo contra um driver falso, com gravação agrupada
+disparando o tempo todo, e confere se o estado final é consistente.
+
+Uso:
+    python scripts/stress_concurrency.py
+    python scripts/stress_concurrency.py --follows 2000 --posts 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# config cria ./data, ./logs etc. no diretório atual: roda em pasta temporária
+WORK_DIR = tempfile.mkdtemp(prefix="stress_concurrency_")
+os.chdir(WORK_DIR)
+sys.path.insert(0, SRC_DIR)
+
+from config import config  # noqa: E402
+
+# Gravação agrupada o mais agressiva possível: o timer concorre com tudo
+config.PERSIST_INTERVAL = 0.005
+config.PERSIST_MAX_PENDING = 3
+for name in ("MAX_LIKES_PER_HOUR", "MAX_FOLLOWS_PER_HOUR", "MAX_LIKES_PER_DAY",
+             "MAX_FOLLOWS_PER_DAY", "MAX_ACTIONS_PER_DAY"):
+    setattr(config, name, 10 ** 9)
+config.IG_USERNAME = "stress"
+
+import utils  # noqa: E402
+from utils import HumanBehavior  # noqa: E402
+from persistence import DebouncedPersistence  # noqa: E402
+from rate_limiter import RateLimiter  # noqa: E402
+from adaptive_wait import AdaptiveWait  # noqa: E402
+from command_stats import command_stats  # noqa: E402
+from followers_manager import FollowersManager  # noqa: E402
+from growth_engine import GrowthEngine  # noqa: E402
+from analytics_engine import AnalyticsEngine  # noqa: E402
+from content_scheduler import ContentScheduler  # noqa: E402
+from driver_broker import broker  # noqa: E402
+from selector_registry import registry  # noqa: E402
+
+# Único elemento lógico que a página falsa não tem
+ABSENT_SELECTORS = set(registry.candidates('action_blocked'))
+
+# Sem pausas humanas: o objetivo é maximizar o entrelaçamento das threads
+for _name in ("random_delay", "long_delay", "typing_delay", "scroll_pause"):
+    setattr(HumanBehavior, _name, staticmethod(lambda *a, **k: 0))
+
+class FakeElement:
+    def __init__(self, driver, locator):
+        self.driver = driver
+        self.locator = locator
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.execute("clickElement", {"locator": self.locator})
+        if "Compartilhar" in self.locator or "Seu story" in self.locator:
+            with self.driver.lock:
+                self.driver.shares += 1
+
+    def send_keys(self, *values):
+        self.driver.execute("sendKeysToElement", {"value": values})
+
+    def get_attribute(self, name):
+        return None
+
+class FakeDriver:
+    """Responde aos comandos usados pelos módulos, com latência pequena e aleatória"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current_url = "https://www.instagram.com/"
+        self.shares = 0
+
+    def execute(self, command, params=None):
+        time.sleep(random.uniform(0, 0.0005))
+        return {"value": None}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        self.execute("executeScript")
+        if not args:
+            # Extratores de página esperam dict
+            return {}
+        # Sondagem de seletores: a primeira alternativa existe e está visível
+        selectors = args[0]
+        if not selectors or selectors[0] in ABSENT_SELECTORS:
+            return []
+        element = FakeElement(self, selectors[0])
+        return [{"selector": selectors[0], "count": 1, "element": element,
+                 "elements": [element], "visible": True}]
+
+    def find_element(self, by, value):
+        self.execute("findElement", {"using": by, "value": value})
+        return FakeElement(self, value)
+
+    def find_elements(self, by, value):
+        self.execute("findElements", {"using": by, "value": value})
+        return []
+
+def run_thread(name, target, errors):
+    def wrapper():
+        try:
+            target()
+        except Exception:
+            errors.append((name, traceback.format_exc()))
+    thread = threading.Thread(target=wrapper, name=name)
+    thread.start()
+    return thread
+
+def main():
+    parser = argparse.ArgumentParser(description="Estresse de concorrência")
+    parser.add_argument("--follows", type=int, default=500)
+    parser.add_argument("--posts", type=int, default=60)
+    args = parser.parse_args()
+
+    driver = FakeDriver()
+    command_stats.install(driver)
+    wait = AdaptiveWait(driver)
+    limiter = RateLimiter()
+    fm = FollowersManager(driver, wait, limiter)
+    growth = GrowthEngine(driver, wait, limiter, fm)
+    analytics = AnalyticsEngine(driver, wait)
+    scheduler = ContentScheduler(driver, wait)
+
+    media = os.path.join(WORK_DIR, "post.jpg")
+    with open(media, "wb") as f:
+        f.write(b"\xff\xd8\xff")
+
+    errors = []
+    done = threading.Event()
+    scheduled_ids = []
+    cancelled = []
+
+    def daemon():
+        # O daemon real: espera pelo _wakeup/heap de horários e aplica o catch-up
+        scheduler.run_scheduler_daemon(check_interval=1)
+
+    def menu():
+        for i in range(args.follows):
+            # Sessão interativa com a posse do navegador, cedida ao daemon
+            # nos pontos seguros
+            with broker.lease("menu"):
+                fm.follow_user(f"user_{i:05d}", source="stress")
+                broker.checkpoint()
+            if limiter.try_acquire('likes'):
+                growth._get_today_stats().curtidas_enviadas += 1
+                growth._save_stats()
+            if i % 10 == 0:
+                analytics.data["follower_activity"] = {h: random.randint(0, 100) for h in range(24)}
+                analytics.save_data()
+            if i % 7 == 0 and len(scheduled_ids) < args.posts:
+                # Parte já vencida, parte para daqui a pouco (o daemon dorme até lá)
+                when = datetime.now() + timedelta(seconds=random.choice((0, 0, random.uniform(0.1, 2))))
+                scheduled_ids.append(
+                    scheduler.schedule_post(media, "ok", [], when, "feed")
+                )
+                # Menu também tenta publicar, disputando com o daemon
+                scheduler.check_and_post()
+            if i % 50 == 0 and scheduled_ids:
+                post_id = random.choice(scheduled_ids)
+                if scheduler.cancel_post(post_id):
+                    cancelled.append(post_id)
+        done.set()
+
+    def stats_reader():
+        while not done.is_set():
+            json.dumps({
+                "rate_limiter": limiter.get_stats(),
+                "followers": fm.get_stats(),
+                "growth_weekly": growth.get_weekly_report(),
+                "persistencia": DebouncedPersistence.get_all_stats(),
+                "webdriver": command_stats.get_stats(),
+                "esperas": wait.get_stats(),
+                "broker": broker.get_stats(),
+                "publicacao": scheduler.get_publish_stats()
+            }, default=str)
+
+    start = time.perf_counter()
+    threads = [
+        run_thread("daemon", daemon, errors),
+        run_thread("menu", menu, errors),
+        run_thread("stats", stats_reader, errors)
+    ]
+    threads[1].join()
+
+    # Fila drenada pelo daemon, que então é parado pelo próprio stop_daemon
+    drain_deadline = time.monotonic() + 60
+    while any(p.is_pending for p in scheduler.list_scheduled()):
+        if time.monotonic() > drain_deadline:
+            break
+        time.sleep(0.05)
+    drained = not any(p.is_pending for p in scheduler.list_scheduled())
+    scheduler.stop_daemon()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    DebouncedPersistence.flush_all()
+    fm.close()
+
+    # ============================================
+    # VERIFICAÇÕES
+    # ============================================
+
+    problems = [f"exceção na thread {name}:\n{tb}" for name, tb in errors]
+    if not drained:
+        problems.append("daemon não publicou a fila em 60s")
+
+    posted = [p for p in scheduler.posts_queue if p.posted]
+    if driver.shares != len(posted):
+        problems.append(f"{driver.shares} publicações no navegador, {len(posted)} marcadas como publicadas")
+
+    follows = fm.get_stats()["total_historico"]
+    limiter_stats = limiter.get_stats()
+    if follows != args.follows or limiter_stats["follows"]["hora"] != args.follows:
+        problems.append(
+            f"follows: {args.follows} esperados, {follows} no histórico, "
+            f"{limiter_stats['follows']['hora']} no rate limiter"
+        )
+    if limiter_stats["likes"]["hora"] != growth._get_today_stats().curtidas_enviadas:
+        problems.append("curtidas divergentes entre rate limiter e estatísticas de crescimento")
+
+    drift = fm.check_consistency(repair=False)
+    if drift:
+        problems.append(f"contadores de seguidores divergentes: {drift}")
+
+    for filename in ("content_schedule.json", "growth_stats.json", "analytics_data.json",
+                     "rate_limiter.json", "wait_profiles.json"):
+        try:
+            with open(os.path.join(config.DATA_DIR, filename), encoding="utf-8") as f:
+                json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"{filename} ilegível: {e}")
+
+    on_disk = utils.load_json(os.path.join(config.DATA_DIR, "content_schedule.json"), [])
+    if sum(1 for p in on_disk if p.get("posted")) != len(posted):
+        problems.append("estado de publicação em disco difere da memória")
+
+    print(f"Tempo: {elapsed:.1f}s | follows: {follows} | posts publicados: {len(posted)} "
+          f"(cancelados: {len(cancelled)}) | comandos WebDriver: "
+          f"{command_stats.get_stats()['total_comandos']}")
+
+    broker_stats = broker.get_stats()
+    print(f"Broker: {broker_stats['preempcoes']} preempções | atraso de publicação: "
+          f"{scheduler.get_publish_stats()}")
+    
+    gravacoes = DebouncedPersistence.get_all_stats()["modulos"]
+    print("Gravações por módulo: " + ", ".join(
+        f"{name}={stats['gravacoes']}" for name, stats in gravacoes.items()
+    ))
+
+    if problems:
+        print("\n❌ FALHOU:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+
+    print("\n✅ Estado consistente")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
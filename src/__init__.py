@@ -11,7 +11,6 @@ from .bot import InstagramBot
 from .config import Config, config
 from .utils import (
     HumanBehavior,
-    RateLimiter,
     logger,
     safe_execute,
     print_banner,
@@ -20,6 +19,7 @@ from .utils import (
     print_info,
     print_warning
 )
+from .rate_limiter import RateLimiter
 
 __all__ = [
     'InstagramBot',
@@ -0,0 +1,231 @@
+"""
+Esperas Adaptativas
+Timeout e intervalo de polling por elemento, aprendidos da latência real
+(p99) até o elemento ficar pronto e persistidos entre sessões
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils import logger, load_json, save_json, time_remaining
+from config import config
+from persistence import DebouncedPersistence
+
+# Amostras mantidas por elemento e mínimo para confiar no p99
+MAX_SAMPLES = 100
+MIN_SAMPLES = 5
+
+# Folga sobre o p99 observado
+P99_MARGIN = 1.5
+P99_PADDING = 0.5
+
+# Intervalo de polling (segundos): limites e valor sem histórico, mais
+# curto que o do WebDriverWait para medir melhor as primeiras latências
+MIN_POLL = 0.05
+MAX_POLL = 0.5
+DEFAULT_POLL = 0.25
+
+# Em fail-fast, uma a cada N esperas usa o timeout aprendido (sonda de recuperação)
+FAIL_FAST_PROBE_EVERY = 5
+
+def _percentile(sorted_values, pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class WaitProfile:
+    """
+    Latências (s) até o elemento ficar pronto e timeouts seguidos
+
+    Os timeouts seguidos valem só para a sessão: não são gravados, então
+    uma lentidão passageira não deixa o elemento em fail-fast após reiniciar.
+    """
+    
+    __slots__ = ("samples", "timeouts", "consecutive_timeouts", "_fail_fast_waits")
+    
+    def __init__(self, samples=(), timeouts: int = 0, **_ignored):
+        self.samples: Deque[float] = deque(samples, maxlen=MAX_SAMPLES)
+        self.timeouts = timeouts
+        self.consecutive_timeouts = 0
+        self._fail_fast_waits = 0
+    
+    def record(self, elapsed: Optional[float]):
+        """Registra uma espera; None = estourou o timeout"""
+        if elapsed is None:
+            self.timeouts += 1
+            self.consecutive_timeouts += 1
+        else:
+            self.samples.append(elapsed)
+            self.consecutive_timeouts = 0
+            self._fail_fast_waits = 0
+    
+    def percentiles(self) -> Optional[tuple]:
+        """(p50, p99) ou None com poucas amostras"""
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return _percentile(ordered, 0.5), _percentile(ordered, 0.99)
+    
+    @property
+    def fail_fast(self) -> bool:
+        return self.consecutive_timeouts >= config.WAIT_FAIL_FAST_AFTER
+    
+    def timeout(self) -> float:
+        """
+        p99 * margem, limitado a [WAIT_MIN_TIMEOUT, WAIT_MAX_TIMEOUT]
+
+        Sem histórico usa o teto. Depois de WAIT_FAIL_FAST_AFTER timeouts
+        seguidos o elemento é tratado como ausente e a espera cai para o
+        mínimo, até voltar a aparecer.
+        """
+        if self.fail_fast:
+            return config.WAIT_MIN_TIMEOUT
+        return self.learned_timeout()
+    
+    def next_timeout(self) -> float:
+        """
+        Timeout da próxima espera: como timeout(), mas em fail-fast uma a
+        cada FAIL_FAST_PROBE_EVERY esperas usa o valor aprendido, para
+        perceber que o elemento voltou em páginas lentas
+        """
+        if not self.fail_fast:
+            return self.learned_timeout()
+        self._fail_fast_waits += 1
+        if self._fail_fast_waits % FAIL_FAST_PROBE_EVERY == 0:
+            return self.learned_timeout()
+        return config.WAIT_MIN_TIMEOUT
+    
+    def learned_timeout(self) -> float:
+        """Timeout pelo p99, ignorando o fail-fast"""
+        stats = self.percentiles()
+        if stats is None:
+            return config.WAIT_MAX_TIMEOUT
+        learned = stats[1] * P99_MARGIN + P99_PADDING
+        return max(config.WAIT_MIN_TIMEOUT, min(config.WAIT_MAX_TIMEOUT, learned))
+    
+    def poll(self) -> float:
+        """Um quarto do p50: elementos rápidos são checados com mais frequência"""
+        stats = self.percentiles()
+        if stats is None:
+            return DEFAULT_POLL
+        return max(MIN_POLL, min(MAX_POLL, stats[0] / 4))
+    
+    def to_dict(self) -> Dict:
+        return {
+            "samples": [round(s, 3) for s in self.samples],
+            "timeouts": self.timeouts
+        }
+
+class AdaptiveWait:
+    """
+    Substituto do WebDriverWait com timeout aprendido por elemento
+
+    until(condition, key=...) espera com o perfil de `key`; sem key usa
+    BROWSER_TIMEOUT, como o WebDriverWait. A chave nomeia o elemento
+    esperado (ex.: 'follow_button'), não a condição. Com expected=False
+    (elemento que pode faltar legitimamente) o timeout não conta para o
+    fail-fast; esperas encurtadas por deadline() não entram no perfil.
+    """
+    
+    def __init__(self, driver, profiles_file: Optional[str] = None):
+        self.driver = driver
+        self.profiles_file = profiles_file or os.path.join(config.DATA_DIR, "wait_profiles.json")
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, WaitProfile] = {
+            key: WaitProfile(**values)
+            for key, values in load_json(self.profiles_file, {}).items()
+        }
+        self._persistence = DebouncedPersistence("wait_profiles", self._write_profiles, max_pending=50)
+        
+        self.waits = 0
+        self.timeouts = 0
+        self.seconds_waited = 0.0
+    
+    def _profile(self, key: str) -> WaitProfile:
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = WaitProfile()
+            return profile
+    
+    def _write_profiles(self):
+        with self._lock:
+            data = {key: profile.to_dict() for key, profile in self._profiles.items()}
+        save_json(data, self.profiles_file)
+    
+    def flush(self):
+        self._persistence.flush()
+    
+    # ============================================
+    # ESPERAS
+    # ============================================
+    
+    def until(self, condition: Callable, message: str = "", key: Optional[str] = None,
+              timeout: Optional[float] = None, expected: bool = True):
+        """Espera a condição (mesma assinatura do WebDriverWait.until, mais key/expected)"""
+        profile = self._profile(key) if key is not None and config.ADAPTIVE_WAIT else None
+        if timeout is None and profile is not None:
+            with self._lock:
+                timeout = profile.next_timeout()
+        elif timeout is None:
+            timeout = config.BROWSER_TIMEOUT
+        # Não espera além do prazo de deadline(), se houver
+        remaining = time_remaining()
+        truncated = remaining is not None and remaining < timeout
+        if truncated:
+            timeout = remaining
+        poll = profile.poll() if profile else MAX_POLL
+        # Ao menos quatro checagens dentro do timeout
+        poll = max(MIN_POLL, min(poll, timeout / 4))
+        
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=poll).until(condition, message)
+        except TimeoutException:
+            elapsed = time.monotonic() - start
+            # Timeout pelo prazo ou de elemento opcional não diz nada sobre a latência
+            self._record(profile if expected and not truncated else None, elapsed, timed_out=True)
+            logger.debug(f"Espera por '{key}' esgotou em {elapsed:.1f}s")
+            raise
+        
+        self._record(profile, time.monotonic() - start, timed_out=False)
+        return result
+    
+    def _record(self, profile: Optional[WaitProfile], elapsed: float, timed_out: bool):
+        with self._lock:
+            self.waits += 1
+            self.seconds_waited += elapsed
+            if timed_out:
+                self.timeouts += 1
+            if profile is not None:
+                profile.record(None if timed_out else elapsed)
+        if profile is not None:
+            self._persistence.mark_dirty()
+    
+    # ============================================
+    # ESTATÍSTICAS
+    # ============================================
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            profiles = {}
+            for key, profile in self._profiles.items():
+                stats = profile.percentiles()
+                profiles[key] = {
+                    "amostras": len(profile.samples),
+                    "p50": round(stats[0], 2) if stats else None,
+                    "p99": round(stats[1], 2) if stats else None,
+                    "timeout": round(profile.timeout(), 2),
+                    "poll": round(profile.poll(), 3),
+                    "timeouts": profile.timeouts
+                }
+            return {
+                "esperas": self.waits,
+                "timeouts": self.timeouts,
+                "segundos_esperando": round(self.seconds_waited, 1),
+                "perfis": profiles
+            }
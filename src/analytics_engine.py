@@ -4,7 +4,6 @@ Análise de melhores horários e performance
 """
 import json
 import os
-import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
@@ -16,6 +15,12 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from utils import HumanBehavior, logger, print_info, print_success, print_error
 from config import config
+from persistence import DebouncedPersistence
+from page_extractors import extract_insights_activity, extract_post
+from network_capture import shortcode_from_url
+from selector_registry import registry
+from command_stats import ops
+from driver_broker import driver_task
 
 @dataclass
 class HourlyActivity:
@@ -27,15 +32,18 @@ class HourlyActivity:
 class AnalyticsEngine:
     """Motor de análise de dados"""
     
-    def __init__(self, driver, wait):
+    def __init__(self, driver, wait, network=None):
         self.driver = driver
         self.wait = wait
+        self.network = network  # NetworkCapture opcional
         
         # Arquivos
         self.analytics_file = os.path.join(config.DATA_DIR, "analytics_data.json")
         
         # Dados
         self.data = self._load_data()
+        self._snapshot = dict(self.data)
+        self._persistence = DebouncedPersistence("analytics", self._write_data)
     
     def _load_data(self) -> Dict:
         """Carrega dados de analytics"""
@@ -58,15 +66,24 @@ class AnalyticsEngine:
             }
     
     def save_data(self):
-        """Salva dados"""
+        """Marca dados para gravação"""
         self.data["last_updated"] = datetime.now().isoformat()
+        # Cópia rasa para a thread do timer: as chaves de self.data só são
+        # substituídas por objetos novos, nunca alteradas no lugar
+        self._snapshot = dict(self.data)
+        self._persistence.mark_dirty()
+    
+    def _write_data(self):
+        """Grava dados em disco"""
         from utils import save_json
-        save_json(self.data, self.analytics_file)
+        save_json(self._snapshot, self.analytics_file)
     
     # ============================================
     # ANÁLISE DE ATIVIDADE
     # ============================================
     
+    @driver_task("analyze_follower_activity")
+    @ops("analyze_follower_activity")
     def analyze_follower_activity(self) -> Dict[int, int]:
         """
         Analisa quando seus seguidores estão mais ativos
@@ -75,6 +92,9 @@ class AnalyticsEngine:
         print_info("Analisando atividade dos seguidores...")
         
         try:
+            if self.network is not None:
+                self.network.reset()
+            
             # Tenta acessar insights
             self.driver.get("https://www.instagram.com/accounts/insights/")
             HumanBehavior.long_delay()
@@ -82,7 +102,8 @@ class AnalyticsEngine:
             # Navega para público
             try:
                 audience_tab = self.wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Público')]"))
+                    EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Público')]")),
+                    key='insights_audience_tab'
                 )
                 audience_tab.click()
                 HumanBehavior.random_delay(3, 5)
@@ -90,31 +111,17 @@ class AnalyticsEngine:
                 print_error("Não foi possível acessar aba de público")
                 return self._estimate_activity()
             
-            # Extrai dados do gráfico
-            activity_by_hour = {}
+            # Atividade já baixada pela página, se a captura estiver ativa
+            activity_by_hour = self.network.take_activity() if self.network is not None else None
             
-            try:
-                # Procura elementos do gráfico horário
-                chart_bars = self.driver.find_elements(
-                    By.CSS_SELECTOR, "[data-testid='hourly-activity-chart'] div, .x1q0g3np div"
-                )
+            if not activity_by_hour:
+                # Extrai dados do gráfico (alturas das barras em uma única chamada)
+                heights = extract_insights_activity(self.driver)
+                if not heights:
+                    logger.warning("Não foi possível extrair gráfico")
+                    return self._estimate_activity()
                 
-                for i, bar in enumerate(chart_bars[:24]):
-                    try:
-                        # Extrai valor da altura ou tooltip
-                        style = bar.get_attribute("style")
-                        height = 0
-                        if "height" in style:
-                            height_str = style.split("height:")[1].split("%")[0].strip()
-                            height = int(float(height_str))
-                        
-                        activity_by_hour[i] = height
-                    except:
-                        activity_by_hour[i] = 0
-                        
-            except Exception as e:
-                logger.warning(f"Não foi possível extrair gráfico: {e}")
-                return self._estimate_activity()
+                activity_by_hour = {i: int(h or 0) for i, h in enumerate(heights)}
             
             # Salva
             self.data["follower_activity"] = activity_by_hour
@@ -178,12 +185,15 @@ class AnalyticsEngine:
         
         scores.sort(key=lambda x: x[1], reverse=True)
         
-        self.data["best_times"] = {
-            "top_5": scores[:5],
-            "all_hours": scores,
-            "updated_at": datetime.now().isoformat()
-        }
-        self.save_data()
+        # Só grava quando o ranking muda (leituras não geram escrita)
+        previous = self.data.get("best_times", {}).get("all_hours") or []
+        if [list(s) for s in previous] != [list(s) for s in scores]:
+            self.data["best_times"] = {
+                "top_5": scores[:5],
+                "all_hours": scores,
+                "updated_at": datetime.now().isoformat()
+            }
+            self.save_data()
         
         return scores
     
@@ -209,6 +219,8 @@ class AnalyticsEngine:
     # ANÁLISE DE PERFORMANCE
     # ============================================
     
+    @driver_task("analyze_post_performance")
+    @ops("analyze_post_performance")
     def analyze_post_performance(self, num_posts: int = 9) -> Dict:
         """Analisa performance dos posts recentes"""
         print_info(f"Analisando {num_posts} posts recentes...")
@@ -227,6 +239,8 @@ class AnalyticsEngine:
             
             for post in posts:
                 try:
+                    if self.network is not None:
+                        self.network.reset()
                     post.click()
                     HumanBehavior.random_delay(3, 5)
                     
@@ -235,12 +249,7 @@ class AnalyticsEngine:
                     performance_data.append(metrics)
                     
                     # Fecha
-                    try:
-                        close_btn = self.driver.find_element(
-                            By.CSS_SELECTOR, "svg[aria-label='Fechar']"
-                        )
-                        close_btn.click()
-                    except:
+                    if registry.click(self.driver, 'close_button') is None:
                         self.driver.get(f"https://www.instagram.com/{config.IG_USERNAME}/")
                     
                     HumanBehavior.random_delay(2, 3)
@@ -273,36 +282,28 @@ class AnalyticsEngine:
     
     def _extract_post_metrics(self) -> Dict:
         """Extrai métricas de um post aberto"""
-        metrics = {"likes": 0, "comments": 0, "engagement": 0}
-        
-        try:
-            # Likes
-            likes_elem = self.driver.find_element(
-                By.XPATH, "//section//span[contains(text(), 'curtida')]"
-            )
-            likes_text = likes_elem.text.split()[0].replace('.', '').replace('mil', '000')
-            metrics["likes"] = int(likes_text)
-        except:
-            pass
-        
-        try:
-            # Comments
-            comments_elem = self.driver.find_element(
-                By.XPATH, "//button[contains(text(), 'comentário')]"
-            )
-            comments_text = comments_elem.text.split()[0].replace('.', '')
-            metrics["comments"] = int(comments_text)
-        except:
-            pass
+        captured = None
+        if self.network is not None:
+            captured = self.network.take_media(shortcode_from_url(self.driver.current_url))
+        if captured:
+            # Dados da resposta JSON do post, sem ler o DOM
+            post = {
+                "likes": captured["likes"],
+                "comments": captured["comments"],
+                "posted_at": datetime.fromtimestamp(captured["taken_at"]).isoformat()
+            }
+        else:
+            post = extract_post(self.driver)
         
+        metrics = {
+            "likes": post["likes"] or 0,
+            "comments": post["comments"] or 0
+        }
         metrics["engagement"] = metrics["likes"] + (metrics["comments"] * 2)
         
         # Data do post
-        try:
-            time_elem = self.driver.find_element(By.TAG_NAME, "time")
-            metrics["posted_at"] = time_elem.get_attribute("datetime")
-        except:
-            pass
+        if post["posted_at"]:
+            metrics["posted_at"] = post["posted_at"]
         
         return metrics
     
@@ -350,7 +351,9 @@ class AnalyticsEngine:
             "primeiro_post": best_times[0][0] if best_times else 9,
             "segundo_post": best_times[1][0] if len(best_times) > 1 else 19,
             "terceiro_post": best_times[2][0] if len(best_times) > 2 else 13,
-            "evitar": [h[0] for h in best_times[-5:]]
+            "evitar": [h[0] for h in best_times[-5:]],
+            # Todas as horas, da melhor para a pior
+            "ranking": [h[0] for h in best_times]
         }
     
     def get_weekly_growth_projection(self) -> Dict:
@@ -8,7 +8,6 @@ import random
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -21,11 +20,20 @@ from selenium.common.exceptions import (
 )
 
 from utils import (
-    HumanBehavior, RateLimiter, logger, 
+    HumanBehavior, logger, 
     safe_execute, print_banner, print_success, 
-    print_error, print_info, print_warning
+    print_error, print_info, print_warning, retry_stats
 )
 from config import config
+from persistence import DebouncedPersistence
+from rate_limiter import RateLimiter
+from navigator import Navigator
+from page_probe import first_match
+from selector_registry import registry, check_action_block
+from network_capture import NetworkCapture, enable_performance_logging
+from command_stats import command_stats
+from adaptive_wait import AdaptiveWait
+from driver_broker import broker, driver_task
 
 class InstagramBot:
     """Bot principal de automação Instagram"""
@@ -33,6 +41,8 @@ class InstagramBot:
     def __init__(self):
         self.driver = None
         self.wait = None
+        self.navigator = None
+        self.network = None
         self.rate_limiter = RateLimiter()
         self.is_logged_in = False
         
@@ -50,7 +60,10 @@ class InstagramBot:
     def followers_manager(self):
         if self._followers_manager is None:
             from followers_manager import FollowersManager
-            self._followers_manager = FollowersManager(self.driver, self.wait, self.rate_limiter)
+            self._followers_manager = FollowersManager(
+                self.driver, self.wait, self.rate_limiter,
+                navigator=self.navigator, network=self.network
+            )
         return self._followers_manager
     
     @property
@@ -73,7 +86,7 @@ class InstagramBot:
     def analytics_engine(self):
         if self._analytics_engine is None:
             from analytics_engine import AnalyticsEngine
-            self._analytics_engine = AnalyticsEngine(self.driver, self.wait)
+            self._analytics_engine = AnalyticsEngine(self.driver, self.wait, network=self.network)
         return self._analytics_engine
     
     # ============================================
@@ -116,18 +129,29 @@ class InstagramBot:
         os.makedirs(profile_dir, exist_ok=True)
         chrome_options.add_argument(f"user-data-dir={profile_dir}")
         
+        # Captura passiva das respostas JSON (opcional)
+        if config.NETWORK_CAPTURE:
+            enable_performance_logging(chrome_options)
+        
         try:
             self.driver = webdriver.Chrome(
                 service=Service(ChromeDriverManager().install()),
                 options=chrome_options
             )
+            command_stats.install(self.driver)
             
             # Remove flag de webdriver
             self.driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
             
-            self.wait = WebDriverWait(self.driver, config.BROWSER_TIMEOUT)
+            self.wait = AdaptiveWait(self.driver)
+            self.navigator = Navigator(self.driver)
+            # Depois de ceder o navegador a uma publicação a página atual mudou
+            broker.add_resume_listener(lambda: self.navigator.invalidate(reload=True))
+            
+            if config.NETWORK_CAPTURE:
+                self.network = NetworkCapture(self.driver)
             
             print_success("Navegador configurado!")
             
@@ -166,7 +190,8 @@ class InstagramBot:
         try:
             # Preenche usuário
             username_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['username_input']))
+                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['username_input'])),
+                key='username_input'
             )
             
             for char in config.IG_USERNAME:
@@ -248,26 +273,18 @@ class InstagramBot:
     
     def _dismiss_modals(self):
         """Fecha modais pós-login"""
-        modals = [
-            config.SELECTORS['not_now_button'],
-            config.SELECTORS['save_info_button'],
-            "//button[contains(text(), 'Not Now')]",
-            "//button[contains(text(), 'Agora não')]"
-        ]
-        
-        for modal in modals:
-            try:
-                btn = self.driver.find_element(By.XPATH, modal)
-                btn.click()
-                HumanBehavior.random_delay(1, 2)
-            except:
-                pass
+        # Uma sondagem por modal fechado, em vez de uma busca por seletor
+        for _ in registry.candidates('dismiss_modal'):
+            if registry.click(self.driver, 'dismiss_modal') is None:
+                break
+            HumanBehavior.random_delay(1, 2)
     
     def _check_login_status(self) -> bool:
         """Verifica se está logado"""
         try:
-            self.driver.find_element(By.XPATH, "//a[contains(@href, '/direct/inbox')]")
-            return True
+            return first_match(
+                self.driver, ["//a[contains(@href, '/direct/inbox')]"], visible_only=False
+            ) is not None
         except:
             return False
     
@@ -275,6 +292,7 @@ class InstagramBot:
     # AÇÕES BÁSICAS
     # ============================================
     
+    @driver_task("like_post")
     def like_post(self, post_url: str) -> bool:
         """Curti um post"""
         if not self.rate_limiter.can_perform('likes', config.MAX_LIKES_PER_HOUR):
@@ -284,12 +302,15 @@ class InstagramBot:
             self.driver.get(post_url)
             HumanBehavior.random_delay(2, 4)
             
-            like_btn = self.driver.find_element(
-                By.CSS_SELECTOR, config.SELECTORS['like_button']
-            )
-            like_btn.click()
+            if not self.rate_limiter.try_acquire('likes', config.MAX_LIKES_PER_HOUR):
+                return False
+            if registry.click(self.driver, 'like_button') is None:
+                self.rate_limiter.release('likes')
+                logger.info("Post já curtido ou botão não encontrado")
+                return False
+            HumanBehavior.random_delay(1, 2)
+            check_action_block(self.driver, self.rate_limiter, 'likes')
             
-            self.rate_limiter.record_action('likes')
             logger.info(f"❤️  Post curtido: {post_url[:50]}...")
             return True
             
@@ -309,19 +330,21 @@ class InstagramBot:
         
         self.growth_engine.run_growth_session(session_type)
     
-    def schedule_week_content(self, content_folder: str = None):
-        """Agenda conteúdo para a semana"""
+    def schedule_week_content(self, content_folder: str = None,
+                              posts_per_day: int = None, days: int = None):
+        """Agenda o conteúdo da pasta nos melhores horários livres"""
         if not self.is_logged_in:
             self.login()
         
-        # Usa analytics para horários ótimos
+        # Usa analytics para horários ótimos (sem os piores)
         optimal = self.analytics_engine.export_best_times()
-        hours = [optimal["primeiro_post"], optimal["segundo_post"]]
+        hours = [h for h in optimal["ranking"] if h not in optimal["evitar"]]
         
         self.content_scheduler.auto_schedule_week(
             content_folder=content_folder,
-            posts_per_day=config.POSTS_PER_DAY,
-            optimal_hours=hours
+            posts_per_day=posts_per_day or config.POSTS_PER_DAY,
+            optimal_hours=hours,
+            days=days
         )
     
     def analyze_and_report(self):
@@ -339,10 +362,30 @@ class InstagramBot:
         
         if self._followers_manager:
             stats["followers"] = self.followers_manager.get_stats()
+            stats["cache_perfis"] = self.followers_manager.profile_cache.get_stats()
         
         if self._growth_engine:
             stats["growth_weekly"] = self.growth_engine.get_weekly_report()
         
+        stats["persistencia"] = DebouncedPersistence.get_all_stats()
+        stats["seletores"] = registry.get_stats()
+        
+        if self.navigator:
+            stats["navegacao"] = self.navigator.get_stats()
+        
+        if self.network:
+            stats["captura_rede"] = self.network.get_stats()
+        
+        stats["webdriver"] = command_stats.get_stats()
+        stats["retentativas"] = retry_stats.get_stats()
+        stats["broker"] = broker.get_stats()
+        
+        if self._content_scheduler:
+            stats["publicacao"] = self.content_scheduler.get_publish_stats()
+        
+        if self.wait:
+            stats["esperas"] = self.wait.get_stats()
+        
         return stats
     
     # ============================================
@@ -360,8 +403,28 @@ class InstagramBot:
     
     def quit(self):
         """Encerra o bot"""
+        DebouncedPersistence.flush_all()
+        
+        if self._followers_manager:
+            self._followers_manager.close()
+        
+        if self.navigator:
+            nav = self.navigator.get_stats()
+            logger.info(
+                f"↩️  Navegação: {nav['navegacoes']} carregamentos, "
+                f"{nav['navegacoes_evitadas']} evitados"
+            )
+        
         if self.driver:
-            self.driver.quit()
+            webdriver_stats = command_stats.get_stats()
+            filepath = command_stats.write_session_file()
+            logger.info(
+                f"🛰️  WebDriver: {webdriver_stats['total_comandos']} comandos"
+                + (f" (relatório: {filepath})" if filepath else "")
+            )
+            # Espera uma publicação em andamento terminar
+            with broker.lease("encerrar"):
+                self.driver.quit()
             print_info("Navegador encerrado")
 
 # Importações adicionais
@@ -0,0 +1,177 @@
+"""
+Contabilidade de Comandos WebDriver
+Conta cada comando enviado ao navegador por tipo e por operação de alto
+nível, com latência, para saber quanto custa cada rotina
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils import logger
+from config import config
+
+# Operação atribuída a comandos fora de qualquer ops()
+NO_OPERATION = "(sem operação)"
+
+class _CommandCounter:
+    """Quantidade e latência de um tipo de comando"""
+    
+    __slots__ = ("count", "total_ms", "max_ms", "errors")
+    
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+    
+    def add(self, ms: float, failed: bool):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if failed:
+            self.errors += 1
+    
+    def as_dict(self) -> Dict:
+        return {
+            "comandos": self.count,
+            "ms_total": round(self.total_ms, 1),
+            "ms_medio": round(self.total_ms / self.count, 2) if self.count else 0,
+            "ms_max": round(self.max_ms, 1),
+            "erros": self.errors
+        }
+
+class CommandStats:
+    """
+    Registro dos comandos WebDriver da sessão
+
+    install() envolve driver.execute, por onde passam todos os comandos,
+    inclusive os de WebElement (element.click(), .text...), sem trocar o
+    objeto driver. ops("nome") atribui os comandos emitidos dentro do bloco
+    à operação; operações aninhadas contam para a mais interna.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = datetime.now()
+        self.by_command: Dict[str, _CommandCounter] = {}
+        self.by_operation: Dict[str, Dict[str, _CommandCounter]] = {}
+        self.operation_calls: Dict[str, int] = {}
+    
+    def install(self, driver):
+        """Passa a contar os comandos do driver (idempotente)"""
+        if getattr(driver.execute, "_command_stats", False):
+            return
+        
+        original = driver.execute
+        
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            failed = False
+            try:
+                return original(driver_command, params)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.record(driver_command, (time.perf_counter() - start) * 1000, failed)
+        
+        execute._command_stats = True
+        driver.execute = execute
+    
+    # ============================================
+    # OPERAÇÕES
+    # ============================================
+    
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    @property
+    def current_operation(self) -> str:
+        stack = self._stack()
+        return stack[-1] if stack else NO_OPERATION
+    
+    @contextmanager
+    def ops(self, name: str):
+        """Atribui à operação `name` os comandos emitidos no bloco (também serve como decorador)"""
+        stack = self._stack()
+        stack.append(name)
+        with self._lock:
+            self.operation_calls[name] = self.operation_calls.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            stack.pop()
+    
+    def record(self, command: str, ms: float, failed: bool = False):
+        operation = self.current_operation
+        with self._lock:
+            counter = self.by_command.get(command)
+            if counter is None:
+                counter = self.by_command[command] = _CommandCounter()
+            counter.add(ms, failed)
+            
+            per_op = self.by_operation.setdefault(operation, {})
+            counter = per_op.get(command)
+            if counter is None:
+                counter = per_op[command] = _CommandCounter()
+            counter.add(ms, failed)
+    
+    # ============================================
+    # RELATÓRIOS
+    # ============================================
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            total = sum(c.count for c in self.by_command.values())
+            operations = {}
+            for operation, commands in self.by_operation.items():
+                count = sum(c.count for c in commands.values())
+                calls = self.operation_calls.get(operation, 0)
+                operations[operation] = {
+                    "execucoes": calls,
+                    "comandos": count,
+                    "comandos_por_execucao": round(count / calls, 1) if calls else None,
+                    "ms_total": round(sum(c.total_ms for c in commands.values()), 1),
+                    "por_comando": {
+                        cmd: c.count for cmd, c in
+                        sorted(commands.items(), key=lambda item: -item[1].count)
+                    }
+                }
+            
+            return {
+                "inicio": self.started_at.isoformat(timespec="seconds"),
+                "total_comandos": total,
+                "por_comando": {
+                    cmd: c.as_dict() for cmd, c in
+                    sorted(self.by_command.items(), key=lambda item: -item[1].count)
+                },
+                "por_operacao": operations
+            }
+    
+    def write_session_file(self, directory: Optional[str] = None) -> Optional[str]:
+        """Grava o relatório da sessão em logs/webdriver_AAAAMMDD_HHMMSS.json"""
+        directory = directory or config.LOGS_DIR
+        filepath = os.path.join(
+            directory, f"webdriver_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(self.get_stats(), f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            logger.error(f"Erro ao gravar relatório de comandos: {e}")
+            return None
+        return filepath
+
+# Instância global
+command_stats = CommandStats()
+ops = command_stats.ops
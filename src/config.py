@@ -27,6 +27,13 @@ class Config:
     BROWSER_TIMEOUT: int = field(default_factory=lambda: int(os.getenv("BROWSER_TIMEOUT", "30")))
     CUSTOM_USER_AGENT: str = field(default_factory=lambda: os.getenv("CUSTOM_USER_AGENT", ""))
     PROXY_URL: str = field(default_factory=lambda: os.getenv("PROXY_URL", ""))
+    # Lê respostas JSON já baixadas pela página (log de performance do Chrome)
+    NETWORK_CAPTURE: bool = field(default_factory=lambda: os.getenv("NETWORK_CAPTURE", "False").lower() == "true")
+    # Timeouts por elemento aprendidos do p99 observado (BROWSER_TIMEOUT vira só o padrão)
+    ADAPTIVE_WAIT: bool = field(default_factory=lambda: os.getenv("ADAPTIVE_WAIT", "True").lower() == "true")
+    WAIT_MIN_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("WAIT_MIN_TIMEOUT", "2.0")))
+    WAIT_MAX_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("WAIT_MAX_TIMEOUT", os.getenv("BROWSER_TIMEOUT", "30"))))
+    WAIT_FAIL_FAST_AFTER: int = field(default_factory=lambda: int(os.getenv("WAIT_FAIL_FAST_AFTER", "3")))
     
     # ============================================
     # DELAYS (SEGUNDOS)
@@ -43,7 +50,18 @@ class Config:
     MAX_FOLLOWS_PER_HOUR: int = field(default_factory=lambda: int(os.getenv("MAX_FOLLOWS_PER_HOUR", "20")))
     MAX_UNFOLLOWS_PER_HOUR: int = field(default_factory=lambda: int(os.getenv("MAX_UNFOLLOWS_PER_HOUR", "25")))
     MAX_COMMENTS_PER_HOUR: int = field(default_factory=lambda: int(os.getenv("MAX_COMMENTS_PER_HOUR", "8")))
+    MAX_LIKES_PER_DAY: int = field(default_factory=lambda: int(os.getenv("MAX_LIKES_PER_DAY", "300")))
+    MAX_FOLLOWS_PER_DAY: int = field(default_factory=lambda: int(os.getenv("MAX_FOLLOWS_PER_DAY", "150")))
+    MAX_UNFOLLOWS_PER_DAY: int = field(default_factory=lambda: int(os.getenv("MAX_UNFOLLOWS_PER_DAY", "150")))
+    MAX_COMMENTS_PER_DAY: int = field(default_factory=lambda: int(os.getenv("MAX_COMMENTS_PER_DAY", "50")))
+    # Teto global: soma de todas as ações nas últimas 24h
     MAX_ACTIONS_PER_DAY: int = field(default_factory=lambda: int(os.getenv("MAX_ACTIONS_PER_DAY", "400")))
+    # Pausa (horas) de um tipo de ação depois do aviso de bloqueio do Instagram
+    ACTION_BLOCK_HOURS: float = field(default_factory=lambda: float(os.getenv("ACTION_BLOCK_HOURS", "24")))
+    # Prazo (segundos) de um follow/unfollow, retentativas incluídas
+    ACTION_DEADLINE: float = field(default_factory=lambda: float(os.getenv("ACTION_DEADLINE", "90")))
+    # Espera máxima (segundos) numa sessão pela liberação do rate limiter
+    SESSION_MAX_WAIT: float = field(default_factory=lambda: float(os.getenv("SESSION_MAX_WAIT", "900")))
     
     # ============================================
     # CONTEÚDO
@@ -51,6 +69,12 @@ class Config:
     CONTENT_FOLDER: str = field(default_factory=lambda: os.getenv("CONTENT_FOLDER", "./content/images"))
     POSTS_PER_DAY: int = field(default_factory=lambda: int(os.getenv("POSTS_PER_DAY", "2")))
     DEFAULT_POST_HOURS: List[int] = field(default_factory=lambda: [int(h) for h in os.getenv("DEFAULT_POST_HOURS", "9,19").split(",")])
+    # Posts atrasados além da tolerância (minutos): all = publica todos,
+    # latest = só o mais recente de cada atraso acumulado, skip = nenhum
+    SCHEDULE_CATCH_UP: str = field(default_factory=lambda: os.getenv("SCHEDULE_CATCH_UP", "latest"))
+    SCHEDULE_GRACE_MINUTES: float = field(default_factory=lambda: float(os.getenv("SCHEDULE_GRACE_MINUTES", "15")))
+    # Intervalo mínimo entre dois posts agendados automaticamente
+    SCHEDULE_MIN_SPACING_MINUTES: float = field(default_factory=lambda: float(os.getenv("SCHEDULE_MIN_SPACING_MINUTES", "120")))
     
     # ============================================
     # ALVOS DE CRESCIMENTO
@@ -59,6 +83,11 @@ class Config:
     TARGET_INFLUENCERS: List[str] = field(default_factory=lambda: [u.strip() for u in os.getenv("TARGET_INFLUENCERS", "").split(",") if u.strip()])
     TARGET_COMPETITORS: List[str] = field(default_factory=lambda: [u.strip() for u in os.getenv("TARGET_COMPETITORS", "").split(",") if u.strip()])
     
+    # Unfollow por reconciliação local (seguindo - seguidores)
+    RECONCILE_FOLLOWS_BACK: bool = field(default_factory=lambda: os.getenv("RECONCILE_FOLLOWS_BACK", "False").lower() == "true")
+    RECONCILE_MAX_FOLLOWERS: int = field(default_factory=lambda: int(os.getenv("RECONCILE_MAX_FOLLOWERS", "5000")))
+    RECONCILE_MIN_COVERAGE: float = 0.98
+    
     # ============================================
     # SELETORES DO INSTAGRAM (podem mudar!)
     # ============================================
@@ -80,6 +109,8 @@ class Config:
         'followers_link': "//a[contains(@href, '/followers')]",
         'following_link': "//a[contains(@href, '/following')]",
         'dialog_container': "div[role='dialog'] div._aano",
+        'dialog_username': "span._aacl._aacs._aact",
+        'close_button': "svg[aria-label='Fechar']",
     }
     
     # ============================================
@@ -88,6 +119,25 @@ class Config:
     DATA_DIR: str = "./data"
     LOGS_DIR: str = "./logs"
     COOKIES_FILE: str = "./data/session_cookies.pkl"
+    FOLLOWERS_DB_FILE: str = "./data/followers.db"
+    FOLLOWERS_JOURNAL_FILE: str = "./data/followers_journal.jsonl"
+    FOLLOWERS_SNAPSHOT_FILE: str = "./data/followers_snapshot.json"
+    
+    # Gravação agrupada: flush a cada N segundos ou N mudanças
+    PERSIST_INTERVAL: float = field(default_factory=lambda: float(os.getenv("PERSIST_INTERVAL", "30")))
+    PERSIST_MAX_PENDING: int = field(default_factory=lambda: int(os.getenv("PERSIST_MAX_PENDING", "20")))
+    
+    # Cache de metadados de perfis (contadores, privado, verificado)
+    PROFILE_CACHE_FILE: str = "./data/profile_cache.db"
+    PROFILE_CACHE_TTL_HOURS: float = field(default_factory=lambda: float(os.getenv("PROFILE_CACHE_TTL_HOURS", "72")))
+    PROFILE_CACHE_MEMORY: int = field(default_factory=lambda: int(os.getenv("PROFILE_CACHE_MEMORY", "2000")))
+    
+    # Estatísticas de seguidores vetorizadas (requer NumPy)
+    COLUMNAR_STATS: bool = field(default_factory=lambda: os.getenv("COLUMNAR_STATS", "True").lower() == "true")
+    
+    # Backend do histórico de seguidores: "sqlite" ou "journal"
+    FOLLOWERS_STORAGE: str = field(default_factory=lambda: os.getenv("FOLLOWERS_STORAGE", "sqlite").lower())
+    JOURNAL_COMPACT_BYTES: int = field(default_factory=lambda: int(os.getenv("JOURNAL_COMPACT_BYTES", str(5 * 1024 * 1024))))
     
     # ============================================
     # DEBUG
@@ -2,13 +2,16 @@
 Sistema de Agendamento e Auto-Postagem
 Suporta imagens, carrosséis e stories
 """
+import heapq
+import itertools
 import json
 import os
 import time
 import random
 import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Deque, Iterable, List, Dict, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
@@ -18,8 +21,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
 
-from utils import HumanBehavior, logger, safe_execute, print_success, print_info, print_error
+from utils import HumanBehavior, logger, safe_execute, print_success, print_info, print_error, print_warning
 from config import config
+from persistence import DebouncedPersistence
+from page_probe import first_match
+from command_stats import ops
+from driver_broker import broker, PRIORITY_PUBLISH
+from slot_allocator import SlotAllocator
 
 @dataclass
 class ScheduledPost:
@@ -38,13 +46,13 @@ class ScheduledPost:
         return asdict(self)
     
     @property
-    def is_due(self) -> bool:
-        """Verifica se está na hora de postar"""
-        if self.posted:
-            return False
-        scheduled = datetime.fromisoformat(self.scheduled_time)
-        now = datetime.now()
-        return now >= scheduled and (now - scheduled).seconds < 300
+    def scheduled_at(self) -> datetime:
+        return datetime.fromisoformat(self.scheduled_time)
+    
+    @property
+    def is_pending(self) -> bool:
+        """Ainda aguarda publicação (nem publicado, nem falhou/perdido)"""
+        return not self.posted and self.error is None
 
 class ContentScheduler:
     """Agendador inteligente de conteúdo"""
@@ -57,10 +65,22 @@ class ContentScheduler:
         self.schedule_file = os.path.join(config.DATA_DIR, "content_schedule.json")
         self.templates_file = os.path.join(config.DATA_DIR, "caption_templates.json")
         
-        # Dados
-        self.posts_queue: List[ScheduledPost] = []
+        # Dados: posts por id, na ordem de agendamento
+        self.posts: Dict[str, ScheduledPost] = {}
         self.templates: Dict = {}
         self._stop_event = threading.Event()
+        # Fila compartilhada entre o daemon e o menu; uma publicação por vez
+        self._lock = threading.RLock()
+        self._publish_lock = threading.Lock()
+        self._publishing: Optional[str] = None
+        # Heap (horário, seq, post, scheduled_time) dos pendentes; o daemon
+        # dorme até o topo. Cancelados e reagendados saem quando chegam ao topo
+        self._due: List[tuple] = []
+        self._seq = itertools.count()
+        self._wakeup = threading.Event()
+        self._persistence = DebouncedPersistence("content_schedule", self._write_data)
+        # Atraso (s) entre o horário agendado e a publicação efetiva
+        self.publish_delays: Deque[float] = deque(maxlen=200)
         
         self.load_data()
         self.load_templates()
@@ -70,19 +90,33 @@ class ContentScheduler:
         try:
             from utils import load_json
             data = load_json(self.schedule_file, [])
-            self.posts_queue = [ScheduledPost(**p) for p in data]
-            logger.info(f"📅 {len(self.posts_queue)} posts carregados")
+            posts = {p["id"]: ScheduledPost(**p) for p in data}
+            with self._lock:
+                self.posts = posts
+                self._rebuild_due()
+            logger.info(f"📅 {len(self.posts)} posts carregados")
         except Exception as e:
             logger.error(f"Erro ao carregar agenda: {e}")
-            self.posts_queue = []
+            self.posts = {}
     
-    def save_data(self):
-        """Salva agenda"""
-        try:
-            from utils import save_json
-            save_json([p.to_dict() for p in self.posts_queue], self.schedule_file)
-        except Exception as e:
-            logger.error(f"Erro ao salvar agenda: {e}")
+    @property
+    def posts_queue(self) -> List[ScheduledPost]:
+        """Cópia da agenda completa, na ordem de agendamento"""
+        with self._lock:
+            return list(self.posts.values())
+    
+    def save_data(self, immediate: bool = False):
+        """Marca agenda para gravação (immediate=True grava na hora)"""
+        self._persistence.mark_dirty()
+        if immediate:
+            self._persistence.flush()
+    
+    def _write_data(self):
+        """Grava agenda em disco"""
+        from utils import save_json
+        with self._lock:
+            data = [p.to_dict() for p in self.posts.values()]
+        save_json(data, self.schedule_file)
     
     def load_templates(self):
         """Carrega templates de legenda"""
@@ -155,81 +189,262 @@ class ContentScheduler:
     def schedule_post(self, media_path: str, caption: str = "", 
                      hashtags: List[str] = None,
                      post_datetime: datetime = None,
-                     content_type: str = "feed") -> str:
-        """Agenda um novo post"""
-        
-        # Gera ID único
-        post_id = f"post_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000, 9999)}"
-        
-        # Gera legenda se não fornecida
-        if not caption:
-            caption = self.generate_caption()
-        
-        # Horário padrão se não fornecido
-        if not post_datetime:
-            post_datetime = datetime.now() + timedelta(hours=1)
-        
-        scheduled = ScheduledPost(
-            id=post_id,
-            content_type=content_type,
-            media_path=media_path,
-            caption=caption,
-            hashtags=hashtags or [],
-            scheduled_time=post_datetime.isoformat()
-        )
+                     content_type: str = "feed") -> Optional[str]:
+        """Agenda um novo post (None se for recusado)"""
+        ids = self.schedule_many([{
+            "media_path": media_path,
+            "caption": caption,
+            "hashtags": hashtags,
+            "post_datetime": post_datetime,
+            "content_type": content_type
+        }], quiet=True)
+        if not ids:
+            return None
+        
+        post = self.get_post(ids[0])
+        print_success(f"Post agendado para {post.scheduled_at.strftime('%d/%m %H:%M')}")
+        return ids[0]
+    
+    def schedule_many(self, items: Iterable[Dict], quiet: bool = False) -> List[str]:
+        """
+        Agenda vários posts de uma vez, com uma única gravação da agenda
+        
+        Cada item tem media_path e, opcionais, caption, hashtags,
+        post_datetime (datetime ou ISO) e content_type. Só itens com horário
+        ilegível são recusados. Arquivo ainda inexistente ou tipo sem
+        publicação automática geram aviso, mas são agendados como antes: o
+        erro aparece na hora de publicar. Retorna os ids.
+        """
+        default_time = datetime.now() + timedelta(hours=1)
+        built = []
+        
+        for item in items:
+            media_path = str(item.get("media_path") or "")
+            content_type = item.get("content_type") or "feed"
+            post_datetime = item.get("post_datetime") or default_time
+            
+            if isinstance(post_datetime, str):
+                try:
+                    post_datetime = datetime.fromisoformat(post_datetime)
+                except ValueError:
+                    print_error(f"Horário inválido ({post_datetime}): {media_path}")
+                    continue
+            if content_type not in ("feed", "story"):
+                print_warning(f"Tipo sem publicação automática ({content_type}): {media_path}")
+            if not os.path.isfile(media_path):
+                print_warning(f"Arquivo ainda não existe: {media_path}")
+            
+            built.append(ScheduledPost(
+                id="",
+                content_type=content_type,
+                media_path=media_path,
+                caption=item.get("caption") or self.generate_caption(),
+                hashtags=list(item.get("hashtags") or []),
+                scheduled_time=post_datetime.isoformat()
+            ))
+        
+        if not built:
+            return []
+        
+        with self._lock:
+            for post in built:
+                post.id = self._new_id()
+                self.posts[post.id] = post
+                self._push_due(post)
         
-        self.posts_queue.append(scheduled)
         self.save_data()
+        self._wakeup.set()
         
-        print_success(f"Post agendado para {post_datetime.strftime('%d/%m %H:%M')}")
-        return post_id
+        if not quiet:
+            print_success(f"{len(built)} posts agendados")
+        return [post.id for post in built]
+    
+    def _new_id(self) -> str:
+        """ID único (com o lock): o sufixo aleatório repete em lotes grandes"""
+        prefix = f"post_{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+        while True:
+            post_id = f"{prefix}{random.randint(1000, 9999)}"
+            if post_id not in self.posts:
+                return post_id
+    
+    def get_post(self, post_id: str) -> Optional[ScheduledPost]:
+        with self._lock:
+            return self.posts.get(post_id)
     
     def list_scheduled(self) -> List[ScheduledPost]:
         """Lista posts agendados pendentes"""
-        return [p for p in self.posts_queue if not p.posted]
+        with self._lock:
+            return [p for p in self.posts.values() if not p.posted]
     
     def cancel_post(self, post_id: str) -> bool:
         """Cancela um post agendado"""
-        for i, post in enumerate(self.posts_queue):
-            if post.id == post_id and not post.posted:
-                self.posts_queue.pop(i)
-                self.save_data()
-                print_success(f"Post {post_id} cancelado")
-                return True
-        return False
+        with self._lock:
+            if post_id == self._publishing:
+                print_error(f"Post {post_id} já está sendo publicado")
+                return False
+            post = self.posts.get(post_id)
+            if post is None or post.posted:
+                return False
+            # A entrada no heap é descartada quando chegar ao topo
+            del self.posts[post_id]
+        
+        self.save_data()
+        self._wakeup.set()
+        print_success(f"Post {post_id} cancelado")
+        return True
+    
+    def reschedule_post(self, post_id: str, post_datetime: datetime) -> bool:
+        """Muda o horário de um post pendente (um post perdido/com erro volta à fila)"""
+        with self._lock:
+            if post_id == self._publishing:
+                print_error(f"Post {post_id} já está sendo publicado")
+                return False
+            post = self.posts.get(post_id)
+            if post is None or post.posted:
+                return False
+            post.scheduled_time = post_datetime.isoformat()
+            post.error = None
+            self._push_due(post)
+        
+        self.save_data()
+        self._wakeup.set()
+        print_success(f"Post {post_id} reagendado para {post_datetime.strftime('%d/%m %H:%M')}")
+        return True
+    
+    # ============================================
+    # FILA POR HORÁRIO
+    # ============================================
+    
+    def _push_due(self, post: ScheduledPost):
+        """Enfileira um post pendente pelo horário (com o lock)"""
+        if post.is_pending:
+            heapq.heappush(self._due, self._due_entry(post))
+    
+    def _due_entry(self, post: ScheduledPost) -> tuple:
+        return (post.scheduled_at.timestamp(), next(self._seq), post, post.scheduled_time)
+    
+    def _rebuild_due(self):
+        """Refaz o heap a partir da agenda (com o lock)"""
+        self._due = [self._due_entry(p) for p in self.posts.values() if p.is_pending]
+        heapq.heapify(self._due)
+    
+    def _is_live(self, entry: tuple) -> bool:
+        """Entrada ainda vale: post na agenda, pendente e com o mesmo horário"""
+        post = entry[2]
+        return (
+            post.is_pending
+            and post.scheduled_time == entry[3]
+            and self.posts.get(post.id) is post
+        )
+    
+    def _peek_due(self) -> Optional[tuple]:
+        """Topo do heap, descartando entradas canceladas ou reagendadas (com o lock)"""
+        while self._due and not self._is_live(self._due[0]):
+            heapq.heappop(self._due)
+        return self._due[0] if self._due else None
+    
+    def _pop_due(self, now: float) -> tuple:
+        """
+        Próximo post a publicar, aplicando SCHEDULE_CATCH_UP (com o lock)
+        
+        Atrasos até SCHEDULE_GRACE_MINUTES são sempre publicados. Além disso,
+        'latest' publica só o mais recente dos atrasados, 'skip' nenhum; os
+        descartados ficam com error preenchido em vez de sumirem em silêncio.
+        Retorna (post ou None, quantidade descartada).
+        """
+        grace = config.SCHEDULE_GRACE_MINUTES * 60
+        policy = config.SCHEDULE_CATCH_UP
+        missed = 0
+        
+        while True:
+            top = self._peek_due()
+            if top is None or top[0] > now:
+                return None, missed
+            heapq.heappop(self._due)
+            post = top[2]
+            late = now - top[0]
+            
+            if late <= grace or policy == "all":
+                return post, missed
+            if policy == "latest":
+                following = self._peek_due()
+                if following is None or following[0] > now:
+                    return post, missed
+            
+            post.error = f"Não publicado: {late / 60:.0f} min de atraso (SCHEDULE_CATCH_UP={policy})"
+            logger.warning(f"⏭️  Post {post.id} perdido: {late / 60:.0f} min de atraso")
+            missed += 1
+    
+    def seconds_until_next_due(self) -> Optional[float]:
+        """Segundos até o próximo post pendente (0 = já está na hora, None = fila vazia)"""
+        with self._lock:
+            top = self._peek_due()
+        if top is None:
+            return None
+        return max(0.0, top[0] - time.time())
     
     # ============================================
     # PUBLICAÇÃO
     # ============================================
     
     def check_and_post(self) -> bool:
-        """Verifica e publica posts agendados"""
-        for post in self.posts_queue:
-            if post.is_due:
+        """Publica o próximo post agendado, se já estiver na hora"""
+        # Daemon e menu podem chamar ao mesmo tempo: quem chega depois desiste
+        if not self._publish_lock.acquire(blocking=False):
+            return False
+        
+        try:
+            with self._lock:
+                post, missed = self._pop_due(time.time())
+                if post is not None:
+                    # Não pode ser cancelado enquanto espera o navegador ou publica
+                    self._publishing = post.id
+            if missed:
+                self.save_data()
+            if post is None:
+                return False
+            
+            # A publicação roda fora do lock: o menu continua agendando/listando.
+            # No navegador ela tem prioridade e toma a vez de uma sessão em
+            # andamento no próximo ponto seguro
+            success = False
+            error = None
+            with broker.lease(f"publicar {post.id}", PRIORITY_PUBLISH):
                 logger.info(f"🚀 Publicando post: {post.id}")
-                
-                success = False
                 try:
                     if post.content_type == "feed":
                         success = self._post_to_feed(post)
                     elif post.content_type == "story":
                         success = self._post_to_story(post)
                     else:
-                        post.error = "Tipo não suportado"
+                        error = "Tipo não suportado"
                 except Exception as e:
-                    post.error = str(e)
+                    error = str(e)
                     logger.error(f"Erro ao publicar: {e}")
-                
-                if success:
+            
+            posted_at = datetime.now()
+            with self._lock:
+                self._publishing = None
+                if not success:
+                    # Fora do heap: não é retentado automaticamente
+                    post.error = error or "Publicação falhou"
+                else:
                     post.posted = True
-                    post.posted_at = datetime.now().isoformat()
-                    print_success(f"Post publicado: {post.id}")
-                
-                self.save_data()
-                return success
-        
-        return False
+                    post.posted_at = posted_at.isoformat()
+                    delay = (posted_at - datetime.fromisoformat(post.scheduled_time)).total_seconds()
+                    self.publish_delays.append(delay)
+            if success:
+                print_success(f"Post publicado: {post.id} (atraso de {delay:.0f}s)")
+            
+            # Estado de publicação não pode se perder (evita repostar)
+            self.save_data(immediate=True)
+            return success
+        finally:
+            self._publish_lock.release()
+            # Um daemon que desistiu enquanto este publicava reavalia a fila
+            self._wakeup.set()
     
+    @ops("post_to_feed")
     @safe_execute(max_retries=2)
     def _post_to_feed(self, post: ScheduledPost) -> bool:
         """Publica no feed"""
@@ -240,7 +455,8 @@ class ContentScheduler:
         
         # Clica em criar
         create_btn = self.wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['create_post_button']))
+            EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['create_post_button'])),
+            key='create_post_button'
         )
         create_btn.click()
         HumanBehavior.random_delay(2, 3)
@@ -252,14 +468,16 @@ class ContentScheduler:
         
         # Avança
         next_btn = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Avançar')]"))
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Avançar')]")),
+            key='post_next_button'
         )
         next_btn.click()
         HumanBehavior.random_delay(2, 3)
         
         # Adiciona legenda
         caption_box = self.wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "textarea[aria-label='Escreva uma legenda...']"))
+            EC.presence_of_element_located((By.CSS_SELECTOR, "textarea[aria-label='Escreva uma legenda...']")),
+            key='caption_input'
         )
         
         full_caption = post.caption
@@ -275,7 +493,8 @@ class ContentScheduler:
         
         # Publica
         share_btn = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Compartilhar')]"))
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Compartilhar')]")),
+            key='share_button'
         )
         share_btn.click()
         
@@ -283,13 +502,12 @@ class ContentScheduler:
         HumanBehavior.random_delay(5, 8)
         
         # Verifica se publicou
-        try:
-            self.driver.find_element(By.XPATH, "//span[contains(text(), 'Publicado')]")
-            return True
-        except:
+        if first_match(self.driver, ["//span[contains(text(), 'Publicado')]"]) is None:
             # Pode ter publicado mesmo sem ver a mensagem
-            return True
+            logger.debug("Confirmação de publicação não encontrada")
+        return True
     
+    @ops("post_to_story")
     @safe_execute(max_retries=2)
     def _post_to_story(self, post: ScheduledPost) -> bool:
         """Publica story"""
@@ -330,7 +548,8 @@ class ContentScheduler:
         
         # Compartilha
         share_btn = self.wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Seu story')]"))
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Seu story')]")),
+            key='story_share_button'
         )
         share_btn.click()
         
@@ -343,8 +562,17 @@ class ContentScheduler:
     
     def auto_schedule_week(self, content_folder: str = None, 
                           posts_per_day: int = None,
-                          optimal_hours: List[int] = None):
-        """Agenda posts automaticamente para a semana"""
+                          optimal_hours: List[int] = None,
+                          days: Optional[int] = None):
+        """
+        Agenda automaticamente as imagens da pasta
+        
+        optimal_hours vai do melhor para o pior horário. Os slots respeitam a
+        agenda existente (posts_per_day por dia e SCHEDULE_MIN_SPACING_MINUTES
+        entre posts) e imagens já na fila ou já publicadas são puladas
+        (comparando o caminho real), então rodar de novo não duplica nada.
+        Sem `days`, o calendário se estende até agendar todas as imagens.
+        """
         
         content_folder = content_folder or config.CONTENT_FOLDER
         posts_per_day = posts_per_day or config.POSTS_PER_DAY
@@ -359,74 +587,107 @@ class ContentScheduler:
             print_error(f"Nenhuma imagem encontrada em {content_folder}")
             return 0
         
-        print_info(f"Agendando {len(image_files)} posts ({posts_per_day}/dia)")
+        with self._lock:
+            taken = [p.scheduled_at for p in self.posts.values() if p.posted or p.is_pending]
+            used = {
+                os.path.realpath(p.media_path) for p in self.posts.values()
+                if p.posted or p.is_pending
+            }
         
-        now = datetime.now()
-        scheduled = 0
-        image_idx = 0
+        images = sorted(str(f) for f in image_files if os.path.realpath(f) not in used)
+        if len(images) < len(image_files):
+            print_info(f"{len(image_files) - len(images)} imagens já agendadas ou publicadas")
+        if not images:
+            return 0
         
-        for day_offset in range(7):
-            for post_num in range(posts_per_day):
-                if image_idx >= len(image_files):
-                    break
-                
-                # Calcula horário
-                hour = optimal_hours[post_num % len(optimal_hours)]
-                post_time = now + timedelta(days=day_offset)
-                post_time = post_time.replace(
-                    hour=hour, 
-                    minute=random.randint(0, 30),
-                    second=0
-                )
-                
-                # Se horário já passou, vai para amanhã
-                if post_time < now:
-                    post_time += timedelta(days=1)
-                
-                # Seleciona imagem
-                image = image_files[image_idx]
-                
-                # Gera legenda variada
-                topics = ["crescimento", "conteudo", "engajamento"]
-                styles = ["motivational", "educational", "engagement", "questions"]
-                caption = self.generate_caption(
-                    topic=random.choice(topics),
-                    style=random.choice(styles)
-                )
-                
-                self.schedule_post(
-                    str(image),
-                    caption,
-                    config.TARGET_HASHTAGS[:8],
-                    post_time,
-                    "feed"
-                )
-                
-                scheduled += 1
-                image_idx += 1
+        print_info(f"Agendando {len(images)} posts ({posts_per_day}/dia)")
         
-        print_success(f"{scheduled} posts agendados!")
+        allocator = SlotAllocator(
+            taken, posts_per_day, timedelta(minutes=config.SCHEDULE_MIN_SPACING_MINUTES)
+        )
+        slots = allocator.allocate(len(images), optimal_hours, max_days=days)
+        
+        topics = ["crescimento", "conteudo", "engajamento"]
+        styles = ["motivational", "educational", "engagement", "questions"]
+        items = []
+        
+        for image, post_time in zip(images, slots):
+            # Gera legenda variada
+            caption = self.generate_caption(
+                topic=random.choice(topics),
+                style=random.choice(styles)
+            )
+            
+            items.append({
+                "media_path": image,
+                "caption": caption,
+                "hashtags": config.TARGET_HASHTAGS[:8],
+                "post_datetime": post_time,
+                "content_type": "feed"
+            })
+        
+        # Uma gravação da agenda para o calendário inteiro
+        scheduled = len(self.schedule_many(items, quiet=True))
+        if slots:
+            print_success(
+                f"{scheduled} posts agendados! "
+                f"({slots[0].strftime('%d/%m')} a {slots[-1].strftime('%d/%m')})"
+            )
+        else:
+            print_error("Nenhum horário livre para agendar")
         return scheduled
     
+    def get_publish_stats(self) -> Dict:
+        """Atraso das publicações em relação ao horário agendado (segundos)"""
+        with self._lock:
+            delays = sorted(self.publish_delays)
+        if not delays:
+            return {"publicados": 0}
+        
+        def pct(p: float) -> float:
+            return round(delays[min(len(delays) - 1, int(round(p * (len(delays) - 1))))], 1)
+        
+        return {
+            "publicados": len(delays),
+            "atraso_medio_s": round(sum(delays) / len(delays), 1),
+            "atraso_p50_s": pct(0.5),
+            "atraso_p95_s": pct(0.95),
+            "atraso_max_s": round(delays[-1], 1)
+        }
+    
     # ============================================
     # DAEMON
     # ============================================
     
-    def run_scheduler_daemon(self, check_interval: int = 300):
+    def run_scheduler_daemon(self, check_interval: Optional[float] = None):
         """
-        Loop contínuo de verificação
+        Loop contínuo de publicação
         Rode em thread separada
+        
+        Dorme até o horário do próximo post e acorda antes quando a fila
+        muda (agendamento, cancelamento, publicação pelo menu).
+        check_interval limita cada espera (ex.: após mudança do relógio).
         """
-        print_info(f"Iniciando daemon de publicação (verificação a cada {check_interval}s)")
+        self._stop_event.clear()
+        print_info("Iniciando daemon de publicação")
         
         while not self._stop_event.is_set():
             try:
+                self._wakeup.clear()
                 posted = self.check_and_post()
                 if posted:
                     logger.info("✅ Post publicado pelo daemon")
+                    continue
                 
-                # Aguarda próxima verificação
-                self._stop_event.wait(check_interval)
+                delay = self.seconds_until_next_due()
+                if delay == 0:
+                    if not self._publish_lock.locked():
+                        continue
+                    # Outra thread está publicando: ela acorda o daemon ao terminar
+                    delay = None
+                if check_interval:
+                    delay = check_interval if delay is None else min(delay, check_interval)
+                self._wakeup.wait(delay)
                 
             except Exception as e:
                 logger.error(f"Erro no daemon: {e}")
@@ -437,6 +698,7 @@ class ContentScheduler:
     def stop_daemon(self):
         """Para o daemon"""
         self._stop_event.set()
+        self._wakeup.set()
     
     def is_daemon_running(self) -> bool:
         """Verifica se daemon está rodando"""
@@ -0,0 +1,146 @@
+"""
+Coletor Incremental de Listas em Diálogos
+MutationObserver injetado no diálogo acumula os usernames na própria página;
+cada rolagem busca só os novos em uma única chamada execute_script
+"""
+import itertools
+from typing import Callable, Dict, List, Optional
+
+from utils import HumanBehavior, logger
+
+# Instala o observer no diálogo: os textos dos itens vão para uma fila na página
+_INSTALL_JS = """
+const root = arguments[0], selector = arguments[1], key = arguments[2];
+const state = {seen: new Set(), queue: [], observer: null};
+
+const take = (el) => {
+    const text = (el.textContent || '').trim();
+    if (text && !state.seen.has(text)) {
+        state.seen.add(text);
+        state.queue.push(text);
+    }
+};
+const scan = (node) => {
+    if (node.nodeType === Node.TEXT_NODE) node = node.parentElement;
+    if (!node || node.nodeType !== Node.ELEMENT_NODE) return;
+    const item = node.closest(selector);
+    if (item) { take(item); return; }
+    node.querySelectorAll(selector).forEach(take);
+};
+
+scan(root);
+state.observer = new MutationObserver((mutations) => {
+    for (const m of mutations) {
+        if (m.type === 'characterData') scan(m.target);
+        else m.addedNodes.forEach(scan);
+    }
+});
+state.observer.observe(root, {childList: true, subtree: true, characterData: true});
+window[key] = state;
+return state.queue.length;
+"""
+
+# Esvazia a fila e rola o diálogo na mesma ida ao navegador
+_DRAIN_JS = """
+const root = arguments[0], key = arguments[1], step = arguments[2];
+const state = window[key];
+if (!state) return null;
+const items = state.queue.splice(0, state.queue.length);
+if (step === null) root.scrollTop = root.scrollHeight;
+else if (step > 0) root.scrollTop += step;
+return items;
+"""
+
+_STOP_JS = """
+const state = window[arguments[0]];
+if (state) { state.observer.disconnect(); delete window[arguments[0]]; }
+"""
+
+class DialogCollector:
+    """
+    Coleta textos de itens (usernames) de um diálogo com rolagem infinita
+
+    O MutationObserver deduplica na página; em Python os itens ficam em um
+    dict (conjunto com ordem de inserção), então cada username custa O(1)
+    e nenhuma rolagem relê elementos já vistos.
+    """
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, driver, dialog, item_selector: str):
+        self.driver = driver
+        self.dialog = dialog
+        self.item_selector = item_selector
+        self.key = f"__igsCollector{next(self._ids)}"
+        self.items: Dict[str, None] = {}
+        self.round_trips = 0
+        self._active = False
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+    
+    def start(self):
+        """Injeta o observer (os itens já visíveis entram na fila)"""
+        self.driver.execute_script(_INSTALL_JS, self.dialog, self.item_selector, self.key)
+        self.round_trips += 1
+        self._active = True
+    
+    def stop(self):
+        """Desconecta o observer e remove o estado da página"""
+        if not self._active:
+            return
+        self._active = False
+        try:
+            self.driver.execute_script(_STOP_JS, self.key)
+        except Exception:
+            pass
+    
+    def drain(self, scroll_step: Optional[int] = 0) -> List[str]:
+        """
+        Busca os itens novos e rola o diálogo na mesma chamada
+        scroll_step: None rola até o fim, N rola N pixels, 0 não rola
+        """
+        new_items = self.driver.execute_script(_DRAIN_JS, self.dialog, self.key, scroll_step)
+        self.round_trips += 1
+        
+        if new_items is None:
+            # Página recarregada ou observer perdido: reinstala
+            logger.debug("Observer do diálogo perdido, reinstalando")
+            self.start()
+            return []
+        
+        added = []
+        for item in new_items:
+            if item not in self.items:
+                self.items[item] = None
+                added.append(item)
+        return added
+    
+    def collect(self, max_items: int, scroll_step: Optional[int] = None,
+                max_idle: int = 5,
+                pause: Optional[Callable[[], None]] = HumanBehavior.scroll_pause) -> List[str]:
+        """
+        Rola até juntar max_items ou passar max_idle rolagens seguidas sem itens novos
+        """
+        if not self._active:
+            self.start()
+        
+        idle = 0
+        while len(self.items) < max_items and idle < max_idle:
+            if self.drain(scroll_step):
+                idle = 0
+            else:
+                idle += 1
+            if pause:
+                pause()
+        
+        # Itens que chegaram durante a última pausa
+        if len(self.items) < max_items:
+            self.drain(0)
+        
+        return list(itertools.islice(self.items, max_items))
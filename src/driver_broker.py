@@ -0,0 +1,224 @@
+"""
+Broker do Navegador
+Um único dono do WebDriver por vez: o daemon de publicação e o menu pedem
+o navegador por prioridade, e a publicação agendada toma a vez de uma
+sessão em andamento nos pontos seguros entre ações
+
+É uma trava de posse com prioridade, não um executor: cada thread continua
+rodando o próprio trabalho e só espera a vez de usar o navegador. Assim as
+estratégias existentes não precisam virar tarefas enfileiradas; em troca, a
+preempção só acontece onde o código chama checkpoint()/sleep().
+"""
+import functools
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from utils import logger
+
+# Menor número = maior prioridade
+PRIORITY_PUBLISH = 0
+PRIORITY_INTERACTIVE = 10
+
+PRIORITY_NAMES = {
+    PRIORITY_PUBLISH: "publicacao",
+    PRIORITY_INTERACTIVE: "interativo"
+}
+
+class _Lease:
+    """Pedido (ou posse) do navegador por uma thread"""
+    
+    __slots__ = ("name", "priority", "thread", "depth")
+    
+    def __init__(self, name: str, priority: int):
+        self.name = name
+        self.priority = priority
+        self.thread = threading.current_thread()
+        self.depth = 1
+
+class _WaitStats:
+    """Espera pela vez numa prioridade: contagem, soma e máximo"""
+    
+    __slots__ = ("count", "total", "max")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+class DriverBroker:
+    """
+    Controla quem usa o navegador
+
+    lease() espera a vez pela prioridade (empate: ordem de chegada)
+    e são reentrantes na mesma thread. Quem tem a posse chama checkpoint()
+    entre ações: se houver pedido mais prioritário na fila, a posse passa
+    para ele e volta quando ele terminar. sleep() devolve o navegador
+    durante pausas longas.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._owner: Optional[_Lease] = None
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._resume_listeners: List[Callable[[], None]] = []
+        
+        self.preemptions = 0
+        self._waits: Dict[int, _WaitStats] = {}
+    
+    # ============================================
+    # POSSE
+    # ============================================
+    
+    def _wait_turn(self, lease: _Lease, seq: int):
+        """Entra na fila e espera ser o primeiro com o navegador livre (com o lock)"""
+        heapq.heappush(self._queue, (lease.priority, seq, lease))
+        while not (self._owner is None and self._queue[0][2] is lease):
+            self._cond.wait()
+        heapq.heappop(self._queue)
+        self._owner = lease
+    
+    def acquire(self, name: str, priority: int = PRIORITY_INTERACTIVE):
+        start = time.monotonic()
+        with self._cond:
+            owner = self._owner
+            if owner is not None and owner.thread is threading.current_thread():
+                owner.depth += 1
+                return
+            self._wait_turn(_Lease(name, priority), next(self._seq))
+            stats = self._waits.get(priority)
+            if stats is None:
+                stats = self._waits[priority] = _WaitStats()
+            stats.add(time.monotonic() - start)
+    
+    def release(self):
+        with self._cond:
+            owner = self._owner
+            if owner is None or owner.thread is not threading.current_thread():
+                raise RuntimeError("Navegador liberado por quem não tem a posse")
+            owner.depth -= 1
+            if owner.depth == 0:
+                self._owner = None
+                self._cond.notify_all()
+    
+    @contextmanager
+    def lease(self, name: str, priority: int = PRIORITY_INTERACTIVE):
+        """Posse exclusiva do navegador durante o bloco"""
+        self.acquire(name, priority)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def _hand_over(self, until: Optional[float] = None):
+        """
+        Devolve a posse e volta para a fila com a mesma prioridade, à frente
+        dos pedidos de mesma prioridade (com o lock). Com `until`, espera
+        também esse instante antes de pedir a vez de volta.
+        """
+        lease = self._owner
+        self._owner = None
+        self._cond.notify_all()
+        
+        if until is not None:
+            while True:
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        
+        self._wait_turn(lease, -next(self._seq))
+    
+    def checkpoint(self) -> bool:
+        """
+        Ponto seguro entre ações: cede a vez a um pedido mais prioritário
+
+        Retorna True se houve preempção (a página atual pode ter mudado).
+        Sem posse ou sem pedido mais prioritário não faz nada.
+        """
+        with self._cond:
+            owner = self._owner
+            if owner is None or owner.thread is not threading.current_thread():
+                return False
+            if not self._queue or self._queue[0][0] >= owner.priority:
+                return False
+            
+            logger.info(f"⏸️  '{owner.name}' cede o navegador para '{self._queue[0][2].name}'")
+            self.preemptions += 1
+            self._hand_over()
+        
+        self._notify_resume()
+        return True
+    
+    def sleep(self, seconds: float):
+        """Pausa longa sem segurar o navegador (se tiver a posse)"""
+        with self._cond:
+            owner = self._owner
+            if owner is None or owner.thread is not threading.current_thread():
+                owned = False
+            else:
+                owned = True
+                self._hand_over(until=time.monotonic() + seconds)
+        
+        if owned:
+            self._notify_resume()
+        else:
+            time.sleep(seconds)
+    
+    # ============================================
+    # OUVINTES
+    # ============================================
+    
+    def add_resume_listener(self, listener: Callable[[], None]):
+        """Chamado quando uma posse cedida volta (a página pode ter mudado)"""
+        self._resume_listeners.append(listener)
+    
+    def _notify_resume(self):
+        for listener in self._resume_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.debug(f"Erro em listener do broker: {e}")
+    
+    # ============================================
+    # ESTATÍSTICAS
+    # ============================================
+    
+    def get_stats(self) -> Dict:
+        with self._cond:
+            waits = {
+                PRIORITY_NAMES.get(priority, str(priority)): {
+                    "pedidos": stats.count,
+                    "espera_media_s": round(stats.total / stats.count, 3) if stats.count else 0,
+                    "espera_max_s": round(stats.max, 3)
+                }
+                for priority, stats in self._waits.items()
+            }
+            return {
+                "dono": self._owner.name if self._owner else None,
+                "na_fila": [lease.name for _, _, lease in sorted(self._queue)],
+                "preempcoes": self.preemptions,
+                "esperas": waits
+            }
+
+# Instância global
+broker = DriverBroker()
+
+def driver_task(name: str, priority: int = PRIORITY_INTERACTIVE):
+    """Decorator: a função roda com a posse do navegador"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with broker.lease(name, priority):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+"""
+Índice Temporal de Follows Ativos
+Lista ordenada de (followed_ts, username) consultada por bisect
+"""
+import bisect
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Maior que qualquer username: bisect_right inclui todos os follows em cutoff_ts
+_MAX_NAME = "\uffff"
+
+class FollowIndex:
+    """Follows ativos ordenados pela data do follow (mais antigo primeiro)"""
+    
+    def __init__(self, profiles: Iterable = ()):
+        entries = [
+            (p.followed_ts, p.username) for p in profiles
+            if p.followed_ts and not p.unfollowed_ts
+        ]
+        entries.sort()
+        self._entries: List[Tuple[int, str]] = entries
+        self._ts: Dict[str, int] = {username: ts for ts, username in entries}
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, username: str) -> bool:
+        return username in self._ts
+    
+    def add(self, profile):
+        """Indexa o perfil se for um follow ativo com data conhecida"""
+        if not profile.followed_ts or profile.unfollowed_ts:
+            return
+        if profile.username in self._ts:
+            self.remove(profile)
+        bisect.insort(self._entries, (profile.followed_ts, profile.username))
+        self._ts[profile.username] = profile.followed_ts
+    
+    def remove(self, profile):
+        """Remove o perfil do índice (se indexado)"""
+        ts = self._ts.pop(profile.username, None)
+        if ts is None:
+            return
+        entry = (ts, profile.username)
+        i = bisect.bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+    
+    def followed_before(self, cutoff_ts: float) -> Iterator[Tuple[int, str]]:
+        """(followed_ts, username) com follow até cutoff_ts, do mais antigo ao mais novo"""
+        end = bisect.bisect_right(self._entries, (cutoff_ts, _MAX_NAME))
+        # Cópia: o chamador pode dar unfollow (e alterar o índice) durante a iteração
+        return iter(self._entries[:end])
@@ -0,0 +1,146 @@
+"""
+Visão Colunar do Histórico de Seguidores
+Arrays paralelos (NumPy) para estatísticas vetorizadas
+NumPy é opcional: sem ele o FollowersManager usa os laços em Python
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Códigos de follows_back e sua posição no byte de flags do UserProfile
+FB_UNKNOWN = 0
+FB_NO = 1
+FB_YES = 2
+FB_SHIFT = 2
+FB_MASK = 0b1100
+
+# Faixas padrão do histograma de idade (dias desde o follow)
+DEFAULT_AGE_BINS = (0, 1, 2, 3, 7, 14, 30, 90, 180, 365)
+
+class FollowerColumns:
+    """
+    Histórico em colunas: followed_ts, unfollowed_ts, follows_back e source
+
+    Cada username ocupa uma linha fixa; update() sobrescreve apenas essa
+    linha, então a visão acompanha as mudanças sem ser reconstruída.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy não está instalado")
+        
+        self._index: Dict[str, int] = {}
+        self._size = 0
+        self._allocate(max(capacity, 16))
+    
+    def _allocate(self, capacity: int):
+        """Cria ou amplia os arrays preservando as linhas existentes"""
+        size = self._size
+        old = getattr(self, "followed_ts", None)
+        
+        new_followed = np.zeros(capacity, dtype=np.int64)
+        new_unfollowed = np.zeros(capacity, dtype=np.int64)
+        new_fb = np.zeros(capacity, dtype=np.uint8)
+        new_source = np.zeros(capacity, dtype=np.int32)
+        
+        if old is not None:
+            new_followed[:size] = self.followed_ts[:size]
+            new_unfollowed[:size] = self.unfollowed_ts[:size]
+            new_fb[:size] = self.follows_back[:size]
+            new_source[:size] = self.source[:size]
+        
+        self.followed_ts = new_followed
+        self.unfollowed_ts = new_unfollowed
+        self.follows_back = new_fb
+        self.source = new_source
+    
+    def __len__(self):
+        return self._size
+    
+    # ============================================
+    # ATUALIZAÇÃO
+    # ============================================
+    
+    def _row_for(self, username: str) -> int:
+        row = self._index.get(username)
+        if row is None:
+            if self._size == len(self.followed_ts):
+                self._allocate(len(self.followed_ts) * 2)
+            row = self._size
+            self._index[username] = row
+            self._size += 1
+        return row
+    
+    def update(self, profile):
+        """Insere ou sobrescreve a linha de um UserProfile"""
+        row = self._row_for(profile.username)
+        self.followed_ts[row] = profile.followed_ts
+        self.unfollowed_ts[row] = profile.unfollowed_ts
+        self.follows_back[row] = (profile.flags & FB_MASK) >> FB_SHIFT
+        self.source[row] = profile.source_id
+    
+    def load(self, profiles: Iterable):
+        """Carga inicial em lote"""
+        profiles = list(profiles)
+        if len(profiles) > len(self.followed_ts) - self._size:
+            self._allocate(self._size + len(profiles) + 1024)
+        for profile in profiles:
+            self.update(profile)
+    
+    # ============================================
+    # CONSULTAS VETORIZADAS
+    # ============================================
+    
+    def _view(self):
+        n = self._size
+        return (self.followed_ts[:n], self.unfollowed_ts[:n],
+                self.follows_back[:n], self.source[:n])
+    
+    def follow_back_by_source(self, source_names: Sequence[str]) -> Dict[str, Dict]:
+        """Taxa de follow-back por origem (apenas registros verificados)"""
+        _, _, fb, source = self._view()
+        minlength = len(source_names)
+        checked = np.bincount(source[fb != FB_UNKNOWN], minlength=minlength)
+        backs = np.bincount(source[fb == FB_YES], minlength=minlength)
+        
+        result = {}
+        for i in np.nonzero(checked)[0]:
+            result[source_names[i]] = {
+                "verificados": int(checked[i]),
+                "follow_backs": int(backs[i]),
+                "taxa": round(float(backs[i]) / float(checked[i]) * 100, 1)
+            }
+        return result
+    
+    def age_histogram(self, now_ts: int, bins_days: Sequence[int] = DEFAULT_AGE_BINS,
+                      active_only: bool = True) -> Dict[str, int]:
+        """Quantidade de follows por idade (dias desde o follow)"""
+        followed, unfollowed, _, _ = self._view()
+        mask = followed > 0
+        if active_only:
+            mask &= unfollowed == 0
+        
+        ages = (now_ts - followed[mask]) // 86400
+        edges = np.asarray(list(bins_days) + [np.iinfo(np.int64).max], dtype=np.int64)
+        counts, _ = np.histogram(ages, bins=edges)
+        return {label: int(c) for label, c in zip(age_bin_labels(bins_days), counts)}
+
+def age_bin_labels(bins_days: Sequence[int]) -> List[str]:
+    """Rótulos das faixas do histograma ("0-1d", ..., "365d+")"""
+    labels = [f"{lo}-{hi}d" for lo, hi in zip(bins_days, bins_days[1:])]
+    labels.append(f"{bins_days[-1]}d+")
+    return labels
+
+def create_columns(profiles: Optional[Iterable] = None) -> Optional[FollowerColumns]:
+    """Cria a visão colunar se NumPy estiver disponível"""
+    if not NUMPY_AVAILABLE:
+        return None
+    profiles = list(profiles or [])
+    columns = FollowerColumns(capacity=len(profiles) + 1024)
+    columns.load(profiles)
+    return columns
@@ -5,103 +5,463 @@ Gerenciamento Avançado de Seguidores
 - Whitelist de proteção
 - Análise de follow-back
 """
-import json
+import bisect
+import heapq
 import os
+import sys
+import threading
 import time
-import random
-from datetime import datetime, timedelta
-from typing import List, Set, Dict, Optional
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Iterator, List, Set, Dict, Optional
 from collections import defaultdict
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 
-from utils import HumanBehavior, RateLimiter, logger, safe_execute
+from utils import HumanBehavior, logger, safe_execute, deadline, ActionBlockedError
 from config import config
+from followers_store import create_followers_store
+from persistence import DebouncedPersistence
+from followers_columns import (
+    DEFAULT_AGE_BINS, FB_MASK, FB_NO, FB_SHIFT, FB_UNKNOWN, FB_YES,
+    age_bin_labels, create_columns
+)
+from follow_index import FollowIndex
+from profile_cache import ProfileCache
+from dialog_collector import DialogCollector
+from selector_registry import registry, check_action_block
+from navigator import Navigator, FOLLOW_STATE_FOLLOW, FOLLOW_STATE_FOLLOWING, FOLLOW_STATE_REQUESTED
+from command_stats import ops
+from driver_broker import broker, driver_task
+
+class SourceRegistry:
+    """Tabela de origens internadas (string <-> id pequeno)"""
+    
+    _names: List[str] = [""]
+    _ids: Dict[str, int] = {"": 0}
+    # Menu e daemon internam origens novas ao mesmo tempo
+    _lock = threading.Lock()
+    
+    @classmethod
+    def id_for(cls, name: Optional[str]) -> int:
+        name = name or ""
+        source_id = cls._ids.get(name)
+        if source_id is None:
+            with cls._lock:
+                source_id = cls._ids.get(name)
+                if source_id is None:
+                    source_id = len(cls._names)
+                    cls._names.append(sys.intern(name))
+                    cls._ids[cls._names[source_id]] = source_id
+        return source_id
+    
+    @classmethod
+    def name_of(cls, source_id: int) -> str:
+        return cls._names[source_id]
+    
+    @classmethod
+    def names(cls) -> List[str]:
+        return list(cls._names)
+
+_fromisoformat = datetime.fromisoformat
+
+def _to_ts(value) -> int:
+    """ISO string / datetime / epoch -> epoch int (0 = ausente)"""
+    if not value:
+        return 0
+    if value.__class__ is str:
+        return int(_fromisoformat(value).timestamp())
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+def _to_iso(ts: int) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+# follows_back tri-state nos bits 2-3 de flags
+_PRIVATE = 0b0001
+_VERIFIED = 0b0010
+_FB_SHIFT = FB_SHIFT
+_FB_MASK = FB_MASK
+_FB_ENCODE = {None: FB_UNKNOWN, False: FB_NO, True: FB_YES}
+_FB_DECODE = (None, False, True)
 
-@dataclass
 class UserProfile:
-    """Perfil de usuário seguido"""
-    username: str
-    user_id: str = ""
-    followers_count: int = 0
-    following_count: int = 0
-    is_private: bool = False
-    is_verified: bool = False
-    followed_at: Optional[str] = None
-    unfollowed_at: Optional[str] = None
-    follows_back: Optional[bool] = None
-    source: str = ""  # De onde veio (influencer, hashtag, etc)
+    """
+    Perfil de usuário seguido (representação compacta)
+    
+    Datas em epoch int, origem como id internado e is_private/is_verified/
+    follows_back empacotados em um byte. As propriedades followed_at,
+    unfollowed_at, source etc. mantêm a interface antiga (strings ISO).
+    """
+    
+    __slots__ = (
+        "username", "user_id", "followers_count", "following_count",
+        "followed_ts", "unfollowed_ts", "source_id", "flags"
+    )
+    
+    def __init__(self, username: str, user_id: str = "",
+                 followers_count: int = 0, following_count: int = 0,
+                 is_private: bool = False, is_verified: bool = False,
+                 followed_at=None, unfollowed_at=None,
+                 follows_back: Optional[bool] = None,
+                 source: str = ""):  # source: de onde veio (influencer, hashtag, etc)
+        self.username = username
+        self.user_id = user_id or ""
+        self.followers_count = followers_count or 0
+        self.following_count = following_count or 0
+        self.followed_ts = _to_ts(followed_at)
+        self.unfollowed_ts = _to_ts(unfollowed_at)
+        self.source_id = SourceRegistry.id_for(source)
+        self.flags = (
+            (_PRIVATE if is_private else 0)
+            | (_VERIFIED if is_verified else 0)
+            | (_FB_ENCODE[follows_back] << _FB_SHIFT)
+        )
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserProfile":
+        """Constrói a partir do formato persistido"""
+        return cls(
+            data["username"], data.get("user_id", ""),
+            data.get("followers_count", 0), data.get("following_count", 0),
+            data.get("is_private", False), data.get("is_verified", False),
+            data.get("followed_at"), data.get("unfollowed_at"),
+            data.get("follows_back"), data.get("source", "")
+        )
+    
+    @classmethod
+    def from_row(cls, row: tuple) -> "UserProfile":
+        """
+        Caminho rápido de carga: tupla na ordem de SQLiteFollowersStore.USER_COLUMNS
+        (username, user_id, followers_count, following_count, is_private,
+        is_verified, followed_at, unfollowed_at, follows_back, source)
+        """
+        (username, user_id, followers_count, following_count, is_private,
+         is_verified, followed_at, unfollowed_at, follows_back, source) = row
+        
+        profile = object.__new__(cls)
+        profile.username = username
+        profile.user_id = user_id or ""
+        profile.followers_count = followers_count or 0
+        profile.following_count = following_count or 0
+        profile.followed_ts = _to_ts(followed_at)
+        profile.unfollowed_ts = _to_ts(unfollowed_at)
+        profile.source_id = SourceRegistry.id_for(source)
+        profile.flags = (
+            (_PRIVATE if is_private else 0)
+            | (_VERIFIED if is_verified else 0)
+            | (_FB_ENCODE[None if follows_back is None else bool(follows_back)] << _FB_SHIFT)
+        )
+        return profile
     
     def to_dict(self):
-        return asdict(self)
+        return {
+            "username": self.username,
+            "user_id": self.user_id,
+            "followers_count": self.followers_count,
+            "following_count": self.following_count,
+            "is_private": self.is_private,
+            "is_verified": self.is_verified,
+            "followed_at": self.followed_at,
+            "unfollowed_at": self.unfollowed_at,
+            "follows_back": self.follows_back,
+            "source": self.source
+        }
+    
+    # Interface compatível com o dataclass anterior
+    
+    @property
+    def followed_at(self) -> Optional[str]:
+        return _to_iso(self.followed_ts)
+    
+    @followed_at.setter
+    def followed_at(self, value):
+        self.followed_ts = _to_ts(value)
+    
+    @property
+    def unfollowed_at(self) -> Optional[str]:
+        return _to_iso(self.unfollowed_ts)
+    
+    @unfollowed_at.setter
+    def unfollowed_at(self, value):
+        self.unfollowed_ts = _to_ts(value)
+    
+    @property
+    def source(self) -> str:
+        return SourceRegistry.name_of(self.source_id)
+    
+    @source.setter
+    def source(self, value: str):
+        self.source_id = SourceRegistry.id_for(value)
+    
+    @property
+    def is_private(self) -> bool:
+        return bool(self.flags & _PRIVATE)
+    
+    @is_private.setter
+    def is_private(self, value: bool):
+        self.flags = (self.flags | _PRIVATE) if value else (self.flags & ~_PRIVATE)
+    
+    @property
+    def is_verified(self) -> bool:
+        return bool(self.flags & _VERIFIED)
+    
+    @is_verified.setter
+    def is_verified(self, value: bool):
+        self.flags = (self.flags | _VERIFIED) if value else (self.flags & ~_VERIFIED)
+    
+    @property
+    def follows_back(self) -> Optional[bool]:
+        return _FB_DECODE[(self.flags & _FB_MASK) >> _FB_SHIFT]
+    
+    @follows_back.setter
+    def follows_back(self, value: Optional[bool]):
+        self.flags = (self.flags & ~_FB_MASK) | (_FB_ENCODE[value] << _FB_SHIFT)
     
     @property
     def days_since_followed(self) -> int:
         """Dias desde que seguiu"""
-        if not self.followed_at:
+        if not self.followed_ts:
             return 0
-        followed_date = datetime.fromisoformat(self.followed_at)
-        return (datetime.now() - followed_date).days
+        return int((time.time() - self.followed_ts) // 86400)
+    
+    def __repr__(self):
+        return f"UserProfile({self.to_dict()!r})"
+
+class FollowerAggregates:
+    """
+    Contadores do histórico mantidos a cada mudança
+    
+    Cada perfil contribui com (ativo, follows_back, origem); antes de mudar um
+    perfil chama-se remove() e depois add(), então get_stats é O(1).
+    """
+    
+    FIELDS = ("total", "active", "unfollowed", "checked", "follow_backs")
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.total = 0
+        self.active = 0
+        self.unfollowed = 0
+        self.checked = 0
+        self.follow_backs = 0
+        self.sources: Dict[int, int] = defaultdict(int)
+    
+    def _apply(self, profile: UserProfile, sign: int):
+        self.total += sign
+        if profile.unfollowed_ts:
+            self.unfollowed += sign
+        else:
+            self.active += sign
+        follows_back = profile.follows_back
+        if follows_back is not None:
+            self.checked += sign
+            if follows_back:
+                self.follow_backs += sign
+        self.sources[profile.source_id] += sign
+        if not self.sources[profile.source_id]:
+            del self.sources[profile.source_id]
+    
+    def add(self, profile: UserProfile):
+        self._apply(profile, 1)
+    
+    def remove(self, profile: UserProfile):
+        self._apply(profile, -1)
+    
+    @classmethod
+    def from_profiles(cls, profiles) -> "FollowerAggregates":
+        aggregates = cls()
+        for profile in profiles:
+            aggregates.add(profile)
+        return aggregates
 
 class FollowersManager:
     """Gerenciador completo de seguidores"""
     
-    def __init__(self, driver, wait, rate_limiter):
+    def __init__(self, driver, wait, rate_limiter, navigator: Optional[Navigator] = None,
+                 network=None):
         self.driver = driver
         self.wait = wait
         self.rate_limiter = rate_limiter
+        self.nav = navigator or Navigator(driver)
+        self.network = network  # NetworkCapture opcional
         
         # Arquivos de dados
         self.data_file = os.path.join(config.DATA_DIR, "followers_data.json")
         self.whitelist_file = os.path.join(config.DATA_DIR, "whitelist.json")
         self.stats_file = os.path.join(config.DATA_DIR, "follower_stats.json")
         
+        # Backend de persistência (migra os JSON acima na primeira execução)
+        self.store = create_followers_store(legacy_files={
+            "users": self.data_file,
+            "whitelist": self.whitelist_file,
+            "stats": self.stats_file
+        })
+        
         # Dados em memória
         self.followed_users: Dict[str, UserProfile] = {}
         self.whitelist: Set[str] = set()
         self.daily_stats = defaultdict(int)
         
+        # Protege histórico, contadores e pendências: a gravação agrupada roda
+        # na thread do timer e o daemon de publicação divide o processo
+        self._lock = threading.RLock()
+        
+        # Mudanças ainda não gravadas
+        self._dirty_users: Set[str] = set()
+        self._dirty_stats: Set[str] = set()
+        self._persistence = DebouncedPersistence("followers", self._flush_pending)
+        
+        # Visão colunar opcional (NumPy) para estatísticas
+        self.columns = None
+        self.aggregates = FollowerAggregates()
+        self.follow_index = FollowIndex()
+        
+        # Metadados de perfis já inspecionados (alimentado a cada perfil lido)
+        self.profile_cache = ProfileCache()
+        self.nav.add_profile_listener(self.profile_cache.put_snapshot)
+        
         self.load_data()
     
     def load_data(self):
         """Carrega dados persistidos"""
         # Carrega usuários seguidos
         try:
-            data = load_json(self.data_file, {})
             self.followed_users = {
-                k: UserProfile(**v) for k, v in data.items()
+                row[0]: UserProfile.from_row(row) for row in self.store.iter_user_rows()
             }
             logger.info(f"📂 Carregados {len(self.followed_users)} usuários do histórico")
         except Exception as e:
-            logger.error(f"Erro ao carregar followers_data: {e}")
+            logger.error(f"Erro ao carregar histórico de seguidores: {e}")
             self.followed_users = {}
         
+        self.aggregates = FollowerAggregates.from_profiles(self.followed_users.values())
+        self.follow_index = FollowIndex(self.followed_users.values())
+        if config.COLUMNAR_STATS:
+            self.columns = create_columns(self.followed_users.values())
+        
         # Carrega whitelist
         try:
-            self.whitelist = set(load_json(self.whitelist_file, []))
+            self.whitelist = self.store.load_whitelist()
             logger.info(f"🛡️  Whitelist: {len(self.whitelist)} usuários protegidos")
         except Exception as e:
             logger.error(f"Erro ao carregar whitelist: {e}")
             self.whitelist = set()
         
         # Carrega estatísticas
-        self.daily_stats = defaultdict(int, load_json(self.stats_file, {}))
+        self.daily_stats = defaultdict(int, self.store.load_daily_stats())
     
     def save_data(self):
-        """Persiste todos os dados"""
+        """Persiste todos os dados imediatamente (regravação completa)"""
         try:
-            save_json(
-                {k: v.to_dict() for k, v in self.followed_users.items()},
-                self.data_file
-            )
-            save_json(list(self.whitelist), self.whitelist_file)
-            save_json(dict(self.daily_stats), self.stats_file)
+            with self._lock:
+                self.store.save_all(
+                    [v.to_dict() for v in self.followed_users.values()],
+                    self.whitelist,
+                    self.daily_stats
+                )
+                self._dirty_users.clear()
+                self._dirty_stats.clear()
+            self._persistence.mark_clean()
         except Exception as e:
             logger.error(f"Erro ao salvar dados: {e}")
     
+    def _flush_pending(self):
+        """Grava apenas os registros e contadores alterados"""
+        # Lock durante a gravação: uma mudança feita no meio não pode ser
+        # desmarcada sem ter sido gravada
+        with self._lock:
+            self.store.upsert_users([
+                self.followed_users[u].to_dict() for u in self._dirty_users if u in self.followed_users
+            ])
+            for key in self._dirty_stats:
+                self.store.set_daily_stat(key, self.daily_stats[key])
+            
+            self._dirty_users.clear()
+            self._dirty_stats.clear()
+    
+    def _increment_daily_stat(self, key: str):
+        """Incrementa um contador diário e marca para gravação"""
+        with self._lock:
+            self.daily_stats[key] += 1
+            self._dirty_stats.add(key)
+        self._persistence.mark_dirty()
+    
+    def _apply_changes(self, username: str, changes: dict) -> bool:
+        """Altera campos de um registro mantendo contadores, índice e visão colunar"""
+        with self._lock:
+            profile = self.followed_users.get(username)
+            if profile is None:
+                return False
+            
+            self.aggregates.remove(profile)
+            self.follow_index.remove(profile)
+            for attr, value in changes.items():
+                setattr(profile, attr, value)
+            self.aggregates.add(profile)
+            self.follow_index.add(profile)
+            
+            if self.columns is not None:
+                self.columns.update(profile)
+            self._dirty_users.add(username)
+            return True
+    
+    def _update_user(self, username: str, **changes) -> bool:
+        """Altera um registro e marca para gravação"""
+        if not self._apply_changes(username, changes):
+            return False
+        self._persistence.mark_dirty()
+        return True
+    
+    def _update_users(self, updates: Dict[str, dict]) -> int:
+        """Altera vários registros com uma única marcação de gravação"""
+        with self._lock:
+            changed = sum(1 for username, changes in updates.items() if self._apply_changes(username, changes))
+        if changed:
+            self._persistence.mark_dirty()
+        return changed
+    
+    def record_follow(self, username: str, source: str = "", is_private: bool = False,
+                      followers_count: int = 0, following_count: int = 0,
+                      is_verified: bool = False):
+        """Registra um follow realizado"""
+        with self._lock:
+            previous = self.followed_users.get(username)
+            if previous is not None:
+                self.aggregates.remove(previous)
+                self.follow_index.remove(previous)
+            
+            self.followed_users[username] = UserProfile(
+                username=username,
+                followed_at=int(time.time()),
+                followers_count=followers_count,
+                following_count=following_count,
+                is_private=is_private,
+                is_verified=is_verified,
+                source=source
+            )
+            self.aggregates.add(self.followed_users[username])
+            self.follow_index.add(self.followed_users[username])
+            if self.columns is not None:
+                self.columns.update(self.followed_users[username])
+            self._dirty_users.add(username)
+            self.daily_stats['follows_today'] += 1
+            self._dirty_stats.add('follows_today')
+        
+        # Fora do lock: a gravação pode rodar aqui e pega o lock na ordem
+        # persistência -> manager, como na thread do timer
+        self._persistence.mark_dirty()
+    
+    def close(self):
+        """Grava pendências e fecha o armazenamento"""
+        self._persistence.flush()
+        self.store.close()
+        self.profile_cache.close()
+    
     # ============================================
     # WHITELIST
     # ============================================
@@ -109,15 +469,17 @@ class FollowersManager:
     def add_to_whitelist(self, username: str):
         """Adiciona usuário à whitelist"""
         username = username.lower().strip()
-        self.whitelist.add(username)
-        self.save_data()
+        with self._lock:
+            self.whitelist.add(username)
+        self.store.add_to_whitelist(username)
         logger.info(f"🛡️  @{username} adicionado à whitelist")
     
     def remove_from_whitelist(self, username: str):
         """Remove usuário da whitelist"""
         username = username.lower().strip()
-        self.whitelist.discard(username)
-        self.save_data()
+        with self._lock:
+            self.whitelist.discard(username)
+        self.store.remove_from_whitelist(username)
         logger.info(f"🗑️  @{username} removido da whitelist")
     
     def is_whitelisted(self, username: str) -> bool:
@@ -128,64 +490,71 @@ class FollowersManager:
     # COLETA DE DADOS
     # ============================================
     
+    def _collect_from_network(self, kind: str, dialog, max_items: int,
+                              scroll_step: Optional[int], max_idle: int) -> List[str]:
+        """Rola o diálogo e lê os usernames das respostas JSON que a página baixou"""
+        scroll_js = (
+            "arguments[0].scrollTop = arguments[0].scrollHeight" if scroll_step is None
+            else f"arguments[0].scrollTop += {int(scroll_step)}"
+        )
+        
+        count = len(self.network.users(kind))
+        idle = 0
+        while count < max_items and idle < max_idle:
+            self.driver.execute_script(scroll_js, dialog)
+            HumanBehavior.scroll_pause()
+            
+            new_count = len(self.network.users(kind))
+            idle = 0 if new_count > count else idle + 1
+            count = new_count
+        
+        return self.network.users(kind)[:max_items]
+    
+    def _collect_list(self, kind: str, dialog, max_items: int,
+                      scroll_step: Optional[int], max_idle: int) -> List[str]:
+        """Coleta a lista do diálogo: respostas capturadas ou, sem elas, o DOM"""
+        if self.network is not None:
+            users = self._collect_from_network(kind, dialog, max_items, scroll_step, max_idle)
+            if users:
+                return users
+            logger.debug("Nenhuma resposta capturada, lendo a lista pelo DOM")
+        
+        # Usernames acumulados na página; cada rolagem busca só os novos
+        with DialogCollector(self.driver, dialog, config.SELECTORS['dialog_username']) as collector:
+            return collector.collect(max_items, scroll_step=scroll_step, max_idle=max_idle)
+    
+    @ops("get_followers_list")
     def get_followers_list(self, username: str, max_followers: int = 100) -> List[str]:
         """Coleta lista de seguidores de um perfil"""
         logger.info(f"🔍 Coletando seguidores de @{username}...")
         
         try:
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            HumanBehavior.long_delay()
+            self.nav.open_profile(username)
+            
+            if self.network is not None:
+                self.network.reset()
             
             # Clica em "Seguidores"
             followers_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['followers_link']))
+                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['followers_link'])),
+                key='followers_link'
             )
             followers_btn.click()
             HumanBehavior.random_delay(3, 5)
             
             # Container da lista
             dialog = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container']))
+                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container'])),
+                key='dialog_container'
             )
             
-            followers = []
-            last_count = 0
-            scroll_attempts = 0
-            max_scrolls = max_followers // 8 + 3
-            
-            while len(followers) < max_followers and scroll_attempts < max_scrolls:
-                # Encontra usuários visíveis
-                user_elements = dialog.find_elements(
-                    By.CSS_SELECTOR, "span._aacl._aacs._aact"
-                )
-                
-                for elem in user_elements:
-                    username_text = elem.text.strip()
-                    if username_text and username_text not in followers:
-                        followers.append(username_text)
-                        if len(followers) >= max_followers:
-                            break
-                
-                # Scroll
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight", 
-                    dialog
-                )
-                HumanBehavior.scroll_pause()
-                
-                # Verifica se carregou mais
-                if len(followers) == last_count:
-                    scroll_attempts += 1
-                else:
-                    last_count = len(followers)
-                    scroll_attempts = 0
+            # Poucas rolagens sem novidade bastam: a lista acabou ou não carrega mais
+            followers = self._collect_list(
+                "followers", dialog, max_followers, scroll_step=None, max_idle=5
+            )
             
             # Fecha dialog
-            try:
-                close_btn = self.driver.find_element(By.CSS_SELECTOR, "svg[aria-label='Fechar']")
-                close_btn.click()
-            except:
-                pass
+            registry.click(self.driver, 'close_button')
             
             logger.info(f"✅ Coletados {len(followers)} seguidores de @{username}")
             return followers
@@ -194,61 +563,38 @@ class FollowersManager:
             logger.error(f"❌ Erro ao coletar seguidores: {e}")
             return []
     
+    @ops("get_following_list")
     def get_following_list(self, max_following: int = 1000) -> List[str]:
         """Coleta lista de quem você segue"""
         logger.info(f"🔍 Coletando lista de seguindo...")
         
         try:
             # Vai para seu próprio perfil
-            self.driver.get(f"https://www.instagram.com/{config.IG_USERNAME}/")
-            HumanBehavior.long_delay()
+            self.nav.open_profile(config.IG_USERNAME)
+            
+            if self.network is not None:
+                self.network.reset()
             
             # Clica em "Seguindo"
             following_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['following_link']))
+                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['following_link'])),
+                key='following_link'
             )
             following_btn.click()
             HumanBehavior.random_delay(3, 5)
             
             # Container
             dialog = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container']))
+                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container'])),
+                key='dialog_container'
             )
             
-            following = []
-            last_count = 0
-            no_change_count = 0
-            
-            while len(following) < max_following and no_change_count < 5:
-                elements = dialog.find_elements(
-                    By.CSS_SELECTOR, "span._aacl._aacs._aact"
-                )
-                
-                for elem in elements:
-                    username = elem.text.strip()
-                    if username and username not in following:
-                        following.append(username)
-                
-                # Scroll
-                self.driver.execute_script(
-                    "arguments[0].scrollTop += 800", 
-                    dialog
-                )
-                HumanBehavior.scroll_pause()
-                
-                # Verifica se carregou mais
-                if len(following) == last_count:
-                    no_change_count += 1
-                else:
-                    last_count = len(following)
-                    no_change_count = 0
+            following = self._collect_list(
+                "following", dialog, max_following, scroll_step=800, max_idle=5
+            )
             
             # Fecha dialog
-            try:
-                close_btn = self.driver.find_element(By.CSS_SELECTOR, "svg[aria-label='Fechar']")
-                close_btn.click()
-            except:
-                pass
+            registry.click(self.driver, 'close_button')
             
             logger.info(f"✅ Coletados {len(following)} seguindo")
             return following
@@ -257,27 +603,12 @@ class FollowersManager:
             logger.error(f"❌ Erro ao coletar seguindo: {e}")
             return []
     
+    @ops("check_if_follows_back")
     def check_if_follows_back(self, username: str) -> bool:
-        """Verifica se um usuário segue você de volta"""
+        """Verifica se um usuário segue você de volta (reaproveita o perfil aberto)"""
         try:
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            HumanBehavior.random_delay(3, 5)
-            
-            # Procura indicadores de que segue você
-            indicators = [
-                "//button[contains(text(), 'Seguir de volta')]",
-                "//span[contains(text(), 'Segue você')]",
-                "//div[contains(text(), 'Segue você')]"
-            ]
-            
-            for indicator in indicators:
-                try:
-                    self.driver.find_element(By.XPATH, indicator)
-                    return True
-                except:
-                    continue
-            
-            return False
+            snapshot = self.nav.profile(username, delay=lambda: HumanBehavior.random_delay(3, 5))
+            return snapshot.follows_you
             
         except Exception as e:
             logger.error(f"Erro ao verificar @{username}: {e}")
@@ -287,6 +618,7 @@ class FollowersManager:
     # AÇÕES
     # ============================================
     
+    @ops("follow_user")
     @safe_execute(max_retries=2)
     def follow_user(self, username: str, source: str = "") -> bool:
         """Segue um usuário específico"""
@@ -294,40 +626,41 @@ class FollowersManager:
             return False
         
         # Pula se já segue
-        if username in self.followed_users and not self.followed_users[username].unfollowed_at:
+        if username in self.followed_users and not self.followed_users[username].unfollowed_ts:
             logger.info(f"⏭️  Já segue @{username}")
             return False
         
         try:
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            HumanBehavior.long_delay()
+            snapshot = self.nav.profile(username)
+            is_private = snapshot.is_private
+            
+            if snapshot.follow_state in (FOLLOW_STATE_FOLLOWING, FOLLOW_STATE_REQUESTED):
+                logger.info(f"⏭️  Já segue @{username}")
+                return False
             
-            # Verifica se é privado
-            is_private = False
+            # Clica em seguir (a vaga no rate limiter é reservada junto)
+            button = registry.wait_for(self.driver, self.wait, 'follow_button', expected=False)
+            if not self.rate_limiter.try_acquire('follows', config.MAX_FOLLOWS_PER_HOUR):
+                return False
             try:
-                self.driver.find_element(By.XPATH, "//span[contains(text(), 'Esta conta é privada')]")
-                is_private = True
-            except:
-                pass
-            
-            # Clica em seguir
-            follow_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['follow_button']))
+                button.element.click()
+            except Exception:
+                self.rate_limiter.release('follows')
+                raise
+            HumanBehavior.random_delay(1, 2)
+            check_action_block(self.driver, self.rate_limiter, 'follows')
+            self.nav.update_snapshot(
+                follow_state=FOLLOW_STATE_REQUESTED if is_private else FOLLOW_STATE_FOLLOWING
             )
-            follow_btn.click()
             
             # Registra
-            self.followed_users[username] = UserProfile(
-                username=username,
-                followed_at=datetime.now().isoformat(),
-                is_private=is_private,
-                source=source
+            self.record_follow(
+                username, source=source, is_private=is_private,
+                followers_count=snapshot.followers_count or 0,
+                following_count=snapshot.following_count or 0,
+                is_verified=snapshot.is_verified
             )
             
-            self.rate_limiter.record_action('follows')
-            self.daily_stats['follows_today'] += 1
-            self.save_data()
-            
             logger.info(f"✅ Seguiu @{username}")
             HumanBehavior.random_delay(8, 15)
             return True
@@ -335,10 +668,13 @@ class FollowersManager:
         except TimeoutException:
             logger.info(f"⏭️  Já segue ou não encontrado: @{username}")
             return False
+        except ActionBlockedError:
+            raise
         except Exception as e:
             logger.error(f"❌ Erro ao seguir @{username}: {e}")
             return False
     
+    @ops("unfollow_user")
     @safe_execute(max_retries=2)
     def unfollow_user(self, username: str, check_follows_back: bool = True) -> bool:
         """Deixa de seguir um usuário"""
@@ -351,39 +687,40 @@ class FollowersManager:
             return False
         
         try:
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            HumanBehavior.random_delay(3, 5)
+            self.nav.open_profile(username, delay=lambda: HumanBehavior.random_delay(3, 5))
             
             # Verifica se segue de volta
             if check_follows_back:
                 follows_back = self.check_if_follows_back(username)
                 if follows_back:
                     logger.info(f"💚 @{username} segue de volta, mantendo")
-                    if username in self.followed_users:
-                        self.followed_users[username].follows_back = True
-                        self.save_data()
+                    self._update_user(username, follows_back=True)
                     return False
             
             # Clica em "Seguindo"
-            following_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['following_button']))
-            )
-            following_btn.click()
+            registry.wait_for(self.driver, self.wait, 'following_button', expected=False).element.click()
             HumanBehavior.random_delay(1, 2)
             
             # Confirma unfollow
             unfollow_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Deixar de seguir')]"))
+                EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Deixar de seguir')]")),
+                key='unfollow_confirm'
             )
-            unfollow_btn.click()
+            if not self.rate_limiter.try_acquire('unfollows', config.MAX_UNFOLLOWS_PER_HOUR):
+                return False
+            try:
+                unfollow_btn.click()
+            except Exception:
+                self.rate_limiter.release('unfollows')
+                raise
+            HumanBehavior.random_delay(1, 2)
+            check_action_block(self.driver, self.rate_limiter, 'unfollows')
+            self.nav.update_snapshot(follow_state=FOLLOW_STATE_FOLLOW)
             
             # Atualiza registro
-            if username in self.followed_users:
-                self.followed_users[username].unfollowed_at = datetime.now().isoformat()
+            self._update_user(username, unfollowed_ts=int(time.time()))
             
-            self.rate_limiter.record_action('unfollows')
-            self.daily_stats['unfollows_today'] += 1
-            self.save_data()
+            self._increment_daily_stat('unfollows_today')
             
             logger.info(f"✅ Deixou de seguir @{username}")
             HumanBehavior.random_delay(5, 10)
@@ -392,6 +729,8 @@ class FollowersManager:
         except TimeoutException:
             logger.info(f"⏭️  Não está seguindo @{username}")
             return False
+        except ActionBlockedError:
+            raise
         except Exception as e:
             logger.error(f"❌ Erro ao dar unfollow em @{username}: {e}")
             return False
@@ -400,6 +739,17 @@ class FollowersManager:
     # ESTRATÉGIAS
     # ============================================
     
+    @staticmethod
+    def _matches_criteria(profile, min_followers: int, max_followers: int,
+                          skip_private: bool) -> bool:
+        """Aplica os filtros de alvo a um ProfileSnapshot ou CachedProfile"""
+        if skip_private and profile.is_private:
+            return False
+        count = profile.followers_count
+        return count is None or min_followers <= count <= max_followers
+    
+    @driver_task("follow_followers_of_target")
+    @ops("follow_followers_of_target")
     def follow_followers_of_target(self, target_username: str, 
                                     max_follows: int = 20,
                                     min_followers: int = 50,
@@ -408,64 +758,171 @@ class FollowersManager:
         """Segue seguidores de um perfil alvo"""
         logger.info(f"🎯 Seguindo seguidores de @{target_username}")
         
+        # Coletar a lista não adianta se nenhum follow seria aceito
+        if not self.rate_limiter.can_perform('follows', config.MAX_FOLLOWS_PER_HOUR):
+            return 0
+        
         followers = self.get_followers_list(target_username, max_follows * 2)
         followed_count = 0
         
-        for username in followers:
+        # Pula quem já foi processado e consulta o cache antes de qualquer visita
+        candidates = [u for u in followers if u not in self.followed_users]
+        cached = self.profile_cache.get_many(candidates)
+        skipped_by_cache = 0
+        
+        for username in candidates:
             if followed_count >= max_follows:
                 break
             
-            # Pula se já processou
-            if username in self.followed_users:
-                continue
+            # Cada candidato abre o próprio perfil: ponto seguro para ceder o navegador
+            broker.checkpoint()
             
             # Verifica critérios do perfil
             try:
-                self.driver.get(f"https://www.instagram.com/{username}/")
-                HumanBehavior.random_delay(2, 4)
-                
-                # Pula privados
-                if skip_private:
-                    try:
-                        self.driver.find_element(By.XPATH, "//span[contains(text(), 'Esta conta é privada')]")
+                entry = cached.get(username)
+                if entry is not None:
+                    # Perfil inspecionado recentemente: decide sem abrir a página
+                    if not self._matches_criteria(entry, min_followers, max_followers, skip_private):
+                        skipped_by_cache += 1
                         continue
-                    except:
-                        pass
-                
-                # Verifica contagem de seguidores
-                try:
-                    followers_elem = self.driver.find_element(
-                        By.XPATH, "//a[contains(@href, '/followers')]/span/span"
-                    )
-                    followers_text = followers_elem.text.replace('.', '').replace('k', '000').replace('m', '000000')
-                    user_followers = int(followers_text)
-                    
-                    if not (min_followers <= user_followers <= max_followers):
+                else:
+                    # follow_user reaproveita a página e o retrato abertos aqui
+                    snapshot = self.nav.profile(username, delay=lambda: HumanBehavior.random_delay(2, 4))
+                    if not self._matches_criteria(snapshot, min_followers, max_followers, skip_private):
                         continue
-                except:
-                    pass
                 
-                # Tenta seguir
-                if self.follow_user(username, source=f"follower_of_{target_username}"):
-                    followed_count += 1
+                # Tenta seguir (o prazo cobre a ação inteira, retentativas incluídas)
+                with deadline(config.ACTION_DEADLINE):
+                    if self.follow_user(username, source=f"follower_of_{target_username}"):
+                        followed_count += 1
                     
+            except ActionBlockedError:
+                break
             except Exception as e:
                 continue
         
+        if skipped_by_cache:
+            logger.info(f"💾 {skipped_by_cache} perfis descartados pelo cache, sem visita")
         logger.info(f"✅ Seguiu {followed_count} usuários de @{target_username}")
         return followed_count
     
+    def unfollow_candidates(self, following: List[str], cutoff_ts: float) -> Iterator[str]:
+        """
+        Usuários de `following` seguidos até cutoff_ts, do mais antigo ao mais novo
+        
+        Follows ativos do histórico vêm do índice temporal (bisect); quem não
+        está no índice (seguido fora do bot ou registro antigo) entra com a
+        data conhecida, ou como mais antigo se não houver data. Quem ainda está
+        no período de carência nunca é retornado.
+        """
+        following_set = set(following)
+        
+        indexed = (
+            (ts, username) for ts, username in self.follow_index.followed_before(cutoff_ts)
+            if username in following_set
+        )
+        
+        others = []
+        for username in following_set:
+            if username in self.follow_index:
+                continue
+            profile = self.followed_users.get(username)
+            ts = profile.followed_ts if profile else 0
+            if ts <= cutoff_ts:
+                others.append((ts, username))
+        others.sort()
+        
+        for _, username in heapq.merge(others, indexed):
+            yield username
+    
+    @ops("collect_own_followers")
+    def collect_own_followers(self) -> tuple:
+        """
+        Coleta seus seguidores
+        Retorna (seguidores, completa); completa indica que a lista cobre o
+        contador do perfil e pode ser usada para concluir quem não segue
+        """
+        limit = config.RECONCILE_MAX_FOLLOWERS
+        followers = self.get_followers_list(config.IG_USERNAME, limit)
+        try:
+            expected = self.nav.profile(config.IG_USERNAME).followers_count
+        except Exception:
+            expected = None
+        
+        complete = (
+            expected is not None
+            and len(followers) < limit
+            and len(followers) >= expected * config.RECONCILE_MIN_COVERAGE
+        )
+        if not complete:
+            logger.warning(
+                f"⚠️  Lista de seguidores incompleta ({len(followers)}/{expected}): "
+                "não-seguidores serão verificados no perfil"
+            )
+        return followers, complete
+    
+    def reconcile_follows_back(self, following: List[str], followers: List[str],
+                               complete: bool = True) -> List[str]:
+        """
+        Atualiza follows_back em lote pela diferença entre seguindo e seguidores
+        
+        Retorna quem você segue e não aparece em `followers`. Com complete=False
+        esses usuários não são marcados como não-seguidores (podem só não ter
+        sido carregados), apenas os follow-backs confirmados são gravados.
+        """
+        followers_set = set(followers)
+        non_followers = [u for u in following if u not in followers_set]
+        
+        updates = {}
+        for username in following:
+            profile = self.followed_users.get(username)
+            if profile is None:
+                continue
+            follows_back = username in followers_set
+            if not follows_back and not complete:
+                continue
+            if profile.follows_back != follows_back:
+                updates[username] = {"follows_back": follows_back}
+        
+        changed = self._update_users(updates)
+        logger.info(
+            f"🔄 Reconciliação: {len(following) - len(non_followers)} seguem de volta, "
+            f"{len(non_followers)} não seguem ({changed} registros atualizados)"
+        )
+        return non_followers
+    
+    @driver_task("clean_non_followers")
+    @ops("clean_non_followers")
     def clean_non_followers(self, max_unfollows: int = 50, 
-                           days_before_unfollow: int = 2) -> int:
-        """Limpa quem não segue de volta"""
+                           days_before_unfollow: int = 2,
+                           reconcile: Optional[bool] = None) -> int:
+        """
+        Limpa quem não segue de volta
+        
+        reconcile=True compara as listas de seguindo e seguidores localmente e
+        só visita o perfil de quem realmente não segue (padrão: RECONCILE_FOLLOWS_BACK)
+        """
         logger.info("🧹 Iniciando limpeza de não-seguidores...")
         
+        if not self.rate_limiter.can_perform('unfollows', config.MAX_UNFOLLOWS_PER_HOUR):
+            return 0
+        
+        if reconcile is None:
+            reconcile = config.RECONCILE_FOLLOWS_BACK
+        
         following = self.get_following_list()
         unfollowed_count = 0
+        check_follows_back = True
         
-        cutoff_date = datetime.now() - timedelta(days=days_before_unfollow)
+        if reconcile:
+            followers, complete = self.collect_own_followers()
+            following = self.reconcile_follows_back(following, followers, complete)
+            # Lista completa: a diferença já confirma que não seguem de volta
+            check_follows_back = not complete
         
-        for username in following:
+        cutoff_ts = time.time() - days_before_unfollow * 86400
+        
+        for username in self.unfollow_candidates(following, cutoff_ts):
             if unfollowed_count >= max_unfollows:
                 break
             
@@ -473,17 +930,15 @@ class FollowersManager:
             if self.is_whitelisted(username):
                 continue
             
-            # Verifica data de follow
-            if username in self.followed_users:
-                user = self.followed_users[username]
-                if user.followed_at:
-                    followed_date = datetime.fromisoformat(user.followed_at)
-                    if followed_date > cutoff_date:
-                        continue
+            broker.checkpoint()
             
             # Dá unfollow
-            if self.unfollow_user(username, check_follows_back=True):
-                unfollowed_count += 1
+            try:
+                with deadline(config.ACTION_DEADLINE):
+                    if self.unfollow_user(username, check_follows_back=check_follows_back):
+                        unfollowed_count += 1
+            except ActionBlockedError:
+                break
         
         logger.info(f"✅ Limpeza concluída: {unfollowed_count} unfollows")
         return unfollowed_count
@@ -493,30 +948,85 @@ class FollowersManager:
     # ============================================
     
     def get_stats(self) -> dict:
-        """Retorna estatísticas completas"""
-        total = len(self.followed_users)
-        active = sum(1 for u in self.followed_users.values() if not u.unfollowed_at)
-        unfollowed = total - active
-        
-        # Calcula follow-back rate
-        checked = [u for u in self.followed_users.values() if u.follows_back is not None]
-        follow_backs = sum(1 for u in checked if u.follows_back)
-        follow_back_rate = (follow_backs / len(checked) * 100) if checked else 0
-        
-        # Por fonte
-        sources = defaultdict(int)
+        """Retorna estatísticas completas (contadores incrementais, O(1))"""
+        # Cópia consistente: contadores lidos juntos, sob o mesmo lock
+        with self._lock:
+            agg = self.aggregates
+            
+            # Calcula follow-back rate
+            follow_back_rate = (agg.follow_backs / agg.checked * 100) if agg.checked else 0
+            
+            return {
+                "total_historico": agg.total,
+                "seguindo_ativamente": agg.active,
+                "unfollows_realizados": agg.unfollowed,
+                "whitelist": len(self.whitelist),
+                "taxa_follow_back": f"{follow_back_rate:.1f}%",
+                "por_fonte": {SourceRegistry.name_of(k): v for k, v in agg.sources.items()},
+                "hoje": dict(self.daily_stats)
+            }
+    
+    def check_consistency(self, repair: bool = True) -> Dict[str, tuple]:
+        """
+        Recalcula os contadores do zero e compara com os incrementais
+        Retorna {campo: (incremental, recalculado)} para cada divergência
+        """
+        recomputed = FollowerAggregates.from_profiles(self.followed_users.values())
+        expected = {f: getattr(recomputed, f) for f in FollowerAggregates.FIELDS}
+        expected_sources = dict(recomputed.sources)
+        
+        drift = {}
+        for field in FollowerAggregates.FIELDS:
+            current = getattr(self.aggregates, field)
+            if current != expected[field]:
+                drift[field] = (current, expected[field])
+        if dict(self.aggregates.sources) != expected_sources:
+            drift["por_fonte"] = (
+                {SourceRegistry.name_of(k): v for k, v in self.aggregates.sources.items()},
+                {SourceRegistry.name_of(k): v for k, v in expected_sources.items()}
+            )
+        
+        if drift:
+            logger.warning(f"⚠️  Contadores de seguidores divergentes: {drift}")
+            if repair:
+                self.aggregates = recomputed
+        
+        return drift
+    
+    def get_follow_back_by_source(self) -> Dict[str, Dict]:
+        """Taxa de follow-back por origem"""
+        if self.columns is not None:
+            return self.columns.follow_back_by_source(SourceRegistry.names())
+        
+        checked = defaultdict(int)
+        backs = defaultdict(int)
         for u in self.followed_users.values():
-            sources[u.source] += 1
+            if u.follows_back is not None:
+                checked[u.source] += 1
+                backs[u.source] += 1 if u.follows_back else 0
         
         return {
-            "total_historico": total,
-            "seguindo_ativamente": active,
-            "unfollows_realizados": unfollowed,
-            "whitelist": len(self.whitelist),
-            "taxa_follow_back": f"{follow_back_rate:.1f}%",
-            "por_fonte": dict(sources),
-            "hoje": dict(self.daily_stats)
+            source: {
+                "verificados": count,
+                "follow_backs": backs[source],
+                "taxa": round(backs[source] / count * 100, 1)
+            }
+            for source, count in checked.items()
         }
-
-# Importações no final para evitar circular
-from utils import load_json, save_json
+    
+    def get_age_histogram(self, bins_days=DEFAULT_AGE_BINS, active_only: bool = True) -> Dict[str, int]:
+        """Follows por idade em dias (apenas ativos por padrão)"""
+        now_ts = int(time.time())
+        if self.columns is not None:
+            return self.columns.age_histogram(now_ts, bins_days, active_only)
+        
+        labels = age_bin_labels(bins_days)
+        histogram = dict.fromkeys(labels, 0)
+        for u in self.followed_users.values():
+            if not u.followed_ts or (active_only and u.unfollowed_ts):
+                continue
+            age = (now_ts - u.followed_ts) // 86400
+            idx = bisect.bisect_right(bins_days, age) - 1
+            if idx >= 0:
+                histogram[labels[idx]] += 1
+        return histogram
@@ -0,0 +1,562 @@
+"""
+Armazenamento do Histórico de Seguidores
+- Backend SQLite (WAL, conexão única)
+- Backend de journal append-only com compactação em background
+- Upsert de uma linha por ação
+- Migração automática dos arquivos JSON antigos
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from utils import logger, load_json, save_json
+from config import config
+
+class SQLiteFollowersStore:
+    """Persistência do FollowersManager em SQLite"""
+    
+    USER_COLUMNS = (
+        "username", "user_id", "followers_count", "following_count",
+        "is_private", "is_verified", "followed_at", "unfollowed_at",
+        "follows_back", "source"
+    )
+    USER_DEFAULTS = {
+        "user_id": "", "followers_count": 0, "following_count": 0,
+        "is_private": False, "is_verified": False, "source": ""
+    }
+    
+    def __init__(self, db_file: str, legacy_files: Optional[Dict[str, str]] = None):
+        """
+        legacy_files: caminhos dos JSON antigos ("users", "whitelist", "stats")
+        migrados automaticamente na primeira abertura
+        """
+        self.db_file = db_file
+        self.legacy_files = legacy_files or {}
+        self._lock = threading.RLock()
+        
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        
+        self._create_schema()
+        self._migrate_legacy_json()
+    
+    def _create_schema(self):
+        """Cria tabelas e índices"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS followed_users (
+                    username TEXT PRIMARY KEY,
+                    user_id TEXT DEFAULT '',
+                    followers_count INTEGER DEFAULT 0,
+                    following_count INTEGER DEFAULT 0,
+                    is_private INTEGER DEFAULT 0,
+                    is_verified INTEGER DEFAULT 0,
+                    followed_at TEXT,
+                    unfollowed_at TEXT,
+                    follows_back INTEGER,
+                    source TEXT DEFAULT ''
+                )
+            """)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS whitelist (username TEXT PRIMARY KEY)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+    
+    # ============================================
+    # MIGRAÇÃO
+    # ============================================
+    
+    def _migrate_legacy_json(self):
+        """Importa followers_data.json, whitelist.json e follower_stats.json uma única vez"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_migrated'"
+            ).fetchone()
+            if row:
+                return
+            
+            existing = [p for p in self.legacy_files.values() if p and os.path.exists(p)]
+            
+            with self._conn:
+                if existing:
+                    users = load_json(self.legacy_files.get("users", ""), {})
+                    whitelist = load_json(self.legacy_files.get("whitelist", ""), [])
+                    stats = load_json(self.legacy_files.get("stats", ""), {})
+                    
+                    self._write_users(users.values())
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO whitelist (username) VALUES (?)",
+                        [(u,) for u in whitelist]
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO daily_stats (key, value) VALUES (?, ?)",
+                        list(stats.items())
+                    )
+                    logger.info(
+                        f"📦 Migrados {len(users)} usuários do JSON para {os.path.basename(self.db_file)}"
+                    )
+                
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')"
+                )
+            
+            # Mantém os arquivos antigos como backup, fora do caminho de leitura
+            for path in existing:
+                try:
+                    os.replace(path, path + ".migrated")
+                except OSError as e:
+                    logger.warning(f"Não foi possível renomear {path}: {e}")
+    
+    # ============================================
+    # LEITURA
+    # ============================================
+    
+    def iter_user_rows(self) -> Iterator[tuple]:
+        """Percorre o histórico como tuplas na ordem de USER_COLUMNS"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(self.USER_COLUMNS)} FROM followed_users"
+            )
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                yield from rows
+    
+    def iter_users(self) -> Iterator[dict]:
+        """Percorre o histórico sem materializar todos os registros"""
+        for row in self.iter_user_rows():
+            data = dict(zip(self.USER_COLUMNS, row))
+            data["is_private"] = bool(data["is_private"])
+            data["is_verified"] = bool(data["is_verified"])
+            if data["follows_back"] is not None:
+                data["follows_back"] = bool(data["follows_back"])
+            yield data
+    
+    def load_users(self) -> Dict[str, dict]:
+        """Retorna histórico completo {username: dados}"""
+        return {u["username"]: u for u in self.iter_users()}
+    
+    def load_whitelist(self) -> Set[str]:
+        """Retorna usuários protegidos"""
+        with self._lock:
+            rows = self._conn.execute("SELECT username FROM whitelist").fetchall()
+        return {r[0] for r in rows}
+    
+    def load_daily_stats(self) -> Dict[str, int]:
+        """Retorna contadores diários"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM daily_stats").fetchall()
+        return dict(rows)
+    
+    # ============================================
+    # ESCRITA
+    # ============================================
+    
+    def _write_users(self, users: Iterable[dict]):
+        """Upsert de registros (chamar dentro de transação)"""
+        placeholders = ", ".join("?" for _ in self.USER_COLUMNS)
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO followed_users ({', '.join(self.USER_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            [tuple(u.get(c, self.USER_DEFAULTS.get(c)) for c in self.USER_COLUMNS) for u in users]
+        )
+    
+    def upsert_user(self, user: dict):
+        """Grava um único registro"""
+        self.upsert_users([user])
+    
+    def upsert_users(self, users: List[dict]):
+        """Grava vários registros em uma transação"""
+        if not users:
+            return
+        with self._lock, self._conn:
+            self._write_users(users)
+    
+    def add_to_whitelist(self, username: str):
+        """Adiciona usuário protegido"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO whitelist (username) VALUES (?)", (username,))
+    
+    def remove_from_whitelist(self, username: str):
+        """Remove usuário protegido"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM whitelist WHERE username = ?", (username,))
+    
+    def set_daily_stat(self, key: str, value: int):
+        """Grava um contador diário"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO daily_stats (key, value) VALUES (?, ?)", (key, value)
+            )
+    
+    def save_all(self, users: Iterable[dict], whitelist: Iterable[str], daily_stats: Dict[str, int]):
+        """Regrava todo o estado (usado apenas em salvamentos explícitos)"""
+        with self._lock, self._conn:
+            self._write_users(users)
+            self._conn.execute("DELETE FROM whitelist")
+            self._conn.executemany(
+                "INSERT INTO whitelist (username) VALUES (?)", [(u,) for u in whitelist]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_stats (key, value) VALUES (?, ?)",
+                list(daily_stats.items())
+            )
+    
+    def close(self):
+        """Fecha a conexão"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+
+class JournalFollowersStore:
+    """
+    Persistência em journal append-only (uma linha JSON por mudança)
+    
+    O estado é o último snapshot mais as entradas do journal com seq maior
+    que a do snapshot. Quando o journal passa de compact_bytes ele é
+    rotacionado e uma thread funde snapshot + journal antigo em um novo
+    snapshot, sem bloquear as gravações seguintes.
+    """
+    
+    def __init__(self, journal_file: str, snapshot_file: str,
+                 legacy_files: Optional[Dict[str, str]] = None,
+                 compact_bytes: int = 5 * 1024 * 1024):
+        self.journal_file = journal_file
+        self.snapshot_file = snapshot_file
+        self.rotated_file = journal_file + ".old"
+        self.legacy_files = legacy_files or {}
+        self.compact_bytes = compact_bytes
+        
+        self._lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+        self._seq = 0
+        
+        os.makedirs(os.path.dirname(journal_file) or ".", exist_ok=True)
+        self._migrate_legacy_json()
+        # Estado lido na inicialização; liberado após o primeiro load_users
+        self._loaded: Optional[Tuple[Dict[str, dict], Set[str], Dict[str, int]]] = self._replay()
+        
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal_size = self._journal.tell()
+    
+    # ============================================
+    # SNAPSHOT / REPLAY
+    # ============================================
+    
+    def _migrate_legacy_json(self):
+        """Converte os JSON antigos no snapshot inicial"""
+        if os.path.exists(self.snapshot_file) or os.path.exists(self.journal_file):
+            return
+        
+        existing = [p for p in self.legacy_files.values() if p and os.path.exists(p)]
+        if not existing:
+            return
+        
+        users = load_json(self.legacy_files.get("users", ""), {})
+        self._write_snapshot({
+            "seq": 0,
+            "users": users,
+            "whitelist": list(load_json(self.legacy_files.get("whitelist", ""), [])),
+            "daily_stats": load_json(self.legacy_files.get("stats", ""), {})
+        })
+        logger.info(f"📦 Migrados {len(users)} usuários do JSON para {os.path.basename(self.snapshot_file)}")
+        
+        for path in existing:
+            try:
+                os.replace(path, path + ".migrated")
+            except OSError as e:
+                logger.warning(f"Não foi possível renomear {path}: {e}")
+    
+    def _write_snapshot(self, snapshot: dict):
+        """Grava snapshot de forma atômica"""
+        tmp_file = self.snapshot_file + ".tmp"
+        save_json(snapshot, tmp_file)
+        os.replace(tmp_file, self.snapshot_file)
+    
+    @staticmethod
+    def _read_entries(path: str):
+        """Lê entradas do journal, ignorando uma última linha truncada"""
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Entrada inválida ignorada em {os.path.basename(path)}")
+    
+    @staticmethod
+    def _apply(state: dict, entry: dict):
+        """Aplica uma entrada do journal ao estado"""
+        op = entry.get("op")
+        if op == "user":
+            state["users"][entry["data"]["username"]] = entry["data"]
+        elif op == "wl_add":
+            state["whitelist"].add(entry["username"])
+        elif op == "wl_del":
+            state["whitelist"].discard(entry["username"])
+        elif op == "stat":
+            state["daily_stats"][entry["key"]] = entry["value"]
+    
+    def _fold(self, journal_files: List[str]) -> dict:
+        """Snapshot atual + entradas posteriores dos journals informados"""
+        snapshot = load_json(self.snapshot_file, {})
+        state = {
+            "seq": snapshot.get("seq", 0),
+            "users": snapshot.get("users", {}),
+            "whitelist": set(snapshot.get("whitelist", [])),
+            "daily_stats": snapshot.get("daily_stats", {})
+        }
+        base_seq = state["seq"]
+        
+        for path in journal_files:
+            for entry in self._read_entries(path):
+                if entry.get("seq", 0) <= base_seq:
+                    continue
+                self._apply(state, entry)
+                state["seq"] = max(state["seq"], entry["seq"])
+        return state
+    
+    def _replay(self) -> Tuple[Dict[str, dict], Set[str], Dict[str, int]]:
+        """Reconstrói o estado na inicialização"""
+        state = self._fold([self.rotated_file, self.journal_file])
+        self._seq = state["seq"]
+        
+        # Compactação interrompida: conclui agora, antes de abrir o journal
+        if os.path.exists(self.rotated_file):
+            self._write_snapshot(self._serializable(state))
+            os.remove(self.rotated_file)
+        
+        return state["users"], state["whitelist"], state["daily_stats"]
+    
+    @staticmethod
+    def _serializable(state: dict) -> dict:
+        return {
+            "seq": state["seq"],
+            "users": state["users"],
+            "whitelist": sorted(state["whitelist"]),
+            "daily_stats": state["daily_stats"]
+        }
+    
+    # ============================================
+    # COMPACTAÇÃO
+    # ============================================
+    
+    def _maybe_compact(self):
+        """Rotaciona o journal e dispara compactação (chamar com lock)"""
+        if self._journal_size < self.compact_bytes:
+            return
+        if self._compactor and self._compactor.is_alive():
+            return
+        
+        self._journal.close()
+        os.replace(self.journal_file, self.rotated_file)
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal_size = 0
+        
+        self._compactor = threading.Thread(target=self._compact, name="journal-compactor", daemon=True)
+        self._compactor.start()
+    
+    def _compact(self):
+        """Funde snapshot + journal rotacionado em um novo snapshot"""
+        try:
+            state = self._fold([self.rotated_file])
+            self._write_snapshot(self._serializable(state))
+            os.remove(self.rotated_file)
+            logger.info(f"🗜️  Journal compactado (seq {state['seq']}, {len(state['users'])} usuários)")
+        except Exception as e:
+            # O journal rotacionado é mantido e reaplicado na próxima inicialização
+            logger.error(f"Erro na compactação do journal: {e}")
+    
+    def _wait_compaction(self):
+        if self._compactor and self._compactor.is_alive():
+            self._compactor.join()
+    
+    # ============================================
+    # LEITURA
+    # ============================================
+    
+    def _current(self) -> Tuple[Dict[str, dict], Set[str], Dict[str, int]]:
+        """Estado em cache ou, depois de liberado, relido do disco"""
+        with self._lock:
+            if self._loaded is not None:
+                return self._loaded
+            self._wait_compaction()
+            state = self._fold([self.rotated_file, self.journal_file])
+            return state["users"], state["whitelist"], state["daily_stats"]
+    
+    def load_users(self) -> Dict[str, dict]:
+        """Retorna histórico completo {username: dados}"""
+        with self._lock:
+            users = self._current()[0]
+            # Libera a cópia da inicialização; as leituras seguintes vêm do disco
+            self._loaded = None
+            return users
+    
+    def iter_users(self) -> Iterator[dict]:
+        """Percorre o histórico carregado"""
+        return iter(self.load_users().values())
+    
+    def iter_user_rows(self) -> Iterator[tuple]:
+        """Percorre o histórico como tuplas na ordem de USER_COLUMNS"""
+        columns = SQLiteFollowersStore.USER_COLUMNS
+        defaults = SQLiteFollowersStore.USER_DEFAULTS
+        for user in self.iter_users():
+            yield tuple(user.get(c, defaults.get(c)) for c in columns)
+    
+    def load_whitelist(self) -> Set[str]:
+        """Retorna usuários protegidos"""
+        return set(self._current()[1])
+    
+    def load_daily_stats(self) -> Dict[str, int]:
+        """Retorna contadores diários"""
+        return dict(self._current()[2])
+    
+    # ============================================
+    # ESCRITA
+    # ============================================
+    
+    def _append(self, entry: dict):
+        """Acrescenta uma linha ao journal"""
+        with self._lock:
+            # O cache da inicialização deixa de refletir o disco
+            self._loaded = None
+            self._seq += 1
+            entry["seq"] = self._seq
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            self._journal.write(line)
+            self._journal.flush()
+            self._journal_size += len(line.encode("utf-8"))
+            self._maybe_compact()
+    
+    def upsert_user(self, user: dict):
+        """Grava um único registro"""
+        self._append({"op": "user", "data": user})
+    
+    def upsert_users(self, users: List[dict]):
+        """Grava vários registros"""
+        for user in users:
+            self.upsert_user(user)
+    
+    def add_to_whitelist(self, username: str):
+        """Adiciona usuário protegido"""
+        self._append({"op": "wl_add", "username": username})
+    
+    def remove_from_whitelist(self, username: str):
+        """Remove usuário protegido"""
+        self._append({"op": "wl_del", "username": username})
+    
+    def set_daily_stat(self, key: str, value: int):
+        """Grava um contador diário"""
+        self._append({"op": "stat", "key": key, "value": value})
+    
+    def save_all(self, users: Iterable[dict], whitelist: Iterable[str], daily_stats: Dict[str, int]):
+        """Grava snapshot completo e zera o journal"""
+        with self._lock:
+            self._loaded = None
+            self._wait_compaction()
+            self._write_snapshot({
+                "seq": self._seq,
+                "users": {u["username"]: u for u in users},
+                "whitelist": sorted(whitelist),
+                "daily_stats": dict(daily_stats)
+            })
+            self._journal.close()
+            self._journal = open(self.journal_file, "w", encoding="utf-8")
+            self._journal_size = 0
+    
+    def close(self):
+        """Fecha o journal"""
+        with self._lock:
+            self._wait_compaction()
+            self._journal.close()
+
+# ============================================
+# ESCOLHA DO BACKEND
+# ============================================
+
+def _backend_files(kind: str) -> List[str]:
+    if kind == "journal":
+        return [config.FOLLOWERS_SNAPSHOT_FILE, config.FOLLOWERS_JOURNAL_FILE]
+    return [config.FOLLOWERS_DB_FILE]
+
+def _backend_exists(kind: str) -> bool:
+    return any(os.path.exists(path) for path in _backend_files(kind))
+
+def _open_store(kind: str, legacy_files: Optional[Dict[str, str]] = None):
+    if kind == "journal":
+        return JournalFollowersStore(
+            config.FOLLOWERS_JOURNAL_FILE,
+            config.FOLLOWERS_SNAPSHOT_FILE,
+            legacy_files=legacy_files,
+            compact_bytes=config.JOURNAL_COMPACT_BYTES
+        )
+    return SQLiteFollowersStore(config.FOLLOWERS_DB_FILE, legacy_files=legacy_files)
+
+def _copy_history(store, kind: str, legacy_files: Dict[str, str]):
+    """
+    Backend novo e vazio: copia o histórico do outro backend ou, sem ele,
+    dos JSON antigos já renomeados para .migrated
+    """
+    other = "sqlite" if kind == "journal" else "journal"
+    migrated = {k: p + ".migrated" for k, p in legacy_files.items() if p}
+    
+    if _backend_exists(other):
+        origin = os.path.basename(_backend_files(other)[0])
+        source = _open_store(other)
+        try:
+            users = list(source.iter_users())
+            whitelist = source.load_whitelist()
+            daily_stats = source.load_daily_stats()
+        finally:
+            source.close()
+    elif any(os.path.exists(p) for p in migrated.values()):
+        origin = "JSON .migrated"
+        users = list(load_json(migrated.get("users", ""), {}).values())
+        whitelist = load_json(migrated.get("whitelist", ""), [])
+        daily_stats = load_json(migrated.get("stats", ""), {})
+    else:
+        # Instalação nova: nada a copiar
+        return
+    
+    store.save_all(users, whitelist, daily_stats)
+    logger.info(f"📦 Copiados {len(users)} usuários de {origin} para o backend '{kind}'")
+
+def create_followers_store(legacy_files: Optional[Dict[str, str]] = None):
+    """
+    Cria o backend configurado em FOLLOWERS_STORAGE
+    
+    Se o arquivo do backend escolhido ainda não existe (ex.: FOLLOWERS_STORAGE
+    trocado depois da primeira execução), o histórico vem do outro backend ou
+    dos JSON antigos, em vez de começar vazio.
+    """
+    legacy_files = legacy_files or {}
+    kind = "journal" if config.FOLLOWERS_STORAGE == "journal" else "sqlite"
+    fresh = not _backend_exists(kind)
+    # JSON antigos ainda no lugar são migrados pelo próprio backend
+    legacy_pending = any(p and os.path.exists(p) for p in legacy_files.values())
+    
+    store = _open_store(kind, legacy_files)
+    if fresh and not legacy_pending:
+        try:
+            _copy_history(store, kind, legacy_files)
+        except Exception as e:
+            logger.error(
+                f"❌ ATENÇÃO: backend '{kind}' criado vazio e o histórico anterior "
+                f"NÃO foi copiado ({e}). Volte FOLLOWERS_STORAGE ao valor anterior "
+                f"antes de seguir/dar unfollow"
+            )
+    return store
@@ -2,21 +2,24 @@
 Motor de Crescimento Orgânico
 Estratégias avançadas para aumentar seguidores
 """
-import json
 import os
 import time
 import random
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
-from utils import HumanBehavior, RateLimiter, logger, safe_execute, print_success, print_info
+from utils import HumanBehavior, logger, safe_execute, print_success, print_info
 from config import config
+from persistence import DebouncedPersistence
+from selector_registry import registry, check_action_block
+from command_stats import ops
+from driver_broker import broker, driver_task
 
 @dataclass
 class GrowthStats:
@@ -40,6 +43,7 @@ class GrowthEngine:
         self.wait = wait
         self.rate_limiter = rate_limiter
         self.fm = followers_manager
+        self.nav = followers_manager.nav
         
         # Arquivos
         self.stats_file = os.path.join(config.DATA_DIR, "growth_stats.json")
@@ -47,7 +51,9 @@ class GrowthEngine:
         
         # Dados
         self.daily_stats: Dict[str, GrowthStats] = {}
+        self._stats_lock = threading.Lock()
         self.targets = self._load_targets()
+        self._persistence = DebouncedPersistence("growth_stats", self._write_stats)
         
         self._load_stats()
     
@@ -61,12 +67,16 @@ class GrowthEngine:
             self.daily_stats = {}
     
     def _save_stats(self):
-        """Salva estatísticas"""
+        """Marca estatísticas para gravação"""
+        self._persistence.mark_dirty()
+    
+    def _write_stats(self):
+        """Grava estatísticas em disco"""
         from utils import save_json
-        save_json(
-            {k: v.to_dict() for k, v in self.daily_stats.items()},
-            self.stats_file
-        )
+        # Roda na thread do timer: copia os dias sob o lock
+        with self._stats_lock:
+            data = {k: v.to_dict() for k, v in self.daily_stats.items()}
+        save_json(data, self.stats_file)
     
     def _load_targets(self) -> Dict:
         """Carrega alvos de crescimento"""
@@ -107,14 +117,17 @@ class GrowthEngine:
     def _get_today_stats(self) -> GrowthStats:
         """Retorna ou cria estatísticas de hoje"""
         today = datetime.now().strftime("%Y-%m-%d")
-        if today not in self.daily_stats:
-            self.daily_stats[today] = GrowthStats(dia=today)
-        return self.daily_stats[today]
+        with self._stats_lock:
+            if today not in self.daily_stats:
+                self.daily_stats[today] = GrowthStats(dia=today)
+            return self.daily_stats[today]
     
     # ============================================
     # ESTRATÉGIA 1: FOLLOW EM CURTIDORES
     # ============================================
     
+    @driver_task("follow_recent_likers")
+    @ops("follow_recent_likers")
     @safe_execute(max_retries=2)
     def follow_recent_likers(self, post_url: str, max_follows: int = 15) -> int:
         """
@@ -123,35 +136,42 @@ class GrowthEngine:
         """
         print_info(f"Processando curtidas: {post_url[:50]}...")
         
+        # Não abre o post se nenhum follow seria aceito
+        if not self.rate_limiter.can_perform('follows', config.MAX_FOLLOWS_PER_HOUR):
+            return 0
+        
         self.driver.get(post_url)
         HumanBehavior.long_delay()
         
         try:
             # Clica na contagem de curtidas
             likes_link = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['likes_link']))
+                EC.element_to_be_clickable((By.XPATH, config.SELECTORS['likes_link'])),
+                key='likes_link'
             )
             likes_link.click()
             HumanBehavior.random_delay(3, 5)
             
             # Container
             dialog = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container']))
+                EC.presence_of_element_located((By.CSS_SELECTOR, config.SELECTORS['dialog_container'])),
+                key='dialog_container'
             )
             
             followed = 0
             processed = set()
             
             while followed < max_follows:
-                # Encontra botões de seguir
-                follow_buttons = dialog.find_elements(
-                    By.XPATH, "//button[contains(text(), 'Seguir') and not(contains(text(), 'Seguindo'))]"
-                )
+                # Encontra botões de seguir (apenas dentro do diálogo)
+                follow_buttons = registry.find_all(self.driver, 'likers_follow_button', root=dialog)
                 
                 for btn in follow_buttons:
                     if followed >= max_follows:
                         break
                     
+                    if not self.rate_limiter.can_perform('follows', config.MAX_FOLLOWS_PER_HOUR):
+                        return followed
+                    
                     try:
                         # Scroll até o botão
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", btn)
@@ -168,18 +188,22 @@ class GrowthEngine:
                         except:
                             username = f"user_{random.randint(1000,9999)}"
                         
-                        btn.click()
+                        if not self.rate_limiter.try_acquire('follows', config.MAX_FOLLOWS_PER_HOUR):
+                            return followed
+                        try:
+                            btn.click()
+                        except Exception:
+                            self.rate_limiter.release('follows')
+                            continue
+                        HumanBehavior.random_delay(1, 2)
+                        # Bloqueio suspende 'follows': o próximo can_perform encerra
+                        check_action_block(self.driver, self.rate_limiter, 'follows')
                         followed += 1
                         
                         # Registra
                         self._get_today_stats().follows_realizados += 1
-                        self.fm.followed_users[username] = type('obj', (object,), {
-                            'username': username,
-                            'followed_at': datetime.now().isoformat(),
-                            'source': 'recent_liker'
-                        })()
+                        self.fm.record_follow(username, source='recent_liker')
                         
-                        self.rate_limiter.record_action('follows')
                         logger.info(f"✅ Seguiu curtidor {followed}/{max_follows}: @{username}")
                         
                         HumanBehavior.random_delay(8, 15)
@@ -192,20 +216,14 @@ class GrowthEngine:
                 HumanBehavior.scroll_pause()
                 
                 # Verifica se há mais
-                new_buttons = dialog.find_elements(
-                    By.XPATH, "//button[contains(text(), 'Seguir')]"
-                )
+                new_buttons = registry.find_all(self.driver, 'likers_any_button', root=dialog)
                 if len(new_buttons) <= len(processed):
                     break
             
             # Fecha
-            try:
-                self.driver.find_element(By.CSS_SELECTOR, "svg[aria-label='Fechar']").click()
-            except:
-                pass
+            registry.click(self.driver, 'close_button')
             
             self._save_stats()
-            self.fm.save_data()
             
             print_success(f"{followed} curtidores seguidos!")
             return followed
@@ -218,6 +236,8 @@ class GrowthEngine:
     # ESTRATÉGIA 2: STORY ENGAGEMENT
     # ============================================
     
+    @driver_task("mass_story_engagement")
+    @ops("mass_story_engagement")
     def mass_story_engagement(self, hashtags: List[str], max_stories: int = 50) -> int:
         """
         Visualiza stories de usuários do nicho
@@ -231,13 +251,16 @@ class GrowthEngine:
             if viewed >= max_stories:
                 break
             
+            broker.checkpoint()
+            
             try:
                 self.driver.get(f"https://www.instagram.com/explore/tags/{hashtag}/")
                 HumanBehavior.random_delay(3, 5)
                 
                 # Clica no primeiro story
                 story_ring = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['story_ring']))
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['story_ring'])),
+                    key='story_ring'
                 )
                 story_ring.click()
                 HumanBehavior.random_delay(3, 5)
@@ -270,6 +293,8 @@ class GrowthEngine:
     # ESTRATÉGIA 3: COMENTÁRIOS ESTRATÉGICOS
     # ============================================
     
+    @driver_task("strategic_commenting")
+    @ops("strategic_commenting")
     def strategic_commenting(self, post_urls: List[str], max_comments: int = 10) -> int:
         """
         Comenta em posts de influenciadores grandes
@@ -284,6 +309,11 @@ class GrowthEngine:
             if commented >= max_comments:
                 break
             
+            if not self.rate_limiter.can_perform('comments', config.MAX_COMMENTS_PER_HOUR):
+                break
+            
+            broker.checkpoint()
+            
             try:
                 self.driver.get(post_url)
                 HumanBehavior.long_delay()
@@ -292,7 +322,8 @@ class GrowthEngine:
                 
                 # Clica na caixa de comentário
                 comment_box = self.wait.until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['comment_input']))
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, config.SELECTORS['comment_input'])),
+                    key='comment_input'
                 )
                 comment_box.click()
                 HumanBehavior.random_delay(1, 2)
@@ -308,7 +339,15 @@ class GrowthEngine:
                 submit_btn = self.driver.find_element(
                     By.XPATH, "//button[contains(text(), 'Publicar')]"
                 )
-                submit_btn.click()
+                if not self.rate_limiter.try_acquire('comments', config.MAX_COMMENTS_PER_HOUR):
+                    break
+                try:
+                    submit_btn.click()
+                except Exception:
+                    self.rate_limiter.release('comments')
+                    raise
+                HumanBehavior.random_delay(1, 2)
+                check_action_block(self.driver, self.rate_limiter, 'comments')
                 
                 commented += 1
                 self._get_today_stats().comentarios_enviados += 1
@@ -328,10 +367,15 @@ class GrowthEngine:
     # ESTRATÉGIA 4: LIKE EM HASHTAG
     # ============================================
     
+    @driver_task("like_by_hashtag")
+    @ops("like_by_hashtag")
     def like_by_hashtag(self, hashtag: str, max_likes: int = 30) -> int:
         """Curti posts de uma hashtag"""
         print_info(f"Curtindo posts de #{hashtag}")
         
+        if not self.rate_limiter.can_perform('likes', config.MAX_LIKES_PER_HOUR):
+            return 0
+        
         self.driver.get(f"https://www.instagram.com/explore/tags/{hashtag}/")
         HumanBehavior.long_delay()
         
@@ -349,17 +393,24 @@ class GrowthEngine:
                 if not self.rate_limiter.can_perform('likes', config.MAX_LIKES_PER_HOUR):
                     break
                 
+                # Cada post é aberto pela URL: ponto seguro para ceder o navegador
+                broker.checkpoint()
+                
                 try:
                     self.driver.get(url)
                     HumanBehavior.random_delay(2, 4)
                     
                     # Procura botão de curtir
-                    like_btn = self.driver.find_element(By.CSS_SELECTOR, config.SELECTORS['like_button'])
-                    like_btn.click()
+                    if not self.rate_limiter.try_acquire('likes', config.MAX_LIKES_PER_HOUR):
+                        break
+                    if registry.click(self.driver, 'like_button') is None:
+                        self.rate_limiter.release('likes')
+                        continue
+                    HumanBehavior.random_delay(1, 2)
+                    check_action_block(self.driver, self.rate_limiter, 'likes')
                     
                     liked += 1
                     self._get_today_stats().curtidas_enviadas += 1
-                    self.rate_limiter.record_action('likes')
                     
                     logger.info(f"❤️  Curtido {liked}/{max_likes}")
                     HumanBehavior.random_delay(3, 6)
@@ -378,6 +429,7 @@ class GrowthEngine:
     # SESSÃO COMPLETA
     # ============================================
     
+    @driver_task("growth_session")
     def run_growth_session(self, session_type: str = "balanced"):
         """
         Executa sessão completa de crescimento
@@ -415,58 +467,104 @@ class GrowthEngine:
         """)
         
         # 1. UNFOLLOW PRIMEIRO
-        print("\n📍 FASE 1: Limpando não-seguidores...")
-        self.fm.clean_non_followers(cfg["unfollows"], days_before_unfollow=2)
+        def clean():
+            self.fm.clean_non_followers(cfg["unfollows"], days_before_unfollow=2)
         
         # 2. FOLLOW EM CURTIDORES
-        print("\n📍 FASE 2: Follow em curtidores de influenciadores...")
-        if self.targets["influenciadores"]:
-            influencer = random.choice(self.targets["influenciadores"])
-            post_url = self._get_recent_post(influencer["username"])
-            if post_url:
-                self.follow_recent_likers(post_url, cfg["follows"] // 2)
+        def follow_likers():
+            if self.targets["influenciadores"]:
+                influencer = random.choice(self.targets["influenciadores"])
+                post_url = self._get_recent_post(influencer["username"])
+                if post_url:
+                    self.follow_recent_likers(post_url, cfg["follows"] // 2)
         
         # 3. FOLLOW EM SEGUIDORES DE CONCORRENTES
-        remaining = cfg["follows"] - self._get_today_stats().follows_realizados
-        if remaining > 0 and self.targets["concorrentes"]:
-            print("\n📍 FASE 3: Follow em seguidores de concorrentes...")
-            competitor = random.choice(self.targets["concorrentes"])
-            self.fm.follow_followers_of_target(
-                competitor if isinstance(competitor, str) else competitor["username"],
-                max_follows=remaining
-            )
+        def follow_competitors():
+            remaining = cfg["follows"] - self._get_today_stats().follows_realizados
+            if remaining > 0 and self.targets["concorrentes"]:
+                competitor = random.choice(self.targets["concorrentes"])
+                self.fm.follow_followers_of_target(
+                    competitor if isinstance(competitor, str) else competitor["username"],
+                    max_follows=remaining
+                )
         
         # 4. LIKE EM HASHTAGS
-        print("\n📍 FASE 4: Curtindo posts de hashtags...")
-        for hashtag in self.targets["hashtags_populares"][:2]:
-            self.like_by_hashtag(hashtag, cfg["likes_per_tag"] // 2)
-            HumanBehavior.random_delay(10, 20)
+        def like_hashtags():
+            for hashtag in self.targets["hashtags_populares"][:2]:
+                self.like_by_hashtag(hashtag, cfg["likes_per_tag"] // 2)
+                HumanBehavior.random_delay(10, 20)
         
         # 5. STORY ENGAGEMENT
-        print("\n📍 FASE 5: Visualizando stories...")
-        self.mass_story_engagement(
-            self.targets["hashtags_populares"][:3],
-            cfg["stories"]
-        )
+        def stories():
+            self.mass_story_engagement(
+                self.targets["hashtags_populares"][:3],
+                cfg["stories"]
+            )
         
         # 6. COMENTÁRIOS
-        print("\n📍 FASE 6: Comentários estratégicos...")
-        if self.targets["influenciadores"]:
-            posts = []
-            for inf in self.targets["influenciadores"][:2]:
-                post = self._get_recent_post(inf["username"])
-                if post:
-                    posts.append(post)
-            self.strategic_commenting(posts, cfg["comments"])
+        def comments():
+            if self.targets["influenciadores"]:
+                posts = []
+                for inf in self.targets["influenciadores"][:2]:
+                    post = self._get_recent_post(inf["username"])
+                    if post:
+                        posts.append(post)
+                self.strategic_commenting(posts, cfg["comments"])
+        
+        self._run_phases([
+            ("FASE 1: Limpando não-seguidores", 'unfollows', clean),
+            ("FASE 2: Follow em curtidores de influenciadores", 'follows', follow_likers),
+            ("FASE 3: Follow em seguidores de concorrentes", 'follows', follow_competitors),
+            ("FASE 4: Curtindo posts de hashtags", 'likes', like_hashtags),
+            ("FASE 5: Visualizando stories", None, stories),
+            ("FASE 6: Comentários estratégicos", 'comments', comments),
+        ])
         
         # RELATÓRIO
         self._print_session_report()
     
+    def _run_phases(self, phases: List[tuple]):
+        """
+        Executa as fases (nome, tipo de ação, função) na ordem dada,
+        adiando as que o rate limiter ainda não libera
+        
+        Sem fase liberada, dorme exatamente até a mais próxima liberar, desde
+        que a espera caiba em SESSION_MAX_WAIT; senão as restantes são puladas.
+        Entre fases e durante a espera o navegador fica livre para publicações.
+        """
+        pending = list(phases)
+        
+        while pending:
+            waits = [
+                self.rate_limiter.wait_time(action_type) if action_type else 0.0
+                for _, action_type, _ in pending
+            ]
+            index = next((i for i, wait in enumerate(waits) if wait == 0), None)
+            
+            if index is None:
+                index = min(range(len(pending)), key=waits.__getitem__)
+                wait = waits[index]
+                if wait > config.SESSION_MAX_WAIT:
+                    for name, action_type, _ in pending:
+                        when = self.rate_limiter.next_allowed_at(action_type)
+                        logger.info(
+                            f"⏭️  {name} pulada: '{action_type}' só libera "
+                            f"{when.strftime('%d/%m %H:%M') if when else 'com limite maior que zero'}"
+                        )
+                    break
+                logger.info(f"⏳ Aguardando {wait:.0f}s até liberar '{pending[index][1]}'")
+                broker.sleep(wait)
+                continue
+            
+            broker.checkpoint()
+            name, _, run = pending.pop(index)
+            print(f"\n📍 {name}...")
+            run()
+    
     def _get_recent_post(self, username: str) -> Optional[str]:
         """Pega URL do post mais recente"""
         try:
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            HumanBehavior.random_delay(3, 5)
+            self.nav.open_profile(username, delay=lambda: HumanBehavior.random_delay(3, 5))
             
             post = self.driver.find_element(By.CSS_SELECTOR, config.SELECTORS['post_links'])
             return post.get_attribute('href')
@@ -476,6 +574,7 @@ class GrowthEngine:
     def _print_session_report(self):
         """Imprime relatório da sessão"""
         stats = self._get_today_stats()
+        nav = self.nav.get_stats()
         
         report = f"""
 ╔══════════════════════════════════════════════════════════╗
@@ -487,6 +586,7 @@ class GrowthEngine:
 ║  ❤️  Curtidas:     {stats.curtidas_enviadas:4}                          ║
 ║  💬 Comentários:  {stats.comentarios_enviados:4}                          ║
 ║  👀 Stories:      {stats.stories_visualizados:4}                          ║
+║  ↩️  Navegações evitadas: {nav['navegacoes_evitadas']:4}                 ║
 ╠══════════════════════════════════════════════════════════╣
 ║  📈 Projeção: ~{stats.follows_realizados * 0.3:.0f} novos seguidores (30% conv.)  ║
 ╚══════════════════════════════════════════════════════════╝
@@ -498,7 +598,10 @@ class GrowthEngine:
         week_ago = datetime.now() - timedelta(days=7)
         weekly = defaultdict(int)
         
-        for date_str, stats in self.daily_stats.items():
+        with self._stats_lock:
+            days = list(self.daily_stats.items())
+        
+        for date_str, stats in days:
             date = datetime.strptime(date_str, "%Y-%m-%d")
             if date >= week_ago:
                 for key, value in vars(stats).items():
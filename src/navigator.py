@@ -0,0 +1,172 @@
+"""
+Navegação com Cache de Sessão
+Evita recarregar a página atual e guarda um retrato do perfil aberto
+"""
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit
+
+from utils import HumanBehavior, logger
+from page_extractors import extract_profile
+
+# Estados do botão de follow no perfil
+FOLLOW_STATE_FOLLOW = "seguir"
+FOLLOW_STATE_FOLLOWING = "seguindo"
+FOLLOW_STATE_REQUESTED = "solicitado"
+FOLLOW_STATE_UNKNOWN = "desconhecido"
+
+PROFILE_URL = "https://www.instagram.com/{username}/"
+
+@dataclass
+class ProfileSnapshot:
+    """Estado de um perfil lido da página aberta"""
+    username: str
+    is_private: bool = False
+    is_verified: bool = False
+    follow_state: str = FOLLOW_STATE_UNKNOWN
+    follows_you: bool = False
+    posts_count: Optional[int] = None
+    followers_count: Optional[int] = None
+    following_count: Optional[int] = None
+    captured_at: float = field(default_factory=time.time)
+    
+    def to_dict(self):
+        return asdict(self)
+
+class Navigator:
+    """
+    Camada de navegação compartilhada pelos módulos de um mesmo driver
+
+    goto() só chama driver.get() quando o navegador não está na URL pedida.
+    profile() devolve o retrato do perfil aberto, lido uma única vez por
+    carregamento; ações que mudam a página (seguir, deixar de seguir)
+    atualizam o retrato com update_snapshot() em vez de recarregar.
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self._url: Optional[str] = None
+        self._snapshot: Optional[ProfileSnapshot] = None
+        self._profile_listeners: List[Callable[[ProfileSnapshot], None]] = []
+        
+        self.navigations = 0
+        self.navigations_saved = 0
+        self.snapshots_parsed = 0
+        self.snapshots_reused = 0
+    
+    @staticmethod
+    def normalize(url: str) -> str:
+        """URL sem query/fragmento, com barra final, para comparação"""
+        parts = urlsplit(url)
+        path = parts.path if parts.path.endswith("/") else parts.path + "/"
+        return f"{parts.scheme}://{parts.netloc.lower()}{path}"
+    
+    def current_url(self) -> Optional[str]:
+        """URL real do navegador (cliques podem ter navegado por fora do goto)"""
+        try:
+            return self.normalize(self.driver.current_url)
+        except Exception:
+            return None
+    
+    def is_at(self, url: str) -> bool:
+        """True se a página carregada pelo último goto ainda é `url`"""
+        target = self.normalize(url)
+        return self._url == target and self.current_url() == target
+    
+    # ============================================
+    # NAVEGAÇÃO
+    # ============================================
+    
+    def goto(self, url: str, delay: Optional[Callable[[], None]] = HumanBehavior.long_delay,
+             force: bool = False) -> bool:
+        """
+        Abre `url` se ainda não estiver nela
+        Retorna True se houve carregamento, False se a página atual foi reaproveitada
+        """
+        if not force and self.is_at(url):
+            self.navigations_saved += 1
+            logger.debug(f"↩️  Reaproveitando página: {url}")
+            return False
+        
+        self.driver.get(url)
+        self._url = self.normalize(url)
+        self._snapshot = None
+        self.navigations += 1
+        
+        if delay:
+            delay()
+        return True
+    
+    def open_profile(self, username: str, delay: Optional[Callable[[], None]] = HumanBehavior.long_delay,
+                     force: bool = False) -> bool:
+        """Abre o perfil de um usuário (ver goto)"""
+        return self.goto(PROFILE_URL.format(username=username), delay=delay, force=force)
+    
+    def invalidate(self, reload: bool = False):
+        """Descarta o retrato; com reload o próximo goto recarrega a página"""
+        self._snapshot = None
+        if reload:
+            self._url = None
+    
+    # ============================================
+    # RETRATO DO PERFIL
+    # ============================================
+    
+    def profile(self, username: str, delay: Optional[Callable[[], None]] = HumanBehavior.long_delay,
+                refresh: bool = False) -> ProfileSnapshot:
+        """Abre o perfil (se preciso) e retorna seu retrato"""
+        if self.open_profile(username, delay=delay, force=refresh):
+            self._snapshot = None
+        
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.username == username:
+            self.snapshots_reused += 1
+            return snapshot
+        
+        self._snapshot = self._parse_profile(username)
+        self.snapshots_parsed += 1
+        
+        for listener in self._profile_listeners:
+            try:
+                listener(self._snapshot)
+            except Exception as e:
+                logger.debug(f"Erro em listener de perfil: {e}")
+        return self._snapshot
+    
+    def add_profile_listener(self, listener: Callable[[ProfileSnapshot], None]):
+        """Registra uma função chamada a cada perfil lido da página"""
+        self._profile_listeners.append(listener)
+    
+    def update_snapshot(self, **changes):
+        """Aplica ao retrato atual uma mudança feita na própria página"""
+        if self._snapshot is None:
+            return
+        for attr, value in changes.items():
+            setattr(self._snapshot, attr, value)
+    
+    def _parse_profile(self, username: str) -> ProfileSnapshot:
+        """Lê o perfil aberto em uma única chamada ao navegador"""
+        data = extract_profile(self.driver)
+        return ProfileSnapshot(
+            username=username,
+            is_private=data["is_private"],
+            is_verified=data["is_verified"],
+            follow_state=data["follow_state"] or FOLLOW_STATE_UNKNOWN,
+            follows_you=data["follows_you"],
+            posts_count=data["posts_count"],
+            followers_count=data["followers_count"],
+            following_count=data["following_count"]
+        )
+    
+    # ============================================
+    # ESTATÍSTICAS
+    # ============================================
+    
+    def get_stats(self) -> dict:
+        return {
+            "navegacoes": self.navigations,
+            "navegacoes_evitadas": self.navigations_saved,
+            "perfis_lidos": self.snapshots_parsed,
+            "perfis_reaproveitados": self.snapshots_reused
+        }
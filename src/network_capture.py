@@ -0,0 +1,256 @@
+"""
+Captura Passiva de Respostas JSON (DevTools Network)
+Lê as respostas que a própria página já baixou (listas de seguidores,
+dados de posts, atividade do público) em vez de raspar o DOM.
+Nenhuma requisição extra é feita: o corpo vem do buffer do navegador
+via Network.getResponseBody.
+"""
+import json
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from utils import logger
+
+# Endpoints conhecidos -> tipo de dado
+ENDPOINTS = [
+    ("followers", re.compile(r"/api/v1/friendships/\d+/followers/")),
+    ("following", re.compile(r"/api/v1/friendships/\d+/following/")),
+    ("media", re.compile(r"/api/v1/media/\d+/info/")),
+    ("graphql", re.compile(r"/graphql/query|/api/graphql")),
+    ("insights", re.compile(r"/api/v1/insights/|/insights/")),
+]
+
+# Shortcode do post na URL (/p/<code>/, /reel/<code>/, /tv/<code>/)
+_SHORTCODE_RE = re.compile(r"/(?:p|reel|tv)/([^/?#]+)")
+
+# Mídias guardadas entre reset()s
+MAX_MEDIA = 50
+
+# Chaves de atividade por hora nas respostas de insights
+_ACTIVITY_KEYS = ("online_followers", "follower_activity", "hourly_activity")
+
+def enable_performance_logging(options):
+    """Ativa o log de performance (eventos Network) nas opções do Chrome"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+def _walk(obj) -> Iterable[dict]:
+    """Percorre todos os dicts de um JSON aninhado"""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+def shortcode_from_url(url: Optional[str]) -> Optional[str]:
+    """Shortcode do post numa URL do Instagram (None se não for de post)"""
+    match = _SHORTCODE_RE.search(url or "")
+    return match.group(1) if match else None
+
+def _count(value) -> Optional[int]:
+    """Aceita 123 ou {"count": 123}"""
+    if isinstance(value, dict):
+        value = value.get("count")
+    return value if isinstance(value, int) else None
+
+class NetworkCapture:
+    """
+    Acompanha os eventos Network do log de performance do Chrome
+
+    reset() descarta o que já foi baixado; poll() processa os eventos novos
+    e guarda os dados dos endpoints conhecidos; os métodos take_* e users()
+    devolvem o que foi capturado desde o último reset().
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self._pending: Dict[str, str] = {}
+        self._users: Dict[str, Dict[str, dict]] = {"followers": {}, "following": {}}
+        # Métricas por shortcode: a mesma resposta traz posts relacionados,
+        # a grade do perfil etc., então o post certo é achado pelo código
+        self._media: "OrderedDict[str, dict]" = OrderedDict()
+        self._activity: Optional[Dict[int, int]] = None
+        
+        self.responses_parsed = 0
+        self.bodies_unavailable = 0
+        
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        except Exception as e:
+            logger.warning(f"Captura de rede indisponível: {e}")
+    
+    # ============================================
+    # LEITURA DO LOG
+    # ============================================
+    
+    def _read_log(self) -> List[dict]:
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Erro ao ler log de performance: {e}")
+            return []
+        
+        messages = []
+        for entry in entries:
+            try:
+                messages.append(json.loads(entry["message"])["message"])
+            except (KeyError, ValueError):
+                continue
+        return messages
+    
+    def reset(self):
+        """Descarta eventos e dados capturados até agora"""
+        self._read_log()
+        self._pending.clear()
+        for users in self._users.values():
+            users.clear()
+        self._media.clear()
+        self._activity = None
+    
+    def poll(self):
+        """Processa os eventos novos do log"""
+        for message in self._read_log():
+            method = message.get("method")
+            params = message.get("params", {})
+            
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if "json" not in response.get("mimeType", ""):
+                    continue
+                kind = self._classify(response.get("url", ""))
+                if kind:
+                    self._pending[params.get("requestId")] = kind
+                    
+            elif method == "Network.loadingFinished":
+                kind = self._pending.pop(params.get("requestId"), None)
+                if kind:
+                    self._handle_body(params["requestId"], kind)
+                    
+            elif method == "Network.loadingFailed":
+                self._pending.pop(params.get("requestId"), None)
+    
+    @staticmethod
+    def _classify(url: str) -> Optional[str]:
+        for kind, pattern in ENDPOINTS:
+            if pattern.search(url):
+                return kind
+        return None
+    
+    def _handle_body(self, request_id: str, kind: str):
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            data = json.loads(body.get("body") or "null")
+        except Exception:
+            # Corpo já descartado pelo navegador ou não-JSON
+            self.bodies_unavailable += 1
+            return
+        
+        self.responses_parsed += 1
+        if kind in ("followers", "following"):
+            self._parse_users(kind, data)
+        elif kind == "insights":
+            self._parse_activity(data)
+        else:
+            self._parse_media(data)
+            self._parse_activity(data)
+    
+    # ============================================
+    # PARSERS
+    # ============================================
+    
+    def _parse_users(self, kind: str, data):
+        # Corpo que não é objeto (ex.: lista) não é página de usuários
+        if not isinstance(data, dict):
+            return
+        users = self._users[kind]
+        for user in data.get("users") or []:
+            if not isinstance(user, dict):
+                continue
+            username = user.get("username")
+            if username and username not in users:
+                users[username] = {
+                    "username": username,
+                    "user_id": str(user.get("pk") or user.get("id") or ""),
+                    "is_private": bool(user.get("is_private")),
+                    "is_verified": bool(user.get("is_verified"))
+                }
+    
+    def _parse_media(self, data):
+        for node in _walk(data):
+            # Só nós de mídia têm taken_at (comentários também têm like_count)
+            taken_at = node.get("taken_at", node.get("taken_at_timestamp"))
+            if not isinstance(taken_at, int):
+                continue
+            likes = _count(node.get("like_count", node.get("edge_media_preview_like")))
+            comments = _count(node.get("comment_count", node.get("edge_media_to_comment")))
+            if likes is None and comments is None:
+                continue
+            code = node.get("code") or node.get("shortcode")
+            if not isinstance(code, str):
+                continue
+            self._media[code] = {"likes": likes, "comments": comments, "taken_at": taken_at}
+            self._media.move_to_end(code)
+            while len(self._media) > MAX_MEDIA:
+                self._media.popitem(last=False)
+    
+    def _parse_activity(self, data):
+        for node in _walk(data):
+            for key in _ACTIVITY_KEYS:
+                hours = self._hours_from(node.get(key))
+                if hours:
+                    self._activity = hours
+                    return
+    
+    @staticmethod
+    def _hours_from(value) -> Optional[Dict[int, int]]:
+        """Aceita lista de 24 valores ou lista de {hour/key, value}"""
+        if not isinstance(value, list) or not value:
+            return None
+        if len(value) == 24 and all(isinstance(v, (int, float)) for v in value):
+            return {h: int(v) for h, v in enumerate(value)}
+        hours = {}
+        for item in value:
+            if not isinstance(item, dict):
+                return None
+            hour = item.get("hour", item.get("key"))
+            count = item.get("value", item.get("count"))
+            try:
+                hours[int(hour)] = int(count)
+            except (TypeError, ValueError):
+                return None
+        return hours or None
+    
+    # ============================================
+    # CONSULTAS
+    # ============================================
+    
+    def users(self, kind: str) -> List[str]:
+        """Usernames capturados para "followers" ou "following", na ordem recebida"""
+        self.poll()
+        return list(self._users[kind])
+    
+    def user_details(self, kind: str) -> Dict[str, dict]:
+        self.poll()
+        return dict(self._users[kind])
+    
+    def take_media(self, shortcode: Optional[str]) -> Optional[dict]:
+        """Métricas capturadas do post `shortcode` (e limpa); None se ele não veio"""
+        self.poll()
+        media = self._media.get(shortcode) if shortcode else None
+        self._media.clear()
+        return media
+    
+    def take_activity(self) -> Optional[Dict[int, int]]:
+        """Atividade por hora capturada (e limpa)"""
+        self.poll()
+        activity, self._activity = self._activity, None
+        return activity
+    
+    def get_stats(self) -> Dict:
+        return {
+            "respostas_lidas": self.responses_parsed,
+            "corpos_indisponiveis": self.bodies_unavailable
+        }
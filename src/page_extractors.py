@@ -0,0 +1,113 @@
+"""
+Extratores de Página
+Cada tipo de página (perfil, post, insights) é lido por uma única chamada
+execute_script que devolve JSON; elementos ausentes voltam como None
+"""
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import JavascriptException
+
+from utils import logger, parse_count
+
+# Funções auxiliares comuns aos scripts (XPath e texto sem exceções)
+_HELPERS_JS = """
+const node = (xp) => document.evaluate(
+    xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const has = (xp) => node(xp) !== null;
+const text = (el) => el ? (el.getAttribute('title') || el.textContent || '').trim() || null : null;
+"""
+
+_PROFILE_JS = _HELPERS_JS + """
+let buttonNodes = document.querySelectorAll('header button');
+if (!buttonNodes.length) buttonNodes = document.querySelectorAll('main button');
+const buttons = Array.from(buttonNodes).map((b) => (b.textContent || '').trim());
+let followState = null;
+if (buttons.some((t) => t.startsWith('Seguindo'))) followState = 'seguindo';
+else if (buttons.some((t) => t.startsWith('Solicitado'))) followState = 'solicitado';
+else if (buttons.some((t) => t.startsWith('Seguir'))) followState = 'seguir';
+
+const countLink = (part) => {
+    const a = document.querySelector(`a[href*='/${part}']`);
+    return a ? text(a.querySelector('span[title]') || a.querySelector('span > span') || a) : null;
+};
+const postsItem = document.querySelector('header ul li');
+
+return {
+    is_private: has("//span[contains(text(), 'Esta conta é privada')]")
+        || has("//h2[contains(text(), 'Esta conta é privada')]"),
+    is_verified: document.querySelector("header svg[aria-label='Verificado']") !== null,
+    follows_you: buttons.some((t) => t.startsWith('Seguir de volta'))
+        || has("//*[self::span or self::div][contains(text(), 'Segue você')]"),
+    follow_state: followState,
+    posts: postsItem ? text(postsItem.querySelector('span > span') || postsItem) : null,
+    followers: countLink('followers'),
+    following: countLink('following')
+};
+"""
+
+_POST_JS = _HELPERS_JS + """
+const likes = node("//section//span[contains(text(), 'curtida')]")
+    || node("//section//a[contains(@href, '/liked_by')]");
+const comments = node("//button[contains(., 'comentário')]")
+    || node("//span[contains(text(), 'comentário')]");
+const time = document.querySelector('time[datetime]');
+
+return {
+    likes: text(likes),
+    comments: text(comments),
+    posted_at: time ? time.getAttribute('datetime') : null
+};
+"""
+
+_INSIGHTS_JS = """
+const bars = Array.from(document.querySelectorAll(
+    "[data-testid='hourly-activity-chart'] div, .x1q0g3np div"
+)).slice(0, 24);
+return bars.map((bar) => {
+    const height = parseFloat(bar.style && bar.style.height);
+    return Number.isNaN(height) ? null : height;
+});
+"""
+
+def _run(driver, script: str, default):
+    """Executa o extrator; erro de script vira resultado vazio"""
+    try:
+        result = driver.execute_script(script)
+    except JavascriptException as e:
+        logger.debug(f"Extrator de página falhou: {e}")
+        return default
+    return default if result is None else result
+
+# ============================================
+# EXTRATORES
+# ============================================
+
+def extract_profile(driver) -> Dict:
+    """
+    Perfil aberto: is_private, is_verified, follows_you, follow_state
+    ("seguir"/"seguindo"/"solicitado" ou None) e contadores
+    """
+    raw = _run(driver, _PROFILE_JS, {})
+    return {
+        "is_private": bool(raw.get("is_private")),
+        "is_verified": bool(raw.get("is_verified")),
+        "follows_you": bool(raw.get("follows_you")),
+        "follow_state": raw.get("follow_state"),
+        "posts_count": parse_count(raw.get("posts")),
+        "followers_count": parse_count(raw.get("followers")),
+        "following_count": parse_count(raw.get("following"))
+    }
+
+def extract_post(driver) -> Dict:
+    """Post aberto: curtidas, comentários e data de publicação"""
+    raw = _run(driver, _POST_JS, {})
+    return {
+        "likes": parse_count(raw.get("likes")),
+        "comments": parse_count(raw.get("comments")),
+        "posted_at": raw.get("posted_at")
+    }
+
+def extract_insights_activity(driver) -> List[Optional[float]]:
+    """Alturas (%) das barras do gráfico de atividade por hora"""
+    return _run(driver, _INSIGHTS_JS, [])
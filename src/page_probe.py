@@ -0,0 +1,123 @@
+"""
+Sondagem de Seletores
+Avalia vários seletores (CSS ou XPath) em uma única chamada na página
+e informa quais existem, com texto, posição e o próprio elemento
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from selenium.common.exceptions import JavascriptException
+
+from utils import logger
+
+_PROBE_JS = """
+const selectors = arguments[0], root = arguments[1] || document;
+const stopAtFirst = arguments[2], visibleOnly = arguments[3], collectAll = arguments[4];
+
+const isXPath = (sel) => sel.startsWith('/') || sel.startsWith('(') || sel.startsWith('./');
+const find = (sel) => {
+    if (!isXPath(sel)) return Array.from(root.querySelectorAll(sel));
+    const snap = document.evaluate(sel, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < snap.snapshotLength; i++) nodes.push(snap.snapshotItem(i));
+    return nodes;
+};
+const isVisible = (el) => {
+    const r = el.getBoundingClientRect();
+    if (r.width === 0 && r.height === 0) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+
+const results = [];
+for (const sel of selectors) {
+    const start = performance.now();
+    let nodes;
+    try {
+        nodes = find(sel);
+    } catch (e) {
+        results.push({selector: sel, count: 0, error: String(e), ms: performance.now() - start});
+        continue;
+    }
+    const visible = nodes.filter(isVisible);
+    const el = visible[0] || (visibleOnly ? null : nodes[0]);
+    if (!el) {
+        results.push({selector: sel, count: 0, ms: performance.now() - start});
+        continue;
+    }
+    const r = el.getBoundingClientRect();
+    results.push({
+        selector: sel,
+        count: visibleOnly ? visible.length : nodes.length,
+        element: el,
+        elements: collectAll ? (visibleOnly ? visible : nodes) : null,
+        text: ((el.innerText || el.textContent || '').trim()).slice(0, 200),
+        rect: {x: r.x, y: r.y, width: r.width, height: r.height},
+        visible: visible.length > 0,
+        ms: performance.now() - start
+    });
+    if (stopAtFirst) break;
+}
+return results;
+"""
+
+@dataclass
+class ProbeMatch:
+    """Resultado de um seletor sondado"""
+    selector: str
+    count: int = 0
+    element: Any = None
+    elements: Optional[List[Any]] = None
+    text: Optional[str] = None
+    rect: Optional[Dict[str, float]] = None
+    visible: bool = False
+    error: Optional[str] = None
+    ms: float = 0.0
+    evaluated: bool = True
+    
+    @property
+    def found(self) -> bool:
+        return self.count > 0
+
+def probe(driver, selectors: Sequence[str], root=None,
+          stop_at_first: bool = False, visible_only: bool = False,
+          collect_all: bool = False) -> List[ProbeMatch]:
+    """
+    Sonda os seletores na ordem dada, em uma ida ao navegador
+
+    Seletores que começam com "/", "(" ou "./" são XPath; os demais, CSS.
+    root limita a busca a um elemento (ex.: o diálogo aberto). Com
+    stop_at_first a sondagem para no primeiro seletor encontrado; com
+    collect_all cada resultado traz todos os elementos em `elements`.
+    """
+    try:
+        raw = driver.execute_script(
+            _PROBE_JS, list(selectors), root, stop_at_first, visible_only, collect_all
+        ) or []
+    except JavascriptException as e:
+        logger.debug(f"Sondagem falhou: {e}")
+        raw = []
+    
+    matches = {item["selector"]: ProbeMatch(**item) for item in raw}
+    # Seletores após o primeiro encontrado (stop_at_first) não são avaliados
+    return [matches.get(sel, ProbeMatch(selector=sel, evaluated=False)) for sel in selectors]
+
+def first_match(driver, selectors: Sequence[str], root=None,
+                visible_only: bool = True) -> Optional[ProbeMatch]:
+    """Primeiro seletor encontrado (por padrão só elementos visíveis)"""
+    for match in probe(driver, selectors, root, stop_at_first=True, visible_only=visible_only):
+        if match.found:
+            return match
+    return None
+
+def click_first(driver, selectors: Sequence[str], root=None) -> Optional[ProbeMatch]:
+    """Clica no primeiro elemento visível entre os seletores; None se nenhum existe"""
+    match = first_match(driver, selectors, root)
+    if match is None:
+        return None
+    try:
+        match.element.click()
+    except Exception as e:
+        logger.debug(f"Clique em '{match.selector}' falhou: {e}")
+        return None
+    return match
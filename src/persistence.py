@@ -0,0 +1,123 @@
+"""
+Persistência com dirty flags
+Agrupa gravações em disco: flush a cada N segundos ou N mutações
+"""
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional
+
+from utils import logger
+from config import config
+
+class DebouncedPersistence:
+    """
+    Controla quando um módulo grava seus dados
+
+    O módulo chama mark_dirty() a cada mudança e fornece flush_fn, que faz a
+    gravação real. A gravação acontece quando o número de mudanças pendentes
+    chega a max_pending, ou interval segundos após a primeira mudança.
+    """
+    
+    _instances = weakref.WeakSet()
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, name: str, flush_fn: Callable[[], None],
+                 interval: Optional[float] = None,
+                 max_pending: Optional[int] = None):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.interval = config.PERSIST_INTERVAL if interval is None else interval
+        self.max_pending = config.PERSIST_MAX_PENDING if max_pending is None else max_pending
+        
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self.pending = 0
+        self.mutations = 0
+        self.flushes = 0
+        self.last_flush: Optional[float] = None
+        
+        with self._registry_lock:
+            self._instances.add(self)
+    
+    @property
+    def dirty(self) -> bool:
+        return self.pending > 0
+    
+    @property
+    def flushes_avoided(self) -> int:
+        """Mutações que não geraram gravação própria"""
+        return max(0, self.mutations - self.flushes)
+    
+    def mark_dirty(self):
+        """Registra uma mudança e grava se o limite de pendências foi atingido"""
+        with self._lock:
+            self.pending += 1
+            self.mutations += 1
+            
+            if self.pending >= self.max_pending:
+                self.flush()
+            elif self._timer is None and self.interval > 0:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self, force: bool = False) -> bool:
+        """Grava se houver mudanças pendentes (ou sempre, com force)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            
+            if not self.pending and not force:
+                return False
+            
+            try:
+                self.flush_fn()
+            except Exception as e:
+                logger.error(f"Erro ao gravar '{self.name}': {e}")
+                return False
+            
+            self.pending = 0
+            self.flushes += 1
+            self.last_flush = time.time()
+            return True
+    
+    def mark_clean(self):
+        """Descarta pendências após uma gravação feita fora do flush"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.pending:
+                self.pending = 0
+                self.flushes += 1
+                self.last_flush = time.time()
+    
+    def get_stats(self) -> Dict:
+        return {
+            "mutacoes": self.mutations,
+            "gravacoes": self.flushes,
+            "gravacoes_evitadas": self.flushes_avoided,
+            "pendentes": self.pending
+        }
+    
+    @classmethod
+    def flush_all(cls):
+        """Grava tudo que estiver pendente (encerramento)"""
+        with cls._registry_lock:
+            instances = list(cls._instances)
+        for instance in instances:
+            instance.flush()
+    
+    @classmethod
+    def get_all_stats(cls) -> Dict:
+        """Estatísticas por módulo e total de gravações evitadas"""
+        with cls._registry_lock:
+            instances = list(cls._instances)
+        
+        modules = {p.name: p.get_stats() for p in instances}
+        return {
+            "modulos": modules,
+            "gravacoes_evitadas": sum(p.flushes_avoided for p in instances)
+        }
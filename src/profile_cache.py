@@ -0,0 +1,221 @@
+"""
+Cache de Metadados de Perfis
+SQLite em disco com TTL e camada LRU em memória
+Evita reabrir perfis inspecionados recentemente
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from utils import logger
+from config import config
+
+@dataclass
+class CachedProfile:
+    """Metadados de um perfil (mesmos campos do UserProfile)"""
+    username: str
+    followers_count: Optional[int] = None
+    following_count: Optional[int] = None
+    is_private: bool = False
+    is_verified: bool = False
+    checked_at: int = 0
+    
+    def age(self, now: Optional[float] = None) -> float:
+        """Segundos desde a última inspeção"""
+        return (now if now is not None else time.time()) - self.checked_at
+
+class ProfileCache:
+    """
+    Cache de perfis por username
+
+    get() consulta primeiro o LRU em memória e depois o SQLite; entradas
+    mais velhas que o TTL são tratadas como ausentes. get_many() resolve
+    uma lista de candidatos com uma consulta por lote de 500 nomes.
+    """
+    
+    _BATCH = 500
+    
+    def __init__(self, db_file: Optional[str] = None,
+                 ttl: Optional[float] = None,
+                 memory_size: Optional[int] = None):
+        self.db_file = db_file or config.PROFILE_CACHE_FILE
+        self.ttl = config.PROFILE_CACHE_TTL_HOURS * 3600 if ttl is None else ttl
+        self.memory_size = config.PROFILE_CACHE_MEMORY if memory_size is None else memory_size
+        
+        self._memory: "OrderedDict[str, CachedProfile]" = OrderedDict()
+        self._lock = threading.RLock()
+        
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.expired = 0
+        
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    username TEXT PRIMARY KEY,
+                    followers_count INTEGER,
+                    following_count INTEGER,
+                    is_private INTEGER DEFAULT 0,
+                    is_verified INTEGER DEFAULT 0,
+                    checked_at INTEGER NOT NULL
+                )
+            """)
+        # Entradas vencidas nunca voltam a ser lidas: apaga ao abrir e ao fechar
+        self.purge_expired()
+    
+    # ============================================
+    # CAMADA EM MEMÓRIA
+    # ============================================
+    
+    def _remember(self, entry: CachedProfile):
+        self._memory[entry.username] = entry
+        self._memory.move_to_end(entry.username)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def _is_fresh(self, entry: CachedProfile, now: float) -> bool:
+        return entry.age(now) <= self.ttl
+    
+    @staticmethod
+    def _from_row(row: tuple) -> CachedProfile:
+        username, followers, following, private, verified, checked_at = row
+        return CachedProfile(
+            username=username,
+            followers_count=followers,
+            following_count=following,
+            is_private=bool(private),
+            is_verified=bool(verified),
+            checked_at=checked_at
+        )
+    
+    # ============================================
+    # LEITURA
+    # ============================================
+    
+    def get(self, username: str) -> Optional[CachedProfile]:
+        """Metadados ainda válidos de um perfil, ou None"""
+        return self.get_many([username]).get(username)
+    
+    def get_many(self, usernames: Iterable[str]) -> Dict[str, CachedProfile]:
+        """Entradas válidas para os usernames pedidos (ausentes/expirados ficam de fora)"""
+        now = time.time()
+        found: Dict[str, CachedProfile] = {}
+        
+        with self._lock:
+            pending = []
+            for username in dict.fromkeys(usernames):
+                entry = self._memory.get(username)
+                if entry is None:
+                    pending.append(username)
+                elif self._is_fresh(entry, now):
+                    self._memory.move_to_end(username)
+                    found[username] = entry
+                    self.hits_memory += 1
+                else:
+                    del self._memory[username]
+                    self.expired += 1
+            
+            for i in range(0, len(pending), self._BATCH):
+                batch = pending[i:i + self._BATCH]
+                rows = self._conn.execute(
+                    "SELECT username, followers_count, following_count, is_private, "
+                    "is_verified, checked_at FROM profiles "
+                    f"WHERE username IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                
+                for row in rows:
+                    entry = self._from_row(row)
+                    if self._is_fresh(entry, now):
+                        self._remember(entry)
+                        found[entry.username] = entry
+                        self.hits_disk += 1
+                    else:
+                        self.expired += 1
+            
+            self.misses += len(pending) - sum(1 for u in pending if u in found)
+        
+        return found
+    
+    # ============================================
+    # ESCRITA
+    # ============================================
+    
+    def put(self, username: str, followers_count: Optional[int] = None,
+            following_count: Optional[int] = None, is_private: bool = False,
+            is_verified: bool = False) -> CachedProfile:
+        """Registra os metadados lidos agora de um perfil"""
+        entry = CachedProfile(
+            username=username,
+            followers_count=followers_count,
+            following_count=following_count,
+            is_private=is_private,
+            is_verified=is_verified,
+            checked_at=int(time.time())
+        )
+        
+        with self._lock:
+            self._remember(entry)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO profiles (username, followers_count, following_count, "
+                    "is_private, is_verified, checked_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (username, followers_count, following_count,
+                     int(is_private), int(is_verified), entry.checked_at)
+                )
+        return entry
+    
+    def put_snapshot(self, snapshot) -> CachedProfile:
+        """Registra um ProfileSnapshot do Navigator"""
+        return self.put(
+            snapshot.username,
+            followers_count=snapshot.followers_count,
+            following_count=snapshot.following_count,
+            is_private=snapshot.is_private,
+            is_verified=snapshot.is_verified
+        )
+    
+    def purge_expired(self) -> int:
+        """Apaga do disco as entradas vencidas"""
+        cutoff = int(time.time() - self.ttl)
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute(
+                    "DELETE FROM profiles WHERE checked_at < ?", (cutoff,)
+                ).rowcount
+            for username in [u for u, e in self._memory.items() if e.checked_at < cutoff]:
+                del self._memory[username]
+        
+        if removed:
+            logger.info(f"🧹 Cache de perfis: {removed} entradas vencidas removidas")
+        return removed
+    
+    def close(self):
+        with self._lock:
+            self.purge_expired()
+            self._conn.close()
+    
+    # ============================================
+    # ESTATÍSTICAS
+    # ============================================
+    
+    def get_stats(self) -> Dict:
+        hits = self.hits_memory + self.hits_disk
+        lookups = hits + self.misses
+        return {
+            "acertos_memoria": self.hits_memory,
+            "acertos_disco": self.hits_disk,
+            "ausentes": self.misses,
+            "expirados": self.expired,
+            "taxa_acerto": f"{hits / lookups * 100:.1f}%" if lookups else "0%",
+            "em_memoria": len(self._memory)
+        }
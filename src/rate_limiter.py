@@ -0,0 +1,301 @@
+"""
+Limitador de Ações
+Janelas deslizantes de uma hora e de um dia por tipo de ação, mais o teto
+diário global (MAX_ACTIONS_PER_DAY); o histórico sobrevive a reinícios
+"""
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Optional
+
+from utils import logger, load_json, save_json
+from config import config
+from persistence import DebouncedPersistence
+
+HOUR = 3600
+DAY = 86400
+
+# Chave do arquivo com as suspensões por bloqueio (tipo -> fim, horário de parede)
+BLOCKS_KEY = "_bloqueios"
+
+class SlidingWindow:
+    """Instantes (relógio monotônico) das ações dentro da janela"""
+    
+    __slots__ = ("span", "events")
+    
+    def __init__(self, span: float):
+        self.span = span
+        self.events: Deque[float] = deque()
+    
+    def prune(self, now: float):
+        """Descarta o que saiu da janela (O(1) amortizado: cada ação sai uma vez)"""
+        limit = now - self.span
+        events = self.events
+        while events and events[0] <= limit:
+            events.popleft()
+    
+    def count(self, now: float) -> int:
+        self.prune(now)
+        return len(self.events)
+    
+    def add(self, ts: float):
+        self.events.append(ts)
+    
+    def discard(self, ts: float):
+        """Remove um instante registrado (procura do mais recente para trás)"""
+        events = self.events
+        for i in range(len(events) - 1, -1, -1):
+            if events[i] == ts:
+                del events[i]
+                return
+            if events[i] < ts:
+                return
+
+class RateLimiter:
+    """Controla limites de ações para evitar bloqueios"""
+    
+    def __init__(self, state_file: Optional[str] = None):
+        self.state_file = state_file or os.path.join(config.DATA_DIR, "rate_limiter.json")
+        self._lock = threading.RLock()
+        self._hourly: Dict[str, SlidingWindow] = {}
+        self._daily: Dict[str, SlidingWindow] = {}
+        self._all = SlidingWindow(DAY)
+        # Tipo -> fim da suspensão (monotônico) após aviso de bloqueio
+        self._blocked_until: Dict[str, float] = {}
+        
+        self.hourly_limits = {
+            'likes': config.MAX_LIKES_PER_HOUR,
+            'follows': config.MAX_FOLLOWS_PER_HOUR,
+            'unfollows': config.MAX_UNFOLLOWS_PER_HOUR,
+            'comments': config.MAX_COMMENTS_PER_HOUR
+        }
+        self.daily_limits = {
+            'likes': config.MAX_LIKES_PER_DAY,
+            'follows': config.MAX_FOLLOWS_PER_DAY,
+            'unfollows': config.MAX_UNFOLLOWS_PER_DAY,
+            'comments': config.MAX_COMMENTS_PER_DAY
+        }
+        
+        for action_type in ('likes', 'follows', 'unfollows', 'comments', 'stories'):
+            self._windows(action_type)
+        self._load()
+        
+        # Gravação agrupada como nos demais módulos; a saída (e o Ctrl+C) força o flush
+        self._persistence = DebouncedPersistence("rate_limiter", self._save)
+    
+    def _windows(self, action_type: str):
+        hourly = self._hourly.get(action_type)
+        if hourly is None:
+            hourly = self._hourly[action_type] = SlidingWindow(HOUR)
+            self._daily[action_type] = SlidingWindow(DAY)
+        return hourly, self._daily[action_type]
+    
+    # ============================================
+    # PERSISTÊNCIA
+    # ============================================
+    
+    @staticmethod
+    def _clock_offset() -> float:
+        """Converte monotônico <-> horário de parede (o disco guarda o de parede)"""
+        return time.time() - time.monotonic()
+    
+    def _load(self):
+        data = load_json(self.state_file, {})
+        offset = self._clock_offset()
+        now = time.monotonic()
+        merged = []
+        
+        for action_type, until in data.pop(BLOCKS_KEY, {}).items():
+            if until - offset > now:
+                self._blocked_until[action_type] = until - offset
+        
+        for action_type, timestamps in data.items():
+            hourly, daily = self._windows(action_type)
+            for wall in sorted(timestamps):
+                ts = wall - offset
+                if ts <= now - DAY:
+                    continue
+                daily.add(ts)
+                if ts > now - HOUR:
+                    hourly.add(ts)
+                merged.append(ts)
+        
+        for ts in sorted(merged):
+            self._all.add(ts)
+    
+    def _save(self):
+        offset = self._clock_offset()
+        now = time.monotonic()
+        with self._lock:
+            data = {}
+            for action_type, daily in self._daily.items():
+                daily.prune(now)
+                data[action_type] = [round(ts + offset, 3) for ts in daily.events]
+            blocks = {t: round(until + offset, 3) for t, until in self._blocked_until.items() if until > now}
+            if blocks:
+                data[BLOCKS_KEY] = blocks
+        save_json(data, self.state_file)
+    
+    # ============================================
+    # LIMITES
+    # ============================================
+    
+    def _allowed(self, action_type: str, max_per_hour: Optional[int],
+                 max_per_day: Optional[int], now: float) -> bool:
+        """Confere suspensão e as três janelas (com o lock)"""
+        if max_per_hour is None:
+            max_per_hour = self.hourly_limits.get(action_type)
+        if max_per_day is None:
+            max_per_day = self.daily_limits.get(action_type)
+        hourly, daily = self._windows(action_type)
+        
+        if self._blocked_until.get(action_type, 0) > now:
+            logger.warning(f"🚫 '{action_type}' suspenso após bloqueio do Instagram")
+            return False
+        
+        if max_per_hour is not None and hourly.count(now) >= max_per_hour:
+            logger.warning(f"⛔ Limite de '{action_type}' atingido ({len(hourly.events)}/{max_per_hour})")
+            return False
+        
+        if max_per_day and daily.count(now) >= max_per_day:
+            logger.warning(f"⛔ Limite diário de '{action_type}' atingido ({len(daily.events)}/{max_per_day})")
+            return False
+        
+        if self._all.count(now) >= config.MAX_ACTIONS_PER_DAY:
+            logger.warning(f"⛔ Limite diário de ações atingido ({len(self._all.events)}/{config.MAX_ACTIONS_PER_DAY})")
+            return False
+        
+        return True
+    
+    def can_perform(self, action_type: str, max_per_hour: Optional[int] = None,
+                    max_per_day: Optional[int] = None) -> bool:
+        """
+        Verifica se pode realizar ação sem exceder limites
+        
+        Só consulta: serve para desistir cedo (antes de abrir páginas). Para
+        a ação em si use try_acquire, que confere e registra de uma vez.
+        """
+        with self._lock:
+            return self._allowed(action_type, max_per_hour, max_per_day, time.monotonic())
+    
+    def try_acquire(self, action_type: str, max_per_hour: Optional[int] = None,
+                    max_per_day: Optional[int] = None) -> bool:
+        """
+        Confere os limites e registra a ação sob o mesmo lock
+        
+        Daemon e menu não passam juntos pelo último espaço livre. Se a ação
+        acabar não acontecendo (clique falhou), devolva a vaga com release().
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._allowed(action_type, max_per_hour, max_per_day, now):
+                return False
+            per_hour = self._add(action_type, now)
+        
+        self._persistence.mark_dirty()
+        logger.info(f"📝 Ação '{action_type}' registrada. Total/hora: {per_hour}")
+        return True
+    
+    def release(self, action_type: str):
+        """Desfaz o último try_acquire do tipo (a ação não foi feita)"""
+        with self._lock:
+            hourly, daily = self._windows(action_type)
+            if not daily.events:
+                return
+            ts = daily.events[-1]
+            hourly.discard(ts)
+            daily.discard(ts)
+            self._all.discard(ts)
+        self._persistence.mark_dirty()
+    
+    @staticmethod
+    def _window_wait(window: SlidingWindow, limit: Optional[int], now: float) -> float:
+        """Segundos até a janela aceitar mais uma ação"""
+        count = window.count(now)
+        if limit is None or count < limit:
+            return 0.0
+        if limit <= 0:
+            return float("inf")
+        # As (count - limit + 1) ações mais antigas precisam sair da janela
+        return max(0.0, window.events[count - limit] + window.span - now)
+    
+    def wait_time(self, action_type: str, max_per_hour: Optional[int] = None,
+                  max_per_day: Optional[int] = None) -> float:
+        """
+        Segundos até can_perform() voltar a aceitar a ação (0 = já pode)
+        
+        Considera as três janelas: hora e dia do tipo e o teto diário global.
+        """
+        if max_per_hour is None:
+            max_per_hour = self.hourly_limits.get(action_type)
+        if max_per_day is None:
+            max_per_day = self.daily_limits.get(action_type)
+        now = time.monotonic()
+        
+        with self._lock:
+            hourly, daily = self._windows(action_type)
+            return max(
+                self._blocked_until.get(action_type, now) - now,
+                self._window_wait(hourly, max_per_hour, now),
+                self._window_wait(daily, max_per_day or None, now),
+                self._window_wait(self._all, config.MAX_ACTIONS_PER_DAY, now)
+            )
+    
+    def next_allowed_at(self, action_type: str, max_per_hour: Optional[int] = None,
+                        max_per_day: Optional[int] = None) -> Optional[datetime]:
+        """Quando a próxima ação do tipo será permitida (None se nunca, limite zero)"""
+        wait = self.wait_time(action_type, max_per_hour, max_per_day)
+        if wait == float("inf"):
+            return None
+        return datetime.now() + timedelta(seconds=wait)
+    
+    def _add(self, action_type: str, now: float) -> int:
+        """Registra nas janelas e retorna o total da última hora (com o lock)"""
+        hourly, daily = self._windows(action_type)
+        hourly.add(now)
+        daily.add(now)
+        self._all.add(now)
+        return hourly.count(now)
+    
+    # ============================================
+    # BLOQUEIO DO INSTAGRAM
+    # ============================================
+    
+    def block(self, action_type: str, hours: Optional[float] = None):
+        """Suspende o tipo de ação (aviso de bloqueio): can_perform nega até lá"""
+        hours = config.ACTION_BLOCK_HOURS if hours is None else hours
+        with self._lock:
+            self._blocked_until[action_type] = time.monotonic() + hours * HOUR
+        self._persistence.mark_dirty()
+        logger.error(f"🚫 Instagram bloqueou '{action_type}': suspenso por {hours:g}h")
+    
+    def get_stats(self) -> dict:
+        """Retorna estatísticas de ações (última hora e últimas 24h)"""
+        now = time.monotonic()
+        with self._lock:
+            stats = {
+                action_type: {
+                    "hora": self._hourly[action_type].count(now),
+                    "dia": self._daily[action_type].count(now)
+                }
+                for action_type in self._hourly
+            }
+            stats["total_dia"] = self._all.count(now)
+            stats["suspensos"] = {
+                t: round((until - now) / HOUR, 1) for t, until in self._blocked_until.items() if until > now
+            }
+            stats["limite_dia"] = config.MAX_ACTIONS_PER_DAY
+        return stats
+    
+    def reset(self):
+        """Reseta todos os contadores"""
+        with self._lock:
+            for action_type in self._hourly:
+                self._hourly[action_type].events.clear()
+                self._daily[action_type].events.clear()
+            self._all.events.clear()
+            self._blocked_until.clear()
+        self._persistence.mark_dirty()
+        logger.info("🔄 Rate limiter resetado")
@@ -0,0 +1,298 @@
+"""
+Registro de Seletores
+Cada elemento lógico tem seletores alternativos ordenados e um escopo
+explícito; a ordem se ajusta pela taxa de acerto observada e as
+estatísticas persistem entre sessões
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from utils import logger, load_json, save_json, ActionBlockedError
+from config import config
+from persistence import DebouncedPersistence
+from page_probe import ProbeMatch, probe
+
+# Escopos: documento inteiro ou diálogo aberto (ou a raiz passada na consulta)
+SCOPE_DOCUMENT = "document"
+SCOPE_DIALOG = "dialog"
+
+# Alternativas além do seletor principal de config.SELECTORS
+# Seletores com escopo diferente de documento devem ser relativos (".//", CSS)
+DEFAULT_SPECS = {
+    'follow_button': (SCOPE_DOCUMENT, [
+        config.SELECTORS['follow_button'],
+        "//button[.//div[text()='Seguir']]",
+        "//button[text()='Seguir de volta']"
+    ]),
+    'following_button': (SCOPE_DOCUMENT, [
+        config.SELECTORS['following_button'],
+        "//button[.//div[text()='Seguindo']]"
+    ]),
+    'like_button': (SCOPE_DOCUMENT, [
+        config.SELECTORS['like_button'],
+        "svg[aria-label='Like']"
+    ]),
+    'close_button': (SCOPE_DOCUMENT, [
+        config.SELECTORS['close_button'],
+        "svg[aria-label='Close']",
+        "//div[@role='dialog']//button[.//*[@aria-label='Fechar']]"
+    ]),
+    'dismiss_modal': (SCOPE_DOCUMENT, [
+        config.SELECTORS['not_now_button'],
+        config.SELECTORS['save_info_button'],
+        "//button[contains(text(), 'Not Now')]"
+    ]),
+    'dialog_container': (SCOPE_DOCUMENT, [
+        config.SELECTORS['dialog_container'],
+        "div[role='dialog'] div[style*='overflow']"
+    ]),
+    'likers_follow_button': (SCOPE_DIALOG, [
+        ".//button[contains(text(), 'Seguir') and not(contains(text(), 'Seguindo'))]",
+        ".//button[.//div[text()='Seguir']]"
+    ]),
+    'likers_any_button': (SCOPE_DIALOG, [
+        ".//button[contains(., 'Seguir')]"
+    ]),
+    # Aviso de bloqueio de ação ("Tente novamente mais tarde")
+    'action_blocked': (SCOPE_DOCUMENT, [
+        "//div[@role='dialog']//*[contains(text(), 'Tente novamente mais tarde')]",
+        "//div[@role='dialog']//*[contains(text(), 'Ação bloqueada')]",
+        "//div[@role='dialog']//*[contains(text(), 'Try Again Later')]",
+        "//div[@role='dialog']//*[contains(text(), 'Action Blocked')]"
+    ]),
+}
+
+class SelectorStats:
+    """Acertos, falhas e latência (ms na página) de um seletor"""
+    
+    __slots__ = ("hits", "misses", "total_ms")
+    
+    def __init__(self, hits: int = 0, misses: int = 0, total_ms: float = 0.0):
+        self.hits = hits
+        self.misses = misses
+        self.total_ms = total_ms
+    
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+    
+    @property
+    def score(self) -> float:
+        """Taxa de acerto suavizada (seletores sem histórico ficam em 0.5)"""
+        return (self.hits + 1) / (self.lookups + 2)
+    
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.lookups if self.lookups else 0.0
+    
+    def record(self, found: bool, ms: float):
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.total_ms += ms or 0.0
+    
+    def to_dict(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "total_ms": round(self.total_ms, 3)}
+
+class SelectorSpec:
+    """Elemento lógico: alternativas na ordem atual e escopo"""
+    
+    def __init__(self, name: str, candidates: Sequence[str], scope: str = SCOPE_DOCUMENT):
+        if scope != SCOPE_DOCUMENT:
+            for selector in candidates:
+                # "(//a)[1]" também é absoluto
+                if selector.lstrip("(").startswith("//"):
+                    raise ValueError(
+                        f"Seletor '{name}' tem escopo {scope} mas usa XPath absoluto: {selector}"
+                    )
+        self.name = name
+        self.scope = scope
+        self.candidates: List[str] = list(dict.fromkeys(candidates))
+        self.stats: Dict[str, SelectorStats] = {s: SelectorStats() for s in self.candidates}
+    
+    def reorder(self):
+        """Maior taxa de acerto primeiro; empate decidido pela latência (ordenação estável)"""
+        self.candidates.sort(key=lambda s: (-self.stats[s].score, self.stats[s].avg_ms))
+
+class SelectorRegistry:
+    """
+    Registro dos seletores usados pelos módulos
+
+    find()/find_all()/click() sondam as alternativas de um elemento em uma
+    única chamada (page_probe), param na primeira que existe e registram
+    acerto para ela e falha para as anteriores.
+    """
+    
+    def __init__(self, stats_file: Optional[str] = None):
+        self.stats_file = stats_file or os.path.join(config.DATA_DIR, "selector_stats.json")
+        self._specs: Dict[str, SelectorSpec] = {}
+        self._lock = threading.RLock()
+        
+        for name, selector in config.SELECTORS.items():
+            self.register(name, [selector])
+        for name, (scope, candidates) in DEFAULT_SPECS.items():
+            self.register(name, candidates, scope)
+        
+        self._load_stats()
+        self._persistence = DebouncedPersistence("selector_stats", self._write_stats, max_pending=200)
+    
+    def register(self, name: str, candidates: Sequence[str], scope: str = SCOPE_DOCUMENT):
+        """Registra (ou substitui) um elemento lógico"""
+        with self._lock:
+            self._specs[name] = SelectorSpec(name, candidates, scope)
+    
+    def spec(self, name: str) -> SelectorSpec:
+        return self._specs[name]
+    
+    def candidates(self, name: str) -> List[str]:
+        """Alternativas na ordem atual (mais eficaz primeiro)"""
+        with self._lock:
+            return list(self._specs[name].candidates)
+    
+    # ============================================
+    # PERSISTÊNCIA
+    # ============================================
+    
+    def _load_stats(self):
+        """Restaura estatísticas e ordenação da sessão anterior"""
+        data = load_json(self.stats_file, {})
+        for name, per_selector in data.items():
+            spec = self._specs.get(name)
+            if spec is None:
+                continue
+            for selector, values in per_selector.items():
+                # Seletores que saíram do código são ignorados
+                if selector in spec.stats:
+                    spec.stats[selector] = SelectorStats(**values)
+            spec.reorder()
+    
+    def _write_stats(self):
+        with self._lock:
+            data = {
+                name: {s: spec.stats[s].to_dict() for s in spec.candidates}
+                for name, spec in self._specs.items()
+                if any(st.lookups for st in spec.stats.values())
+            }
+        save_json(data, self.stats_file)
+    
+    def flush(self):
+        self._persistence.flush()
+    
+    # ============================================
+    # CONSULTAS
+    # ============================================
+    
+    def _resolve_root(self, driver, spec: SelectorSpec, root):
+        if spec.scope == SCOPE_DOCUMENT or root is not None:
+            return root
+        if spec.scope == SCOPE_DIALOG:
+            dialog = self.find(driver, 'dialog_container', visible_only=False)
+            return dialog.element if dialog else None
+        raise ValueError(f"Seletor '{spec.name}' exige o elemento raiz (escopo {spec.scope})")
+    
+    def _record(self, spec: SelectorSpec, matches: List[ProbeMatch]):
+        with self._lock:
+            for match in matches:
+                if match.evaluated and match.selector in spec.stats:
+                    spec.stats[match.selector].record(match.found, match.ms)
+            spec.reorder()
+        self._persistence.mark_dirty()
+    
+    def _probe(self, driver, name: str, root, visible_only: bool,
+               collect_all: bool) -> Optional[ProbeMatch]:
+        spec = self._specs[name]
+        root = self._resolve_root(driver, spec, root)
+        if spec.scope != SCOPE_DOCUMENT and root is None:
+            logger.debug(f"Raiz do seletor '{name}' não encontrada")
+            return None
+        
+        matches = probe(
+            driver, self.candidates(name), root,
+            stop_at_first=True, visible_only=visible_only, collect_all=collect_all
+        )
+        self._record(spec, matches)
+        return next((m for m in matches if m.found), None)
+    
+    def find(self, driver, name: str, root=None, visible_only: bool = True) -> Optional[ProbeMatch]:
+        """Primeira alternativa encontrada para o elemento lógico"""
+        return self._probe(driver, name, root, visible_only, collect_all=False)
+    
+    def find_all(self, driver, name: str, root=None, visible_only: bool = True) -> List:
+        """Todos os elementos da primeira alternativa encontrada"""
+        match = self._probe(driver, name, root, visible_only, collect_all=True)
+        return list(match.elements or []) if match else []
+    
+    def wait_for(self, driver, wait, name: str, root=None, expected: bool = True) -> ProbeMatch:
+        """
+        Espera (AdaptiveWait, chave = nome do elemento) alguma alternativa
+        ficar visível; TimeoutException se nenhuma aparecer. expected=False
+        quando a ausência é um resultado normal (ex.: já segue o perfil).
+        
+        Só a última sondagem entra nas estatísticas: as falhas enquanto a
+        página ainda carrega não dizem nada sobre o seletor.
+        """
+        spec = self._specs[name]
+        last: List[ProbeMatch] = []
+        
+        def condition(d):
+            resolved = self._resolve_root(d, spec, root)
+            if spec.scope != SCOPE_DOCUMENT and resolved is None:
+                return None
+            last[:] = probe(d, self.candidates(name), resolved, stop_at_first=True, visible_only=True)
+            return next((m for m in last if m.found), None)
+        
+        try:
+            return wait.until(condition, key=name, expected=expected)
+        finally:
+            if last:
+                self._record(spec, last)
+    
+    def click(self, driver, name: str, root=None) -> Optional[ProbeMatch]:
+        """Clica no elemento lógico (se visível); None se não existe"""
+        match = self.find(driver, name, root)
+        if match is None:
+            return None
+        try:
+            match.element.click()
+        except Exception as e:
+            logger.debug(f"Clique em '{name}' ({match.selector}) falhou: {e}")
+            return None
+        return match
+    
+    # ============================================
+    # ESTATÍSTICAS
+    # ============================================
+    
+    def get_stats(self) -> Dict:
+        """Acertos por alternativa, na ordem atual, dos elementos já consultados"""
+        with self._lock:
+            result = {}
+            for name, spec in self._specs.items():
+                if not any(st.lookups for st in spec.stats.values()):
+                    continue
+                result[name] = [
+                    {
+                        "seletor": s,
+                        "acertos": spec.stats[s].hits,
+                        "falhas": spec.stats[s].misses,
+                        "ms_medio": round(spec.stats[s].avg_ms, 2)
+                    }
+                    for s in spec.candidates
+                ]
+            return result
+
+# Instância global
+registry = SelectorRegistry()
+
+def check_action_block(driver, rate_limiter, action_type: str):
+    """
+    Procura o aviso de bloqueio depois de uma ação; se aparecer, suspende o
+    tipo no rate limiter e levanta ActionBlockedError (safe_execute não repete)
+    """
+    match = registry.find(driver, 'action_blocked')
+    if match is None:
+        return
+    rate_limiter.block(action_type)
+    raise ActionBlockedError(f"'{action_type}' bloqueado: {match.text or 'aviso do Instagram'}")
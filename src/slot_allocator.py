@@ -0,0 +1,100 @@
+"""
+Alocador de Horários
+Distribui posts novos pelos melhores horários sem colidir com a agenda
+existente: limite de posts por dia e intervalo mínimo entre posts
+"""
+import bisect
+import random
+from collections import Counter
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from utils import logger
+
+# Minutos aleatórios somados ao horário cheio (não postar sempre em :00)
+MINUTE_JITTER = 30
+
+class SlotAllocator:
+    """
+    Índice de horários ocupados e alocação de novos slots
+
+    Cada post ocupa o intervalo (t - espaçamento, t + espaçamento). A agenda
+    existente fica numa lista ordenada (bisect, O(log n) por consulta) e os
+    slots novos em listas por dia, consultadas só nos dias vizinhos. Uma
+    alocação de n slots custa O(n log n).
+    """
+    
+    def __init__(self, taken: Iterable[datetime], per_day: int,
+                 min_spacing: timedelta, rng: Optional[random.Random] = None):
+        self._taken: List[datetime] = sorted(taken)
+        self._per_day = Counter(t.date() for t in self._taken)
+        self._new: Dict[date, List[datetime]] = {}
+        self.per_day = per_day
+        self.min_spacing = min_spacing
+        # Dias vizinhos que o espaçamento alcança
+        self._span_days = min_spacing.days + 1
+        self._rng = rng or random
+    
+    def conflicts(self, when: datetime) -> bool:
+        """Há post a menos de min_spacing de `when`?"""
+        spacing = self.min_spacing
+        i = bisect.bisect_right(self._taken, when - spacing)
+        if i < len(self._taken) and self._taken[i] < when + spacing:
+            return True
+        
+        day = when.date()
+        for offset in range(-self._span_days, self._span_days + 1):
+            for other in self._new.get(day + timedelta(days=offset), ()):
+                if abs(other - when) < spacing:
+                    return True
+        return False
+    
+    def _add(self, when: datetime):
+        self._new.setdefault(when.date(), []).append(when)
+        self._per_day[when.date()] += 1
+    
+    def allocate(self, count: int, hours: Sequence[int],
+                 start: Optional[datetime] = None,
+                 max_days: Optional[int] = None) -> List[datetime]:
+        """
+        Até `count` horários a partir de `start`, em ordem cronológica
+
+        `hours` vem do melhor para o pior: cada dia recebe os melhores
+        horários livres até completar per_day. Sem max_days o calendário
+        segue até alocar todos; para antes se um dia depois da agenda
+        existente não comporta nenhum post (horários ou limite impossíveis).
+        """
+        start = start or datetime.now()
+        first_day = start.date()
+        last_taken = self._taken[-1].date() if self._taken else first_day
+        slots: List[datetime] = []
+        day = first_day
+        
+        while len(slots) < count:
+            if max_days is not None and (day - first_day).days >= max_days:
+                break
+            
+            placed = 0
+            free = self.per_day - self._per_day[day]
+            for hour in hours:
+                if placed >= free or len(slots) >= count:
+                    break
+                when = datetime.combine(day, dtime(hour)) + timedelta(
+                    minutes=self._rng.randint(0, MINUTE_JITTER)
+                )
+                if when <= start or self.conflicts(when):
+                    continue
+                self._add(when)
+                slots.append(when)
+                placed += 1
+            
+            if placed == 0 and day > max(last_taken, first_day):
+                logger.warning(
+                    f"📅 Nenhum horário livre em {day.strftime('%d/%m')}: "
+                    f"alocação parada em {len(slots)}/{count}"
+                )
+                break
+            day += timedelta(days=1)
+        
+        slots.sort()
+        return slots
@@ -6,9 +6,16 @@ import time
 import random
 import logging
 import functools
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Callable, Any
 from colorama import Fore, Style, init
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException,
+    StaleElementReferenceException, TimeoutException, WebDriverException
+)
 
 # Inicializa colorama
 init(autoreset=True)
@@ -37,6 +44,92 @@ def setup_logging():
 
 logger = setup_logging()
 
+# ============================================
+# CLASSIFICAÇÃO DE ERROS E PRAZOS
+# ============================================
+
+class ActionBlockedError(Exception):
+    """O Instagram bloqueou a ação (limite atingido); não adianta repetir"""
+
+# Classes de erro: só as duas primeiras são repetidas
+ERROR_TRANSIENT = "transitorio"
+ERROR_STALE = "obsoleto"
+ERROR_NOT_FOUND = "nao_encontrado"
+ERROR_BLOCKED = "bloqueado"
+ERROR_LOGIC = "logico"
+
+RETRYABLE_ERRORS = (ERROR_TRANSIENT, ERROR_STALE)
+
+def classify_error(error: BaseException) -> str:
+    """Classifica a exceção para decidir se vale repetir"""
+    if isinstance(error, ActionBlockedError):
+        return ERROR_BLOCKED
+    if isinstance(error, StaleElementReferenceException):
+        return ERROR_STALE
+    # Sessão perdida não volta sozinha
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return ERROR_LOGIC
+    if isinstance(error, (TimeoutException, NoSuchElementException, FileNotFoundError)):
+        return ERROR_NOT_FOUND
+    if isinstance(error, (WebDriverException, ConnectionError, TimeoutError)):
+        return ERROR_TRANSIENT
+    return ERROR_LOGIC
+
+_deadline_local = threading.local()
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Prazo para tudo que roda no bloco (nesta thread)
+
+    Prazos aninhados valem pelo menor. safe_execute não inicia uma nova
+    tentativa que passaria do prazo, e as esperas de elemento são limitadas
+    pelo tempo restante.
+    """
+    previous = getattr(_deadline_local, "at", None)
+    at = time.monotonic() + seconds
+    _deadline_local.at = at if previous is None else min(previous, at)
+    try:
+        yield
+    finally:
+        _deadline_local.at = previous
+
+def time_remaining() -> Optional[float]:
+    """Segundos até o prazo atual (None sem prazo)"""
+    at = getattr(_deadline_local, "at", None)
+    return None if at is None else max(0.0, at - time.monotonic())
+
+class _RetryStats:
+    """Retentativas e tempo gasto nelas, por função"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+    
+    def record(self, name: str, retries: int, retry_seconds: float,
+               failure: Optional[str] = None):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {
+                    "chamadas": 0, "retentativas": 0, "segundos_em_retry": 0.0, "falhas": {}
+                }
+            stats["chamadas"] += 1
+            stats["retentativas"] += retries
+            stats["segundos_em_retry"] += retry_seconds
+            if failure:
+                stats["falhas"][failure] = stats["falhas"].get(failure, 0) + 1
+    
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                name: dict(stats, segundos_em_retry=round(stats["segundos_em_retry"], 1),
+                           falhas=dict(stats["falhas"]))
+                for name, stats in self._stats.items()
+            }
+
+retry_stats = _RetryStats()
+
 # ============================================
 # DECORADORES
 # ============================================
@@ -44,19 +137,49 @@ logger = setup_logging()
 def safe_execute(max_retries: int = 3, delay: float = 2.0):
     """
     Decorator para retry automático em caso de erro
+
+    Só erros transitórios do driver e elementos obsoletos são repetidos,
+    com espera exponencial; não encontrado, bloqueio e erros de lógica
+    sobem na hora. Nenhuma tentativa começa depois do prazo de deadline().
     """
     def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            first_failure = None
+            
+            def record(retries: int, failure: Optional[str] = None):
+                # Tempo em retry: da primeira falha até o fim da última tentativa
+                retry_seconds = time.monotonic() - first_failure if retries else 0.0
+                retry_stats.record(name, retries, retry_seconds, failure)
+            
             for attempt in range(max_retries):
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except Exception as e:
-                    logger.warning(f"⚠️  Tentativa {attempt + 1}/{max_retries} falhou: {e}")
-                    if attempt == max_retries - 1:
+                    if first_failure is None:
+                        first_failure = time.monotonic()
+                    kind = classify_error(e)
+                    wait = delay * (2 ** attempt) * random.uniform(0.8, 1.2)
+                    remaining = time_remaining()
+                    
+                    if kind not in RETRYABLE_ERRORS:
+                        logger.warning(f"⚠️  {func.__name__} falhou ({kind}, sem retry): {e}")
+                    elif attempt == max_retries - 1:
                         logger.error(f"❌ Todas as tentativas falharam para {func.__name__}")
-                        raise
-                    time.sleep(delay * (attempt + 1))
+                    elif remaining is not None and remaining <= wait:
+                        logger.warning(f"⏱️  Prazo esgotado, sem nova tentativa para {func.__name__}")
+                    else:
+                        logger.warning(f"⚠️  Tentativa {attempt + 1}/{max_retries} falhou ({kind}): {e}")
+                        time.sleep(wait)
+                        continue
+                    
+                    record(attempt, failure=kind)
+                    raise
+                
+                record(attempt)
+                return result
             return None
         return wrapper
     return decorator
@@ -104,62 +227,6 @@ class HumanBehavior:
         """Pausa após scroll"""
         return HumanBehavior.random_delay(1.0, 3.0)
 
-# ============================================
-# RATE LIMITER
-# ============================================
-
-class RateLimiter:
-    """Controla limites de ações para evitar bloqueios"""
-    
-    def __init__(self):
-        self.actions = {
-            'likes': [],
-            'follows': [],
-            'unfollows': [],
-            'comments': [],
-            'stories': []
-        }
-    
-    def can_perform(self, action_type: str, max_per_hour: int) -> bool:
-        """Verifica se pode realizar ação sem exceder limites"""
-        now = datetime.now().timestamp()
-        hour_ago = now - 3600
-        
-        # Limpa ações antigas
-        self.actions[action_type] = [
-            ts for ts in self.actions[action_type] 
-            if ts > hour_ago
-        ]
-        
-        can_do = len(self.actions[action_type]) < max_per_hour
-        
-        if not can_do:
-            logger.warning(f"⛔ Limite de '{action_type}' atingido ({len(self.actions[action_type])}/{max_per_hour})")
-        
-        return can_do
-    
-    def record_action(self, action_type: str):
-        """Registra uma ação realizada"""
-        self.actions[action_type].append(datetime.now().timestamp())
-        logger.info(f"📝 Ação '{action_type}' registrada. Total/hora: {len(self.actions[action_type])}")
-    
-    def get_stats(self) -> dict:
-        """Retorna estatísticas de ações"""
-        now = datetime.now().timestamp()
-        hour_ago = now - 3600
-        
-        stats = {}
-        for action, timestamps in self.actions.items():
-            recent = [ts for ts in timestamps if ts > hour_ago]
-            stats[action] = len(recent)
-        
-        return stats
-    
-    def reset(self):
-        """Reseta todos os contadores"""
-        self.actions = {k: [] for k in self.actions}
-        logger.info("🔄 Rate limiter resetado")
-
 # ============================================
 # UTILITÁRIOS DE INTERFACE
 # ============================================
@@ -219,12 +286,36 @@ def ensure_dir(path: str):
     """Garante que diretório existe"""
     os.makedirs(path, exist_ok=True)
 
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+def _file_lock(filepath: str) -> threading.Lock:
+    key = os.path.abspath(filepath)
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = _file_locks[key] = threading.Lock()
+        return lock
+
 def save_json(data: dict, filepath: str):
-    """Salva dados em JSON"""
+    """
+    Salva dados em JSON
+
+    Grava em arquivo temporário e substitui o original: leitores (ou uma
+    gravação concorrente de outra thread) nunca veem o arquivo pela metade.
+    """
     import json
     ensure_dir(os.path.dirname(filepath))
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+    with _file_lock(filepath):
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
 def load_json(filepath: str, default: dict = None) -> dict:
     """Carrega dados de JSON"""
@@ -250,6 +341,42 @@ def parse_datetime(date_str: str) -> Optional[datetime]:
     except:
         return None
 
+_COUNT_RE = re.compile(r"(\d[\d.,]*)\s*(milhões|milhão|mil|mi|k|m)?\b", re.IGNORECASE)
+_COUNT_MULTIPLIERS = {
+    "milhões": 1_000_000, "milhão": 1_000_000, "mi": 1_000_000, "m": 1_000_000,
+    "mil": 1_000, "k": 1_000
+}
+
+def parse_count(text: str) -> Optional[int]:
+    """
+    Converte contagens exibidas pelo Instagram em inteiro
+    Ex.: "1.234" -> 1234, "1,5 mil" -> 1500, "10k" -> 10000, "2,3 mi" -> 2300000
+    Aceita o texto completo ("1.234 curtidas", "Ver todos os 12 comentários")
+    """
+    if not text:
+        return None
+    
+    match = _COUNT_RE.search(text)
+    if not match:
+        return None
+    
+    number, suffix = match.groups()
+    number = number.rstrip(".,")
+    
+    if suffix:
+        # Com sufixo: vírgula (pt-BR) ou ponto é separador decimal
+        multiplier = _COUNT_MULTIPLIERS[suffix.lower()]
+        digits = number.replace(",", ".")
+    else:
+        # Sem sufixo: pontos e vírgulas são separadores de milhar
+        multiplier = 1
+        digits = number.replace(".", "").replace(",", "")
+    
+    try:
+        return int(round(float(digits) * multiplier))
+    except ValueError:
+        return None
+
 def time_until(target: datetime) -> str:
     """Calcula tempo até uma data"""
     now = datetime.now()